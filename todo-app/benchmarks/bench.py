@@ -0,0 +1,332 @@
+"""任务 API 性能测试。
+
+按指定行数预先填充 todo 表，然后分别通过 Flask 测试客户端（单线程，测应用本身的开销）
+和本地 gunicorn（多线程并发，测完整的 HTTP 部署）压测增删改查接口，
+输出每个接口的每秒请求数与 p50/p95/p99 延迟，并可与保存的基准结果对比。
+
+    python benchmarks/bench.py --rows 100k --output results.json
+    python benchmarks/bench.py --rows 100k --baseline results.json
+"""
+import argparse
+import http.client
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+SRC_DIR = os.path.join(BASE_DIR, 'src')
+
+ROUTES = ('create', 'list', 'update', 'delete')
+SEED_CHUNK_SIZE = 10000
+# 固定的时间基准，保证同一随机种子生成的数据完全相同
+SEED_EPOCH = datetime(2024, 1, 1)
+
+def parse_count(value):
+    """解析行数：支持 1k、100k、1m 等写法。"""
+    units = {'k': 1000, 'm': 1000000}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        count = int(float(value[:-1]) * units[value[-1]])
+    else:
+        count = int(value)
+    if count < 1:
+        raise argparse.ArgumentTypeError('must be at least 1')
+    return count
+
+def configure_environment(args, db_path, workdir):
+    # 必须在导入 todo_app 之前设置：配置类在导入时读取环境变量
+    env = {
+        'APP_CONFIG': 'production',
+        'DATABASE_URL': 'sqlite:///' + db_path,
+        'TASKS_CACHE_BACKEND': args.cache,
+        'TASKS_CACHE_DIR': os.path.join(workdir, 'cache'),
+        'TASKS_SCHEDULER_ENABLED': '0'
+    }
+    os.environ.update(env)
+    return env
+
+def seed_database(app, rows, seed):
+    """填充 rows 行任务；数据库中已有相同行数时跳过，便于复用大数据集。"""
+    from todo_app.models import Todo, db, init_db, refresh_task_stats
+
+    with app.app_context():
+        init_db()
+        existing = db.session.query(db.func.count(Todo.id)).scalar()
+        db.session.remove()
+        if existing == rows:
+            return False
+        if existing:
+            raise SystemExit(f'Database already has {existing} tasks, expected {rows}')
+
+        rng = random.Random(seed)
+        todo = Todo.__table__
+        with db.engine.begin() as connection:
+            for start in range(0, rows, SEED_CHUNK_SIZE):
+                batch = []
+                for index in range(start, min(start + SEED_CHUNK_SIZE, rows)):
+                    created_at = SEED_EPOCH + timedelta(seconds=index)
+                    batch.append({
+                        'title': f'Task {index}',
+                        'deadline': SEED_EPOCH + timedelta(minutes=rng.randrange(0, 60 * 24 * 365)),
+                        'completed': rng.random() < 0.3,
+                        'created_at': created_at,
+                        'updated_at': created_at,
+                        'version': 0
+                    })
+                connection.execute(todo.insert(), batch)
+            # 批量插入绕过了 ORM 的 before_flush，需要重新统计 TaskStats
+            refresh_task_stats(connection)
+        return True
+
+def build_requests(route, count, rows, rng, created_ids):
+    """生成 (method, path, body) 列表；删除只针对本轮新建的任务，表的大小保持不变。"""
+    requests = []
+    for _ in range(count):
+        if route == 'create':
+            deadline = SEED_EPOCH + timedelta(minutes=rng.randrange(0, 60 * 24 * 365))
+            requests.append(('POST', '/api/tasks',
+                             {'title': 'Benchmark task', 'deadline': deadline.isoformat()}))
+        elif route == 'list':
+            status = rng.choice(('all', 'active', 'completed'))
+            requests.append(('GET', f'/api/tasks?status={status}&limit=50', None))
+        elif route == 'update':
+            requests.append(('PUT', f'/api/tasks/{rng.randint(1, rows)}',
+                             {'completed': rng.random() < 0.5}))
+        elif created_ids:
+            requests.append(('DELETE', f'/api/tasks/{created_ids.pop()}', None))
+    return requests
+
+def summarize(latencies, elapsed, errors):
+    latencies = sorted(latencies)
+
+    def percentile(p):
+        # 最近秩法
+        index = max(0, math.ceil(p / 100 * len(latencies)) - 1)
+        return latencies[index] * 1000
+
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'rps': round(len(latencies) / elapsed, 1) if elapsed else 0,
+        'p50_ms': round(percentile(50), 3),
+        'p95_ms': round(percentile(95), 3),
+        'p99_ms': round(percentile(99), 3)
+    } if latencies else {'requests': 0, 'errors': errors}
+
+def warmup_requests(args):
+    # 预热：建立连接池连接、执行 before_first_request，不计入结果
+    return [('GET', '/api/tasks?limit=50', None)] * args.warmup
+
+def bench_test_client(app, args):
+    client = app.test_client()
+    for method, path, body in warmup_requests(args):
+        client.open(path, method=method, json=body).get_data()
+    rng = random.Random(args.seed)
+    created_ids = []
+    results = {}
+    for route in ROUTES:
+        latencies = []
+        errors = 0
+        started = time.perf_counter()
+        for method, path, body in build_requests(route, args.requests, args.rows, rng, created_ids):
+            request_started = time.perf_counter()
+            response = client.open(path, method=method, json=body)
+            # 读取完整响应体（包括流式响应）才算请求结束
+            response.get_data()
+            latencies.append(time.perf_counter() - request_started)
+            if response.status_code >= 400:
+                errors += 1
+            elif route == 'create':
+                created_ids.append(response.get_json()['id'])
+        results[route] = summarize(latencies, time.perf_counter() - started, errors)
+    return results
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+def start_gunicorn(args, env, port):
+    command = [
+        sys.executable, '-m', 'gunicorn',
+        '-w', str(args.workers), '-k', 'gthread', '--threads', str(args.threads),
+        '-b', f'127.0.0.1:{port}', '--log-level', 'warning',
+        'todo_app:create_app()'
+    ]
+    process = subprocess.Popen(command, cwd=SRC_DIR, env=dict(os.environ, **env))
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise SystemExit('gunicorn exited during startup')
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.terminate()
+    raise SystemExit('gunicorn did not start within 30 seconds')
+
+def bench_gunicorn(args, env):
+    port = free_port()
+    process = start_gunicorn(args, env, port)
+    try:
+        warmup = warmup_requests(args)
+        with ThreadPoolExecutor(args.concurrency) as executor:
+            list(executor.map(lambda i: send_requests(port, warmup[i::args.concurrency]),
+                              range(args.concurrency)))
+        rng = random.Random(args.seed + 1)
+        created_ids = []
+        results = {}
+        for route in ROUTES:
+            requests = build_requests(route, args.requests, args.rows, rng, created_ids)
+            # 每个线程使用自己的长连接，按顺序处理分给它的请求
+            shares = [requests[i::args.concurrency] for i in range(args.concurrency)]
+            started = time.perf_counter()
+            with ThreadPoolExecutor(args.concurrency) as executor:
+                outcomes = list(executor.map(lambda share: send_requests(port, share), shares))
+            elapsed = time.perf_counter() - started
+            latencies = [value for outcome in outcomes for value in outcome[0]]
+            errors = sum(outcome[1] for outcome in outcomes)
+            for outcome in outcomes:
+                created_ids.extend(outcome[2])
+            results[route] = summarize(latencies, elapsed, errors)
+        return results
+    finally:
+        process.terminate()
+        process.wait()
+
+def send_requests(port, requests):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=30)
+    latencies, errors, created_ids = [], 0, []
+    try:
+        for method, path, body in requests:
+            payload = json.dumps(body) if body is not None else None
+            headers = {'Content-Type': 'application/json'} if body is not None else {}
+            started = time.perf_counter()
+            connection.request(method, path, body=payload, headers=headers)
+            response = connection.getresponse()
+            data = response.read()
+            latencies.append(time.perf_counter() - started)
+            if response.status >= 400:
+                errors += 1
+            elif method == 'POST':
+                created_ids.append(json.loads(data)['id'])
+    finally:
+        connection.close()
+    return latencies, errors, created_ids
+
+def compare(results, baseline, threshold):
+    """与基准结果对比，返回退步的 (模式, 接口, 指标) 列表。"""
+    regressions = []
+    print(f"\n{'mode':<10}{'route':<8}{'rps':>12}{'base':>10}{'p95 ms':>12}{'base':>10}")
+    for mode, routes in results['results'].items():
+        for route, current in routes.items():
+            previous = baseline.get('results', {}).get(mode, {}).get(route)
+            if not previous or 'rps' not in previous or 'rps' not in current:
+                continue
+            print(f"{mode:<10}{route:<8}{current['rps']:>12}{previous['rps']:>10}"
+                  f"{current['p95_ms']:>12}{previous['p95_ms']:>10}")
+            if current['rps'] < previous['rps'] * (1 - threshold):
+                regressions.append((mode, route, 'rps'))
+            if current['p95_ms'] > previous['p95_ms'] * (1 + threshold):
+                regressions.append((mode, route, 'p95_ms'))
+    return regressions
+
+def print_results(results):
+    print(f"{'mode':<10}{'route':<8}{'requests':>10}{'errors':>8}{'rps':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for mode, routes in results.items():
+        for route, stats in routes.items():
+            print(f"{mode:<10}{route:<8}{stats['requests']:>10}{stats['errors']:>8}"
+                  f"{stats.get('rps', '-'):>10}{stats.get('p50_ms', '-'):>10}"
+                  f"{stats.get('p95_ms', '-'):>10}{stats.get('p99_ms', '-'):>10}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the todo REST API.')
+    parser.add_argument('--rows', type=parse_count, default=parse_count('1k'),
+                        help='tasks to seed, e.g. 1k, 100k, 1m (default: 1k)')
+    parser.add_argument('--requests', type=int, default=500, help='requests per route (default: 500)')
+    parser.add_argument('--warmup', type=int, default=100,
+                        help='untimed requests sent before measuring (default: 100)')
+    parser.add_argument('--mode', choices=('client', 'gunicorn', 'both'), default='both')
+    parser.add_argument('--workers', type=int, default=4, help='gunicorn workers (default: 4)')
+    parser.add_argument('--threads', type=int, default=8, help='threads per gunicorn worker (default: 8)')
+    parser.add_argument('--concurrency', type=int, default=8, help='concurrent HTTP clients (default: 8)')
+    parser.add_argument('--cache', choices=('none', 'lru', 'file'), default='none',
+                        help='task list cache backend (default: none, measures the database path)')
+    parser.add_argument('--seed', type=int, default=42, help='random seed (default: 42)')
+    parser.add_argument('--db', help='reuse this SQLite file instead of a temporary one')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--baseline', help='compare against a previous JSON result')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed regression against the baseline (default: 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+
+    workdir = tempfile.mkdtemp(prefix='todo-bench-')
+    try:
+        return run(args, workdir)
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+def run(args, workdir):
+    db_path = os.path.abspath(args.db) if args.db else os.path.join(workdir, 'bench.db')
+    env = configure_environment(args, db_path, workdir)
+    sys.path.insert(0, SRC_DIR)
+    from todo_app import create_app
+
+    app = create_app()
+    started = time.perf_counter()
+    if seed_database(app, args.rows, args.seed):
+        print(f'Seeded {args.rows} tasks in {time.perf_counter() - started:.1f}s')
+
+    results = {}
+    if args.mode in ('client', 'both'):
+        results['client'] = bench_test_client(app, args)
+    if args.mode in ('gunicorn', 'both'):
+        results['gunicorn'] = bench_gunicorn(args, env)
+    print_results(results)
+
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'rows': args.rows,
+            'requests': args.requests,
+            'warmup': args.warmup,
+            'workers': args.workers,
+            'threads': args.threads,
+            'concurrency': args.concurrency,
+            'cache': args.cache,
+            'seed': args.seed,
+            'python': platform.python_version(),
+            'platform': platform.platform()
+        },
+        'results': results
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        if baseline.get('meta', {}).get('rows') != args.rows:
+            print('Warning: baseline was recorded with a different number of rows')
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            for mode, route, metric in regressions:
+                print(f'Regression: {mode} {route} {metric}')
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -4,7 +4,7 @@
 source venv/bin/activate
 
 # 设置环境变量
-export FLASK_APP=src.todo_app.app
+export FLASK_APP=todo_app
 export FLASK_DEBUG=1
 export FLASK_ENV=development
 
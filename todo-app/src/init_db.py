@@ -2,11 +2,14 @@ import sys
 import os
 
 # Add the src directory to the Python path
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), 'src')))
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
 
-from todo_app.app import app, db
+from todo_app import create_app
+from todo_app.models import init_db
 
 if __name__ == '__main__':
-    with app.app_context():
-        db.create_all()
-        print("✓ Database tables created successfully!")
+    # 创建缺失的表，并把旧版本的数据库升级到当前结构（可重复执行）
+    # 与 FLASK_APP=todo_app flask init-db 等价
+    with create_app().app_context():
+        init_db()
+        print("✓ Database schema is up to date!")
@@ -1 +1,65 @@
-# This file makes the directory a Python package
+import click
+from datetime import datetime
+from flask import Flask, current_app
+from flask.cli import with_appcontext
+from .assets import init_assets
+from .cache import create_cache
+from .config import get_config
+from .database import configure_engine
+from .events import TaskEventBroker
+from .models import db, init_db, prune_sync_history
+
+def create_app(config=None):
+    """创建应用。config 可以是配置档名称或配置类，默认按 APP_CONFIG 选择。
+
+    导入本包不会创建应用、连接数据库或建表，这些都推迟到调用时；
+    后台线程推迟到处理第一个请求时才启动。
+    """
+    app = Flask(__name__)
+    if config is None or isinstance(config, str):
+        config = get_config(config)
+    app.config.from_object(config)
+
+    db.init_app(app)
+    app.extensions['task_cache'] = create_cache(app.config)
+    app.extensions['task_events'] = TaskEventBroker()
+
+    from .routes import bp
+    app.register_blueprint(bp)
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(prune_sync_history_command)
+    init_assets(app)
+    if app.config['METRICS_ENABLED']:
+        from .metrics import init_metrics
+        init_metrics(app)
+
+    with app.app_context():
+        configure_engine(db.engine, app.config)
+        if app.config['AUTO_CREATE_SCHEMA']:
+            init_db()
+
+    @app.before_first_request
+    def start_background_workers():
+        # 每个 worker 进程在处理第一个请求时启动，fork 之前创建的线程不会被继承
+        if app.config['TASKS_SCHEDULER_ENABLED']:
+            from .scheduler import start_deadline_worker
+            start_deadline_worker(app)
+
+    return app
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """创建缺失的表，并把旧版本的数据库升级到当前结构（可重复执行）。"""
+    init_db()
+    click.echo('✓ Database schema is up to date!')
+
+@click.command('prune-sync-history')
+@with_appcontext
+def prune_sync_history_command():
+    """清理超过保留时间的墓碑和截止提醒；未启用后台截止提醒时可以由 cron 定期执行。"""
+    from .scheduler import sync_retention
+    before = datetime.utcnow() - sync_retention(current_app.config)
+    with db.engine.begin() as connection:
+        pruned = prune_sync_history(connection, before)
+    click.echo(f'✓ Sync history up to version {pruned} pruned')
@@ -0,0 +1,133 @@
+"""静态资源构建与发布。
+
+flask build-assets 把 static 目录下的 CSS/JS 复制为带内容哈希的文件名，并生成 gzip
+（安装了 brotli 时还有 br）预压缩版本，映射关系写入 manifest.json。
+应用启动时如果存在 manifest，url_for('static', ...) 会自动指向带哈希的文件，
+这些文件由 serve_asset 发送，带有一年的 immutable 缓存头（不带哈希的 manifest.json
+除外，按 no-cache 发送）；没有构建时一切照旧。
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shutil
+import click
+from flask import abort, current_app, request, send_from_directory
+from flask.cli import with_appcontext
+from werkzeug.utils import safe_join
+
+try:
+    import brotli
+except ImportError:  # brotli 是可选依赖，没有时只生成 gzip 版本
+    brotli = None
+
+# 需要构建的静态资源类型
+ASSET_EXTENSIONS = ('.css', '.js')
+# 构建结果放在 static 目录下的子目录中
+DIST_DIR = 'dist'
+MANIFEST_NAME = 'manifest.json'
+# 按客户端偏好依次尝试的预压缩版本：(Content-Encoding, 文件扩展名)
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+# 文件名带内容哈希，内容变化时文件名也会变，可以永久缓存
+IMMUTABLE_MAX_AGE = 365 * 24 * 3600
+
+def build_assets(static_dir):
+    """构建静态资源，返回 manifest（原文件名 -> 带哈希的文件名，均相对于 static 目录）。"""
+    dist_dir = os.path.join(static_dir, DIST_DIR)
+    # 每次重新生成，旧版本的文件不会残留
+    shutil.rmtree(dist_dir, ignore_errors=True)
+
+    manifest = {}
+    for root, dirs, files in os.walk(static_dir):
+        dirs[:] = sorted(d for d in dirs if os.path.join(root, d) != dist_dir)
+        for name in sorted(files):
+            if not name.endswith(ASSET_EXTENSIONS):
+                continue
+            path = os.path.join(root, name)
+            with open(path, 'rb') as f:
+                content = f.read()
+
+            relative = os.path.relpath(path, static_dir).replace(os.sep, '/')
+            stem, extension = os.path.splitext(relative)
+            digest = hashlib.sha256(content).hexdigest()[:12]
+            hashed = f'{DIST_DIR}/{stem}.{digest}{extension}'
+            write_asset(os.path.join(static_dir, hashed), content)
+            manifest[relative] = hashed
+
+    with open(os.path.join(dist_dir, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return manifest
+
+def write_asset(path, content):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(content)
+    # mtime=0 让相同内容的构建结果完全一致
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(content, compresslevel=9, mtime=0))
+    if brotli is not None:
+        with open(path + '.br', 'wb') as f:
+            f.write(brotli.compress(content, quality=11))
+
+def load_manifest(static_dir):
+    try:
+        with open(os.path.join(static_dir, DIST_DIR, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def init_assets(app):
+    """有构建结果时，让 url_for('static', ...) 指向带哈希的文件并注册发送它们的路由。"""
+    app.cli.add_command(build_assets_command)
+    manifest = load_manifest(app.static_folder)
+    if not manifest:
+        return
+
+    @app.url_defaults
+    def use_hashed_asset(endpoint, values):
+        if endpoint == 'static' and values.get('filename') in manifest:
+            values['filename'] = manifest[values['filename']]
+
+    # 比 /static/<path:filename> 更具体，优先匹配
+    app.add_url_rule(f'{app.static_url_path}/{DIST_DIR}/<path:filename>',
+                     'hashed_static', serve_asset)
+
+def serve_asset(filename):
+    dist_dir = os.path.join(current_app.static_folder, DIST_DIR)
+    path = safe_join(dist_dir, filename)
+    if path is None:
+        abort(404)
+    if filename == MANIFEST_NAME:
+        # manifest 的文件名不带哈希，每次都要向服务器确认
+        response = send_from_directory(dist_dir, filename, max_age=0)
+        response.cache_control.no_cache = True
+        return response
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+
+    encoding, suffix = None, ''
+    for name, extension in ENCODINGS:
+        if name in request.accept_encodings and os.path.isfile(path + extension):
+            encoding, suffix = name, extension
+            break
+
+    response = send_from_directory(dist_dir, filename + suffix, mimetype=mimetype,
+                                   max_age=IMMUTABLE_MAX_AGE)
+    # send_from_directory 会按压缩文件名生成 Content-Disposition，这里不需要
+    response.headers.pop('Content-Disposition', None)
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    response.cache_control.public = True
+    response.cache_control.immutable = True
+    return response
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """生成带内容哈希的静态资源及其预压缩版本。"""
+    manifest = build_assets(current_app.static_folder)
+    for source, target in sorted(manifest.items()):
+        click.echo(f'{source} -> {target}')
+    if brotli is None:
+        click.echo('brotli is not installed, only gzip variants were written')
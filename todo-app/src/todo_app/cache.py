@@ -0,0 +1,206 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+class NullBackend:
+    # 关闭缓存时使用：什么都不存
+    def get(self, key):
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def get_tag(self, name):
+        return '0'
+
+    def bump_tag(self, name):
+        pass
+
+class LRUBackend:
+    """进程内 LRU 缓存，只适合单进程部署：其他 worker 的写入无法让它失效。"""
+
+    def __init__(self, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # 失效标签单独保存，不参与 LRU 淘汰
+        self._tags = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get_tag(self, name):
+        with self._lock:
+            return str(self._tags.get(name, 0))
+
+    def bump_tag(self, name):
+        with self._lock:
+            self._tags[name] = self._tags.get(name, 0) + 1
+
+class FileBackend:
+    """基于本地目录的缓存，同一台机器上的多个 worker 共享。
+
+    目录放在 /dev/shm 等内存文件系统上时相当于共享内存。
+    每个条目一个文件，通过临时文件加 os.replace 原子写入。
+    """
+
+    # 每写入多少次检查一次条目数量
+    PRUNE_INTERVAL = 100
+
+    def __init__(self, directory, max_entries=1024, ttl=300):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entry_dir = os.path.join(directory, 'entries')
+        self._tag_dir = os.path.join(directory, 'tags')
+        os.makedirs(self._entry_dir, exist_ok=True)
+        os.makedirs(self._tag_dir, exist_ok=True)
+        self._writes = 0
+
+    def get(self, key):
+        try:
+            with open(self._entry_path(key), encoding='utf-8') as f:
+                expires_at, value = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if expires_at < time.time():
+            return None
+        return value
+
+    def set(self, key, value):
+        self._write(self._entry_path(key), [time.time() + self.ttl, value])
+        self._writes += 1
+        if self._writes % self.PRUNE_INTERVAL == 0:
+            self._prune()
+
+    def get_tag(self, name):
+        try:
+            with open(os.path.join(self._tag_dir, name), encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return '0'
+
+    def bump_tag(self, name):
+        # 新标签是随机值而不是计数器，并发失效时无需加锁
+        self._write(os.path.join(self._tag_dir, name), uuid.uuid4().hex)
+
+    def _entry_path(self, key):
+        return os.path.join(self._entry_dir, hashlib.sha1(key.encode()).hexdigest())
+
+    def _write(self, path, data):
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path))
+        try:
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(data if isinstance(data, str) else json.dumps(data))
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+
+    def _prune(self):
+        # 删除过期条目；仍然超出上限时按修改时间删除最旧的
+        entries = []
+        now = time.time()
+        for name in os.listdir(self._entry_dir):
+            path = os.path.join(self._entry_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            if mtime + self.ttl < now:
+                self._remove(path)
+            else:
+                entries.append((mtime, path))
+        entries.sort()
+        for _, path in entries[:max(0, len(entries) - self.max_entries)]:
+            self._remove(path)
+
+    def _remove(self, path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+class TaskListCache:
+    """任务列表响应缓存。
+
+    按状态筛选（all/active/completed）划分命名空间，每个命名空间有一个失效标签，
+    缓存键包含该标签。写入任务后只更新受影响命名空间的标签，旧条目自然失效。
+    """
+
+    def __init__(self, backend):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def key(self, status, *parts):
+        # 必须在查询数据库之前生成键：查询期间发生的写入会更新标签，
+        # 旧数据只会写到没人再读的旧键上
+        tag = self.backend.get_tag(status)
+        return ':'.join(['tasks', status, tag] + [str(part) for part in parts])
+
+    def get(self, key):
+        value = self.backend.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def invalidate(self, statuses):
+        for status in statuses:
+            self.backend.bump_tag(status)
+            self.invalidations += 1
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'invalidations': self.invalidations
+        }
+
+def affected_statuses(*completed_values):
+    # 一次写入影响"全部"以及任务修改前后所属的状态
+    statuses = {'all'}
+    for completed in completed_values:
+        statuses.add('completed' if completed else 'active')
+    return statuses
+
+def create_cache(config):
+    backend = config['TASKS_CACHE_BACKEND']
+    max_entries = config['TASKS_CACHE_MAX_ENTRIES']
+    ttl = config['TASKS_CACHE_TTL']
+    if backend == 'lru':
+        return TaskListCache(LRUBackend(max_entries, ttl))
+    if backend == 'file':
+        return TaskListCache(FileBackend(config['TASKS_CACHE_DIR'], max_entries, ttl))
+    if backend == 'none':
+        return TaskListCache(NullBackend())
+    raise ValueError(f'Unknown cache backend: {backend}')
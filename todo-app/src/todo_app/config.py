@@ -1,9 +1,13 @@
 import os
 from dotenv import load_dotenv
+from sqlalchemy.pool import QueuePool
 
 # 加载环境变量
 load_dotenv()
 
+# todo-app 项目根目录
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
 class Config:
     # 从环境变量获取密钥，如果不存在则使用默认值
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-key-please-change-in-production'
@@ -11,3 +15,95 @@ class Config:
     # 数据库配置 - 使用内存数据库进行测试
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # create_app 时自动建表，仅供开发使用；其他环境在部署前执行 flask init-db
+    AUTO_CREATE_SCHEMA = False
+
+    # 每个 SQLite 连接建立时执行的 PRAGMA
+    SQLITE_PRAGMAS = {}
+
+    # 写请求使用 BEGIN IMMEDIATE 开启事务，避免 WAL 模式下读后写升级锁失败
+    SQLITE_BEGIN_IMMEDIATE_WRITES = False
+
+    # 任务列表分页：默认每页条数与允许的最大条数
+    TASKS_PAGE_SIZE = int(os.environ.get('TASKS_PAGE_SIZE', 100))
+    TASKS_MAX_PAGE_SIZE = int(os.environ.get('TASKS_MAX_PAGE_SIZE', 500))
+
+    # 批量接口单次请求允许的最大操作数
+    TASKS_BATCH_MAX_SIZE = int(os.environ.get('TASKS_BATCH_MAX_SIZE', 1000))
+
+    # 增量同步的墓碑和截止提醒的保留时间（秒），由后台截止提醒线程每小时清理一次，
+    # 或执行 flask prune-sync-history；清理后更早的 since 令牌返回 410，客户端需要重新拉取完整列表
+    TASKS_SYNC_RETENTION = int(os.environ.get('TASKS_SYNC_RETENTION', 30 * 86400))
+
+    # 任务变更推送：轮询数据库的间隔（秒）、单个连接的最长时间（秒）、客户端重连间隔（毫秒）
+    TASKS_STREAM_POLL_INTERVAL = float(os.environ.get('TASKS_STREAM_POLL_INTERVAL', 5))
+    TASKS_STREAM_MAX_AGE = float(os.environ.get('TASKS_STREAM_MAX_AGE', 300))
+    TASKS_STREAM_RETRY_MS = int(os.environ.get('TASKS_STREAM_RETRY_MS', 3000))
+
+    # 任务列表响应缓存：lru（进程内，仅适合单进程）、file（多 worker 共享）或 none
+    TASKS_CACHE_BACKEND = os.environ.get('TASKS_CACHE_BACKEND', 'lru')
+    TASKS_CACHE_MAX_ENTRIES = int(os.environ.get('TASKS_CACHE_MAX_ENTRIES', 1024))
+    TASKS_CACHE_TTL = int(os.environ.get('TASKS_CACHE_TTL', 300))
+    # file 后端的缓存目录，放在 /dev/shm 等内存文件系统上效果更好
+    TASKS_CACHE_DIR = os.environ.get('TASKS_CACHE_DIR') or \
+        os.path.join(BASE_DIR, 'instance', 'cache')
+
+    # 截止时间：截止前多少秒算"即将到期"，也是 /api/tasks/due 的默认范围
+    TASKS_DUE_SOON_WINDOW = int(os.environ.get('TASKS_DUE_SOON_WINDOW', 3600))
+    # 后台截止提醒线程；内存数据库的连接在线程间共享，开发环境默认关闭
+    TASKS_SCHEDULER_ENABLED = os.environ.get('TASKS_SCHEDULER_ENABLED', '0') == '1'
+    # 发现其他进程写入的最长间隔、堆中保存的截止时间范围、启动时补发的时间范围（秒）
+    TASKS_SCHEDULER_POLL_INTERVAL = float(os.environ.get('TASKS_SCHEDULER_POLL_INTERVAL', 30))
+    TASKS_SCHEDULER_HORIZON = int(os.environ.get('TASKS_SCHEDULER_HORIZON', 86400))
+    TASKS_SCHEDULER_CATCHUP = int(os.environ.get('TASKS_SCHEDULER_CATCHUP', 3600))
+
+    # 请求耗时、SQL 统计和 /metrics 端点
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', '1') == '1'
+    # 超过该耗时（毫秒）的 SQL 语句记录警告日志
+    SQL_SLOW_QUERY_MS = float(os.environ.get('SQL_SLOW_QUERY_MS', 100))
+
+class DevelopmentConfig(Config):
+    # 内存数据库每次启动都是空的，创建应用时直接建表
+    AUTO_CREATE_SCHEMA = True
+
+class ProductionConfig(Config):
+    # 文件数据库：所有 worker 共享同一份数据，重启后数据不丢失
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or \
+        'sqlite:///' + os.path.join(BASE_DIR, 'instance', 'todo.db')
+
+    # 连接池：复用连接，PRAGMA 只在建立连接时执行一次
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'poolclass': QueuePool,
+        'pool_size': int(os.environ.get('DB_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('DB_MAX_OVERFLOW', 10)),
+        'pool_timeout': int(os.environ.get('DB_POOL_TIMEOUT', 30)),
+        'pool_recycle': int(os.environ.get('DB_POOL_RECYCLE', 3600)),
+        'pool_pre_ping': True,
+        'connect_args': {'check_same_thread': False}
+    }
+
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        # WAL 模式下 NORMAL 不会损坏数据库，只在断电时可能丢失最后几个事务
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT', 5000))
+    }
+
+    SQLITE_BEGIN_IMMEDIATE_WRITES = True
+
+    TASKS_CACHE_BACKEND = os.environ.get('TASKS_CACHE_BACKEND', 'file')
+
+    TASKS_SCHEDULER_ENABLED = os.environ.get('TASKS_SCHEDULER_ENABLED', '1') == '1'
+
+config_by_name = {
+    'development': DevelopmentConfig,
+    'production': ProductionConfig
+}
+
+def get_config(name=None):
+    # 通过 APP_CONFIG 环境变量选择配置，默认 development
+    name = name or os.environ.get('APP_CONFIG', 'development')
+    if name not in config_by_name:
+        raise ValueError(f'Unknown config: {name}')
+    return config_by_name[name]
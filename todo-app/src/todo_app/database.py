@@ -0,0 +1,123 @@
+import logging
+from flask import has_request_context, request
+from sqlalchemy import event, inspect, text
+from sqlalchemy.exc import OperationalError
+
+logger = logging.getLogger(__name__)
+
+# 只读请求的 HTTP 方法
+READ_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+def configure_engine(engine, config):
+    if engine.dialect.name != 'sqlite':
+        return
+
+    pragmas = config['SQLITE_PRAGMAS']
+    begin_immediate = config['SQLITE_BEGIN_IMMEDIATE_WRITES']
+
+    @event.listens_for(engine, 'connect')
+    def on_connect(dbapi_connection, connection_record):
+        if begin_immediate:
+            # 关闭 pysqlite 自带的隐式 BEGIN，改由下面的 begin 事件发出
+            dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    if begin_immediate:
+        @event.listens_for(engine, 'begin')
+        def on_begin(connection):
+            # 写请求一开始就拿写锁，并发写入时按 busy_timeout 排队等待
+            if has_request_context() and request.method not in READ_METHODS:
+                connection.exec_driver_sql('BEGIN IMMEDIATE')
+            else:
+                connection.exec_driver_sql('BEGIN')
+
+def upgrade_schema(connection, metadata):
+    """把已有数据库升级到当前模型的结构，可重复执行。"""
+    inspector = inspect(connection)
+    if inspector.has_table('todo'):
+        upgrade_todo_table(connection, inspector, metadata.tables['todo'])
+    if inspector.has_table('sync_state'):
+        upgrade_sync_state_table(connection, inspector)
+
+    # 新增的表（连同索引）直接创建，已有的表补建缺失的索引
+    metadata.create_all(connection)
+    for table in metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(connection, checkfirst=True)
+
+    if connection.dialect.name == 'sqlite':
+        create_task_search_index(connection)
+
+# 任务标题的全文索引：外部内容表，标题只保存在 todo 表中，由触发器同步到索引。
+# trigram 分词支持任意子串匹配（包括中文），需要 SQLite 3.34 及以上版本
+TASK_SEARCH_TABLE = (
+    "CREATE VIRTUAL TABLE todo_fts USING fts5("
+    "title, content='todo', content_rowid='id', tokenize='trigram')"
+)
+TASK_SEARCH_TRIGGERS = {
+    'todo_fts_insert': (
+        'CREATE TRIGGER todo_fts_insert AFTER INSERT ON todo BEGIN '
+        'INSERT INTO todo_fts (rowid, title) VALUES (new.id, new.title); END'
+    ),
+    'todo_fts_delete': (
+        'CREATE TRIGGER todo_fts_delete AFTER DELETE ON todo BEGIN '
+        "INSERT INTO todo_fts (todo_fts, rowid, title) VALUES ('delete', old.id, old.title); END"
+    ),
+    # 只有标题变化时才更新索引，切换完成状态等修改不产生额外写入
+    'todo_fts_update': (
+        'CREATE TRIGGER todo_fts_update AFTER UPDATE OF title ON todo BEGIN '
+        "INSERT INTO todo_fts (todo_fts, rowid, title) VALUES ('delete', old.id, old.title); "
+        'INSERT INTO todo_fts (rowid, title) VALUES (new.id, new.title); END'
+    )
+}
+
+def create_task_search_index(connection):
+    """创建缺失的全文索引和触发器；有任何缺失时从 todo 表重建整个索引。"""
+    existing = set(connection.execute(text(
+        "SELECT name FROM sqlite_master WHERE name = 'todo_fts' OR "
+        "(type = 'trigger' AND tbl_name = 'todo')"
+    )).scalars())
+    if {'todo_fts', *TASK_SEARCH_TRIGGERS} <= existing:
+        return
+
+    try:
+        if 'todo_fts' not in existing:
+            connection.execute(text(TASK_SEARCH_TABLE))
+    except OperationalError:
+        logger.warning('SQLite does not support FTS5 trigram tables, task search is disabled')
+        return
+    for name, sql in TASK_SEARCH_TRIGGERS.items():
+        if name not in existing:
+            connection.execute(text(sql))
+    connection.execute(text("INSERT INTO todo_fts (todo_fts) VALUES ('rebuild')"))
+
+def upgrade_sync_state_table(connection, inspector):
+    columns = {column['name'] for column in inspector.get_columns('sync_state')}
+    if 'pruned_version' not in columns:
+        connection.execute(text(
+            'ALTER TABLE sync_state ADD COLUMN pruned_version INTEGER NOT NULL DEFAULT 0'))
+
+def upgrade_todo_table(connection, inspector, table):
+    columns = {column['name'] for column in inspector.get_columns('todo')}
+    table_sql = connection.execute(text(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'todo'"
+    )).scalar()
+    if 'AUTOINCREMENT' in table_sql.upper() and {'updated_at', 'version'} <= columns:
+        return
+
+    # SQLite 无法通过 ALTER TABLE 加上 AUTOINCREMENT，按官方推荐流程重建表
+    for index in inspector.get_indexes('todo'):
+        connection.execute(text(f'DROP INDEX {index["name"]}'))
+    connection.execute(text('ALTER TABLE todo RENAME TO todo_old'))
+    table.create(connection)
+
+    updated_at = 'updated_at' if 'updated_at' in columns else 'created_at'
+    version = 'version' if 'version' in columns else '0'
+    connection.execute(text(
+        'INSERT INTO todo (id, title, deadline, completed, created_at, updated_at, version) '
+        f'SELECT id, title, deadline, completed, created_at, {updated_at}, {version} FROM todo_old'
+    ))
+    connection.execute(text('DROP TABLE todo_old'))
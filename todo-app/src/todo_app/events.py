@@ -0,0 +1,36 @@
+import json
+import threading
+
+class TaskEventBroker:
+    """进程内的任务变更通知。
+
+    只负责唤醒等待中的 SSE 连接，变更内容始终从数据库读取，
+    因此多个 worker 进程之间也能通过定时轮询保持一致。
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._version = 0
+
+    @property
+    def version(self):
+        return self._version
+
+    def notify(self):
+        with self._condition:
+            self._version += 1
+            self._condition.notify_all()
+
+    def wait(self, seen, timeout):
+        # 有新通知时返回 True，超时返回 False
+        with self._condition:
+            return self._condition.wait_for(lambda: self._version != seen, timeout)
+
+def format_sse(data, event=None, event_id=None):
+    lines = []
+    if event:
+        lines.append(f'event: {event}')
+    if event_id is not None:
+        lines.append(f'id: {event_id}')
+    lines.append(f'data: {json.dumps(data)}')
+    return '\n'.join(lines) + '\n\n'
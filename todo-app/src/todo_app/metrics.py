@@ -0,0 +1,214 @@
+import logging
+import threading
+import time
+from bisect import bisect_left
+from flask import current_app, g, has_app_context, has_request_context, request
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
+from .models import db
+
+logger = logging.getLogger(__name__)
+
+# 耗时直方图的分桶上限（秒）
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+# 单个请求 SQL 语句数的分桶上限；N+1 查询会让数值落到最后几个桶
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+# SQL 语句按首个关键字归类，其余归为 OTHER，避免标签取值无限增长
+STATEMENT_TYPES = {'SELECT', 'INSERT', 'UPDATE', 'DELETE', 'PRAGMA', 'BEGIN', 'COMMIT', 'ROLLBACK'}
+
+def format_labels(names, values):
+    if not names:
+        return ''
+    pairs = []
+    for name, value in zip(names, values):
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
+
+def format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+class Counter:
+    def __init__(self, name, documentation, labels=()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values, amount=1):
+        with self._lock:
+            self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for label_values, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{format_labels(self.labels, label_values)} {format_number(value)}')
+        return lines
+
+class Histogram:
+    """累积分桶直方图，输出格式与 Prometheus 客户端库一致。"""
+
+    def __init__(self, name, documentation, labels=(), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self.buckets = tuple(buckets) + (float('inf'),)
+        # 标签取值 -> [各分桶计数, 总和, 总数]
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, *label_values):
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            item = self._values.get(label_values)
+            if item is None:
+                item = self._values[label_values] = [[0] * len(self.buckets), 0, 0]
+            item[0][index] += 1
+            item[1] += value
+            item[2] += 1
+
+    def collect(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} histogram']
+        label_names = self.labels + ('le',)
+        with self._lock:
+            for label_values, (counts, total, count) in sorted(self._values.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = format_labels(label_names, label_values + (format_number(bound),))
+                    lines.append(f'{self.name}_bucket{labels} {cumulative}')
+                labels = format_labels(self.labels, label_values)
+                lines.append(f'{self.name}_sum{labels} {format_number(float(total))}')
+                lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+def gauge(name, documentation, value):
+    return [f'# HELP {name} {documentation}', f'# TYPE {name} gauge', f'{name} {format_number(value)}']
+
+class Metrics:
+    """本进程的请求与数据库指标。
+
+    每个 gunicorn worker 各自统计；抓取时请求落到哪个 worker 就返回哪个 worker 的数据。
+    """
+
+    def __init__(self):
+        self.requests = Counter(
+            'todo_http_requests_total', 'HTTP requests by endpoint, method and status.',
+            ('endpoint', 'method', 'status'))
+        self.request_duration = Histogram(
+            'todo_http_request_duration_seconds', 'Time until the response headers are ready.',
+            ('endpoint', 'method'))
+        self.request_queries = Histogram(
+            'todo_http_request_sql_queries', 'SQL statements executed per request.',
+            ('endpoint', 'method'), QUERY_COUNT_BUCKETS)
+        self.request_sql_duration = Histogram(
+            'todo_http_request_sql_duration_seconds', 'Total SQL time per request.',
+            ('endpoint', 'method'))
+        self.sql_duration = Histogram(
+            'todo_sql_query_duration_seconds', 'SQL statement duration by statement type.',
+            ('statement',))
+        self.slow_queries = Counter(
+            'todo_sql_slow_queries_total', 'SQL statements slower than SQL_SLOW_QUERY_MS.',
+            ('statement',))
+        self.commit_duration = Histogram(
+            'todo_db_commit_duration_seconds', 'Session commit duration, including the flush.')
+
+    def render(self, engine, cache):
+        lines = []
+        for metric in (self.requests, self.request_duration, self.request_queries,
+                       self.request_sql_duration, self.sql_duration, self.slow_queries,
+                       self.commit_duration):
+            lines.extend(metric.collect())
+
+        pool = engine.pool
+        if isinstance(pool, QueuePool):
+            lines += gauge('todo_db_pool_size', 'Connections kept open by the pool.', pool.size())
+            lines += gauge('todo_db_pool_checked_out', 'Connections currently in use.', pool.checkedout())
+            lines += gauge('todo_db_pool_overflow', 'Connections opened beyond pool_size.', pool.overflow())
+
+        stats = cache.stats()
+        for name in ('hits', 'misses', 'invalidations'):
+            metric = f'todo_cache_{name}_total'
+            lines += [f'# HELP {metric} Task list cache {name}.', f'# TYPE {metric} counter',
+                      f'{metric} {stats[name]}']
+        return '\n'.join(lines) + '\n'
+
+def statement_type(statement):
+    keyword = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ''
+    return keyword if keyword in STATEMENT_TYPES else 'OTHER'
+
+def request_labels():
+    # 未匹配路由的请求（404 等）统一归为 unmatched，路径不进入标签
+    return (request.endpoint or 'unmatched', request.method)
+
+def init_metrics(app):
+    """给应用加上请求计时、SQL 统计和 /metrics 端点。"""
+    metrics = app.extensions['metrics'] = Metrics()
+    slow_query_seconds = app.config['SQL_SLOW_QUERY_MS'] / 1000
+
+    @app.before_request
+    def start_request_timer():
+        g.request_started = time.perf_counter()
+        g.sql_queries = 0
+        g.sql_seconds = 0.0
+
+    @app.after_request
+    def record_request(response):
+        # 流式响应（增量同步、推送流）只统计到响应头准备好为止
+        started = g.pop('request_started', None)
+        if started is not None:
+            labels = request_labels()
+            metrics.request_duration.observe(time.perf_counter() - started, *labels)
+            metrics.request_queries.observe(g.sql_queries, *labels)
+            metrics.request_sql_duration.observe(g.sql_seconds, *labels)
+            metrics.requests.inc(*labels, response.status_code)
+        return response
+
+    with app.app_context():
+        engine = db.engine
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def start_query_timer(conn, cursor, statement, parameters, context, executemany):
+        # 同一连接上的语句依次执行，保存一个开始时间即可；语句出错时下一条会覆盖它
+        conn.info['query_started'] = time.perf_counter()
+
+    @event.listens_for(engine, 'after_cursor_execute')
+    def record_query(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info.pop('query_started', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        kind = statement_type(statement)
+        metrics.sql_duration.observe(elapsed, kind)
+        if has_request_context() and 'request_started' in g:
+            g.sql_queries += 1
+            g.sql_seconds += elapsed
+        if elapsed >= slow_query_seconds:
+            metrics.slow_queries.inc(kind)
+            endpoint = request.endpoint if has_request_context() else None
+            logger.warning('Slow query (%.1f ms, endpoint %s): %s',
+                           elapsed * 1000, endpoint or '-', ' '.join(statement.split()))
+
+    @app.route('/metrics')
+    def export_metrics():
+        body = metrics.render(engine, app.extensions['task_cache'])
+        return app.response_class(body, mimetype='text/plain; version=0.0.4')
+
+@event.listens_for(db.session, 'before_commit')
+def start_commit_timer(session):
+    session.info['commit_started'] = time.perf_counter()
+
+@event.listens_for(db.session, 'after_commit')
+def record_commit(session):
+    started = session.info.pop('commit_started', None)
+    metrics = current_app.extensions.get('metrics') if has_app_context() else None
+    if started is not None and metrics is not None:
+        metrics.commit_duration.observe(time.perf_counter() - started)
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_commit_timer(session):
+    session.info.pop('commit_started', None)
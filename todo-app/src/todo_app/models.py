@@ -0,0 +1,205 @@
+from datetime import datetime
+from flask import current_app, has_app_context
+from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import DDL, event, func, select
+from sqlalchemy.orm.attributes import get_history
+from .cache import affected_statuses
+from .database import upgrade_schema
+from .serialization import TASK_FIELDS
+
+# 不绑定应用，由 create_app 调用 init_app
+db = SQLAlchemy()
+
+def task_to_dict(task):
+    # 同时适用于 ORM 对象和 Core 查询返回的行
+    return {
+        'id': task.id,
+        'title': task.title,
+        'deadline': task.deadline.isoformat(),
+        'completed': task.completed,
+        'created_at': task.created_at.isoformat(),
+        'updated_at': task.updated_at.isoformat()
+    }
+
+# 数据库模型
+class Todo(db.Model):
+    # AUTOINCREMENT 保证已删除任务的 id 不会被复用，墓碑记录才不会指向新任务
+    __table_args__ = (
+        # 按状态筛选并按截止时间排序的列表查询走这个索引
+        db.Index('ix_todo_completed_deadline', 'completed', 'deadline'),
+        # 不筛选状态时按截止时间排序
+        db.Index('ix_todo_deadline', 'deadline'),
+        {'sqlite_autoincrement': True}
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    title = db.Column(db.String(100), nullable=False)
+    deadline = db.Column(db.DateTime, nullable=False)
+    completed = db.Column(db.Boolean, default=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    # 最近一次修改时的同步版本号，见 SyncState
+    version = db.Column(db.Integer, nullable=False, default=0, index=True)
+
+    def to_dict(self):
+        return task_to_dict(self)
+
+class TaskTombstone(db.Model):
+    # 已删除任务的墓碑，供增量同步告知客户端哪些任务被删除
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    version = db.Column(db.Integer, nullable=False, index=True)
+    deleted_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class SyncState(db.Model):
+    # 单行表，保存全局单调递增的同步版本号；每次写入任务都会递增
+    id = db.Column(db.Integer, primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    # 已清理的墓碑中最大的版本号，小于它的 since 令牌无法再得到完整的增量
+    pruned_version = db.Column(db.Integer, nullable=False, default=0)
+
+class TaskStats(db.Model):
+    # 单行表，保存任务总数和已完成数，写入任务时在同一事务中增量更新
+    id = db.Column(db.Integer, primary_key=True)
+    total = db.Column(db.Integer, nullable=False, default=0)
+    completed = db.Column(db.Integer, nullable=False, default=0)
+
+class DeadlineEvent(db.Model):
+    # 已发出的截止提醒；唯一约束保证多个进程中每个提醒只发出一次
+    __table_args__ = (db.UniqueConstraint('task_id', 'kind', 'deadline'),)
+
+    id = db.Column(db.Integer, primary_key=True)
+    task_id = db.Column(db.Integer, nullable=False)
+    # due（即将到期）或 overdue（已逾期）
+    kind = db.Column(db.String(10), nullable=False)
+    deadline = db.Column(db.DateTime, nullable=False)
+    version = db.Column(db.Integer, nullable=False, index=True)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+event.listen(
+    SyncState.__table__, 'after_create',
+    DDL('INSERT INTO sync_state (id, version, pruned_version) VALUES (1, 0, 0)')
+)
+event.listen(
+    TaskStats.__table__, 'after_create',
+    DDL('INSERT INTO task_stats (id, total, completed) VALUES (1, 0, 0)')
+)
+
+def next_sync_version(connection):
+    # UPDATE 会先拿到写锁，并发写入时版本号也不会重复
+    table = SyncState.__table__
+    connection.execute(table.update().values(version=table.c.version + 1))
+    return connection.execute(select(table.c.version)).scalar()
+
+def current_sync_version():
+    return db.session.query(SyncState.version).scalar() or 0
+
+def pruned_sync_version():
+    return db.session.query(SyncState.pruned_version).scalar() or 0
+
+def prune_sync_history(connection, before):
+    """删除 before 之前的墓碑和截止提醒，返回新的 pruned_version。"""
+    tombstones = TaskTombstone.__table__
+    events = DeadlineEvent.__table__
+    pruned = max(
+        connection.execute(select(func.max(tombstones.c.version))
+                           .where(tombstones.c.deleted_at < before)).scalar() or 0,
+        connection.execute(select(func.max(events.c.version))
+                           .where(events.c.created_at < before)).scalar() or 0)
+    state = SyncState.__table__
+    if pruned:
+        # 按版本号删除，保证留下的记录覆盖 pruned_version 之后的全部删除和提醒
+        connection.execute(tombstones.delete().where(tombstones.c.version <= pruned))
+        connection.execute(events.delete().where(events.c.version <= pruned))
+        connection.execute(state.update().where(state.c.pruned_version < pruned)
+                           .values(pruned_version=pruned))
+    return connection.execute(select(state.c.pruned_version)).scalar()
+
+def update_task_stats(connection, total=0, completed=0):
+    # 增量更新计数；与任务写入在同一事务中，回滚时一起撤销
+    if total or completed:
+        table = TaskStats.__table__
+        connection.execute(table.update().values(
+            total=table.c.total + total, completed=table.c.completed + completed))
+
+def refresh_task_stats(connection):
+    """用分组聚合重新统计计数，用于初始化已有数据库或修正偏差。"""
+    todo = Todo.__table__
+    counts = dict(connection.execute(
+        select(todo.c.completed, func.count()).group_by(todo.c.completed)).all())
+    connection.execute(TaskStats.__table__.update().values(
+        total=sum(counts.values()), completed=counts.get(True, 0)))
+
+@event.listens_for(db.session, 'before_flush')
+def track_task_changes(session, flush_context, instances):
+    changed = [obj for obj in session.new if isinstance(obj, Todo)]
+    changed += [obj for obj in session.dirty
+                if isinstance(obj, Todo) and session.is_modified(obj)]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Todo)]
+    if not changed and not deleted:
+        return
+
+    connection = session.connection()
+    version = next_sync_version(connection)
+    now = datetime.utcnow()
+    total = completed = 0
+    for task in changed:
+        task.version = version
+        history = get_history(task, 'completed')
+        if task in session.new:
+            # 新建任务的 created_at 与 updated_at 相同，推送时据此区分 created/updated
+            task.created_at = task.updated_at = task.created_at or now
+            total += 1
+            completed += bool(task.completed)
+        elif history.added and history.deleted:
+            completed += bool(history.added[0]) - bool(history.deleted[0])
+        mark_tasks_changed(session, *history.sum())
+    for task in deleted:
+        session.add(TaskTombstone(task_id=task.id, version=version))
+        mark_tasks_changed(session, task.completed)
+        total -= 1
+        completed -= bool(task.completed)
+    update_task_stats(connection, total, completed)
+
+def mark_tasks_changed(session, *completed_values):
+    # 记录本事务影响的列表缓存命名空间，提交后才让缓存失效
+    session.info.setdefault('task_cache_statuses', set()).update(
+        affected_statuses(*completed_values))
+
+@event.listens_for(db.session, 'after_commit')
+def notify_task_listeners(session):
+    statuses = session.info.pop('task_cache_statuses', ())
+    # 列表缓存和变更通知都挂在应用上，见 create_app
+    if has_app_context():
+        current_app.extensions['task_cache'].invalidate(statuses)
+        current_app.extensions['task_events'].notify()
+
+@event.listens_for(db.session, 'after_rollback')
+def discard_task_changes(session):
+    session.info.pop('task_cache_statuses', None)
+
+def select_task_columns():
+    return select(*[getattr(Todo, field) for field in TASK_FIELDS])
+
+def query_task_changes(since):
+    # 版本号大于 since 的任务（逐行读取的结果集），以及之后被删除的任务 id
+    tasks = db.session.execute(
+        select_task_columns().where(Todo.version > since).order_by(Todo.version, Todo.id))
+    deleted = db.session.execute(
+        select(TaskTombstone.task_id)
+        .where(TaskTombstone.version > since)
+        .order_by(TaskTombstone.version)).scalars().all()
+    return tasks, deleted
+
+def query_deadline_events(since):
+    return db.session.execute(
+        select(DeadlineEvent.task_id, DeadlineEvent.kind, DeadlineEvent.deadline, Todo.title)
+        .join(Todo, Todo.id == DeadlineEvent.task_id)
+        .where(DeadlineEvent.version > since)
+        .order_by(DeadlineEvent.version, DeadlineEvent.id))
+
+def init_db():
+    # 创建缺失的表，并把旧版本的数据库升级到当前结构（可重复执行）
+    with db.engine.begin() as connection:
+        upgrade_schema(connection, db.metadata)
+        refresh_task_stats(connection)
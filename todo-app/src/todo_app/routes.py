@@ -0,0 +1,752 @@
+import base64
+import codecs
+import csv
+import hashlib
+import json
+import time
+import unicodedata
+from datetime import datetime, timedelta
+from flask import Blueprint, Response, current_app, jsonify, request, render_template, stream_with_context
+from sqlalchemy import and_, bindparam, column, false, func, literal_column, or_, select, table, true
+from sqlalchemy.exc import OperationalError
+from .events import format_sse
+from .models import (TaskStats, TaskTombstone, Todo, current_sync_version, db, mark_tasks_changed,
+                     next_sync_version, pruned_sync_version, query_deadline_events,
+                     query_task_changes, select_task_columns, task_to_dict, update_task_stats)
+from .serialization import CHUNK_SIZE, dumps, iter_csv, iter_json_array, iter_ndjson
+
+# 分页游标：对 (deadline, id) 做 base64 编码，客户端只需原样回传
+def encode_cursor(task):
+    raw = json.dumps([task.deadline.isoformat(), task.id])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+def decode_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    deadline, task_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    return datetime.fromisoformat(deadline), int(task_id)
+
+def parse_deadline(value):
+    if not isinstance(value, str):
+        raise ValueError('deadline must be a string')
+    return datetime.fromisoformat(value.replace('Z', '+00:00'))
+
+def parse_duration(value):
+    """解析时长：纯数字表示秒，也支持 30s、15m、2h、1d 等写法。"""
+    units = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+    value = value.strip().lower()
+    if value and value[-1] in units:
+        seconds = float(value[:-1]) * units[value[-1]]
+    else:
+        seconds = float(value)
+    if not 0 < seconds < float('inf'):
+        raise ValueError('duration must be positive')
+    try:
+        return timedelta(seconds=seconds)
+    except OverflowError:
+        raise ValueError('duration is too large')
+
+# 路由
+bp = Blueprint('todo', __name__)
+
+@bp.route('/')
+def index():
+    return render_template('index.html')
+
+# API 路由
+@bp.route('/api/tasks', methods=['GET'])
+def get_tasks():
+    since = request.args.get('since')
+    if since is not None:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({'error': 'Invalid since token'}), 400
+        if since < 0:
+            return jsonify({'error': 'Invalid since token'}), 400
+        if since < pruned_sync_version():
+            return resync_required()
+        # 先读取版本号再查询数据：期间若有并发写入，客户端下次同步时会重复收到这些变更，
+        # 重复应用是幂等的，不会丢失
+        sync_version = current_sync_version()
+        etag = make_etag(sync_version)
+        if request.if_none_match.contains(etag):
+            return not_modified(etag, sync_version)
+        return with_sync_headers(get_task_changes(since, sync_version), etag, sync_version)
+
+    # 只选取需要的列，得到元组行而不是 ORM 对象
+    query = select_task_columns()
+
+    status = request.args.get('status', 'all')
+    try:
+        query = filter_status(query, status)
+        query, limit = paginate(query)
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    task_cache = current_app.extensions['task_cache']
+    cache_key = task_cache.key(status, limit, request.args.get('cursor', ''))
+    page = task_cache.get(cache_key)
+    cache_hit = page is not None
+    # 命中缓存时用缓存时的版本号，不需要访问数据库
+    sync_version = page['sync_version'] if page else current_sync_version()
+    etag = make_etag(sync_version)
+    if request.if_none_match.contains(etag):
+        return not_modified(etag, sync_version)
+
+    if page is None:
+        page = fetch_task_page(query, limit)
+        page['sync_version'] = sync_version
+        task_cache.set(cache_key, page)
+
+    response = task_page_response(page)
+    response.headers['X-Cache'] = 'HIT' if cache_hit else 'MISS'
+    return with_sync_headers(response, etag, sync_version)
+
+def filter_status(query, status):
+    # 按完成状态筛选：all、active 或 completed
+    if status == 'active':
+        return query.where(Todo.completed == false())
+    if status == 'completed':
+        return query.where(Todo.completed == true())
+    if status != 'all':
+        raise ValueError('Invalid status')
+    return query
+
+def parse_limit():
+    try:
+        limit = int(request.args.get('limit', current_app.config['TASKS_PAGE_SIZE']))
+    except ValueError:
+        raise ValueError('Invalid limit')
+    if limit <= 0:
+        raise ValueError('Invalid limit')
+    return min(limit, current_app.config['TASKS_MAX_PAGE_SIZE'])
+
+def paginate(query):
+    """按请求中的 limit 和 cursor 参数给查询加上分页条件，返回 (query, limit)。"""
+    limit = parse_limit()
+
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            deadline, task_id = decode_cursor(cursor)
+        except (ValueError, TypeError):
+            raise ValueError('Invalid cursor')
+        query = query.where(or_(
+            Todo.deadline > deadline,
+            and_(Todo.deadline == deadline, Todo.id > task_id)
+        ))
+    return query, limit
+
+def fetch_task_page(query, limit):
+    # 多取一行用于判断是否还有下一页
+    rows = db.session.execute(
+        query.order_by(Todo.deadline, Todo.id).limit(limit + 1)).all()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    return {
+        'body': ''.join(iter_json_array([rows])),
+        'next_cursor': encode_cursor(rows[-1]) if has_more else None
+    }
+
+def task_page_response(page):
+    response = current_app.response_class(page['body'], mimetype='application/json')
+    if page['next_cursor']:
+        response.headers['X-Next-Cursor'] = page['next_cursor']
+    return response
+
+def make_etag(sync_version):
+    return hashlib.sha1(f'{sync_version}:{request.full_path}'.encode()).hexdigest()
+
+def not_modified(etag, sync_version):
+    return with_sync_headers(current_app.response_class(status=304), etag, sync_version)
+
+def resync_required():
+    # since 之后的部分墓碑已被清理，增量不再完整，客户端应重新拉取完整列表
+    return jsonify({'error': 'Resync required'}), 410
+
+def get_task_changes(since, sync_version):
+    # 增量模式：变更可能很多，分批读取并流式输出，不在内存中拼出整个响应
+    tasks, deleted = query_task_changes(since)
+
+    def generate():
+        yield f'{{"token":{dumps(str(sync_version))},"deleted":{dumps(deleted)},"tasks":'
+        yield from iter_json_array(tasks.partitions(CHUNK_SIZE))
+        yield '}'
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+def with_sync_headers(response, etag, sync_version):
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    response.headers['X-Sync-Token'] = str(sync_version)
+    return response
+
+# 任务变更推送（Server-Sent Events）
+@bp.route('/api/tasks/stream', methods=['GET'])
+def stream_tasks():
+    # 断线重连时浏览器会带上 Last-Event-ID，从该版本继续推送
+    since = request.headers.get('Last-Event-ID') or request.args.get('since')
+    if since:
+        try:
+            since = int(since)
+        except ValueError:
+            return jsonify({'error': 'Invalid since token'}), 400
+        if since < pruned_sync_version():
+            return resync_required()
+    else:
+        since = current_sync_version()
+    db.session.remove()
+
+    response = Response(stream_with_context(generate_task_events(since)),
+                        mimetype='text/event-stream')
+    response.cache_control.no_cache = True
+    # 禁止 nginx 等反向代理缓冲事件流
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+def generate_task_events(since):
+    task_events = current_app.extensions['task_events']
+    poll_interval = current_app.config['TASKS_STREAM_POLL_INTERVAL']
+    expires_at = time.monotonic() + current_app.config['TASKS_STREAM_MAX_AGE']
+
+    yield f"retry: {current_app.config['TASKS_STREAM_RETRY_MS']}\n\n"
+    # 连接到期后主动断开，由浏览器带着 Last-Event-ID 重连
+    while time.monotonic() < expires_at:
+        seen = task_events.version
+        sync_version = current_sync_version()
+        if sync_version > since:
+            tasks, deleted = query_task_changes(since)
+            for task in tasks:
+                kind = 'created' if task.created_at == task.updated_at else 'updated'
+                yield format_sse(task_to_dict(task), event=kind)
+            for task_id in deleted:
+                yield format_sse({'id': task_id}, event='deleted')
+            for reminder in query_deadline_events(since):
+                yield format_sse({
+                    'id': reminder.task_id,
+                    'title': reminder.title,
+                    'deadline': reminder.deadline.isoformat()
+                }, event=reminder.kind)
+            # 同一批变更的最后才带上 id，断线重连不会漏掉批次中剩余的事件
+            yield format_sse({'token': str(sync_version)}, event='sync', event_id=sync_version)
+            since = sync_version
+        # 等待期间不占用数据库连接，也不保持读事务
+        db.session.remove()
+
+        # 本进程内的写入会立即唤醒；其他 worker 的写入靠定时轮询发现
+        if not task_events.wait(seen, poll_interval):
+            yield ': keepalive\n\n'
+
+# 截止时间查询：都走 (completed, deadline) 索引的范围扫描
+@bp.route('/api/tasks/due', methods=['GET'])
+def get_due_tasks():
+    try:
+        within = parse_duration(request.args.get('within', str(current_app.config['TASKS_DUE_SOON_WINDOW'])))
+    except ValueError:
+        return jsonify({'error': 'Invalid within'}), 400
+
+    now = datetime.utcnow()
+    query = select_task_columns().where(
+        Todo.completed == false(),
+        Todo.deadline >= now,
+        Todo.deadline <= now + within
+    )
+    return task_range_response(query)
+
+@bp.route('/api/tasks/overdue', methods=['GET'])
+def get_overdue_tasks():
+    query = select_task_columns().where(
+        Todo.completed == false(),
+        Todo.deadline < datetime.utcnow()
+    )
+    return task_range_response(query)
+
+def task_range_response(query):
+    try:
+        query, limit = paginate(query)
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+    response = task_page_response(fetch_task_page(query, limit))
+    response.cache_control.no_cache = True
+    return response
+
+# 统计：总数和已完成数直接读取 TaskStats 中维护的计数；
+# 逾期和今天到期随时间变化，用 (completed, deadline) 索引上的范围计数，不读取表数据
+@bp.route('/api/tasks/stats', methods=['GET'])
+def get_task_stats():
+    try:
+        tz_offset = int(request.args.get('tz_offset', 0))
+    except ValueError:
+        return jsonify({'error': 'Invalid tz_offset'}), 400
+    if abs(tz_offset) > 24 * 60:
+        return jsonify({'error': 'Invalid tz_offset'}), 400
+
+    now = datetime.utcnow()
+    # "今天"按客户端时区计算：tz_offset 为本地时间比 UTC 快的分钟数
+    offset = timedelta(minutes=tz_offset)
+    end_of_today = datetime.combine((now + offset).date() + timedelta(days=1), datetime.min.time()) - offset
+
+    total, completed = db.session.execute(select(TaskStats.total, TaskStats.completed)).one()
+    overdue, due_today = db.session.execute(select(
+        count_active_tasks(Todo.deadline < now),
+        count_active_tasks(Todo.deadline >= now, Todo.deadline < end_of_today)
+    )).one()
+    response = jsonify({
+        'total': total,
+        'active': total - completed,
+        'completed': completed,
+        'overdue': overdue,
+        'due_today': due_today
+    })
+    response.cache_control.no_cache = True
+    return response
+
+def count_active_tasks(*conditions):
+    return select(func.count()).select_from(Todo).where(
+        Todo.completed == false(), *conditions).scalar_subquery()
+
+# 全文搜索：匹配 todo_fts 全文索引，按 bm25 相关度排序
+SEARCH_MAX_LENGTH = 200
+# trigram 分词至少需要 3 个字符才能走索引
+SEARCH_MIN_TERM_LENGTH = 3
+task_search = table('todo_fts', column('rowid'))
+
+@bp.route('/api/tasks/search', methods=['GET'])
+def search_tasks():
+    q = request.args.get('q', '').strip()
+    if not q:
+        return jsonify({'error': 'Missing query'}), 400
+    if len(q) > SEARCH_MAX_LENGTH:
+        return jsonify({'error': 'Query too long'}), 400
+    # NUL 等控制字符会截断 FTS5 的查询字符串
+    if any(unicodedata.category(char) == 'Cc' and not char.isspace() for char in q):
+        return jsonify({'error': 'Invalid query'}), 400
+
+    try:
+        query = filter_status(build_search_query(q.split()), request.args.get('status', 'all'))
+        limit = parse_limit()
+        offset = decode_offset_cursor(request.args['cursor']) if request.args.get('cursor') else 0
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    # 按相关度排序必须先算出所有匹配项的得分，所以按偏移量翻页，游标对客户端同样是不透明的
+    try:
+        rows = db.session.execute(query.limit(limit + 1).offset(offset)).all()
+    except OperationalError as error:
+        db.session.rollback()
+        message = str(error.orig)
+        # 只有全文索引不存在（SQLite 不支持 FTS5 或未执行 init-db）时才是服务不可用
+        if message.startswith(('no such table', 'no such module')):
+            return jsonify({'error': 'Search is not available'}), 503
+        if message.startswith(('fts5:', 'unterminated string')):
+            return jsonify({'error': 'Invalid query'}), 400
+        raise
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    response = task_page_response({
+        'body': ''.join(iter_json_array([rows])),
+        'next_cursor': encode_offset_cursor(offset + limit) if has_more else None
+    })
+    response.cache_control.no_cache = True
+    return response
+
+def build_search_query(terms):
+    """多个词之间是"并且"的关系。
+
+    足够长的词交给全文索引匹配并参与相关度排序；过短的词无法使用 trigram 索引，
+    在全文索引筛选后的结果上用 LIKE 过滤，只有短词时退化为扫描整张表。
+    """
+    long_terms = [term for term in terms if len(term) >= SEARCH_MIN_TERM_LENGTH]
+    short_terms = [term for term in terms if len(term) < SEARCH_MIN_TERM_LENGTH]
+
+    query = select_task_columns()
+    if long_terms:
+        # 每个词作为短语加引号，用户输入中的 FTS5 运算符不会生效
+        match = ' '.join('"' + term.replace('"', '""') + '"' for term in long_terms)
+        query = (query.join(task_search, task_search.c.rowid == Todo.id)
+                 .where(literal_column('todo_fts').op('MATCH')(match))
+                 .order_by(func.bm25(literal_column('todo_fts')), Todo.id))
+    else:
+        query = query.order_by(Todo.deadline, Todo.id)
+    for term in short_terms:
+        pattern = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        query = query.where(Todo.title.like(f'%{pattern}%', escape='\\'))
+    return query
+
+def encode_offset_cursor(offset):
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode()).decode().rstrip('=')
+
+def decode_offset_cursor(cursor):
+    padded = cursor + '=' * (-len(cursor) % 4)
+    try:
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode()))['offset']
+    except (ValueError, TypeError, KeyError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(offset, int) or offset < 0:
+        raise ValueError('Invalid cursor')
+    return offset
+
+@bp.route('/api/tasks', methods=['POST'])
+def create_task():
+    data = request.get_json()
+    if not data or 'title' not in data or 'deadline' not in data:
+        return jsonify({'error': 'Missing required fields'}), 400
+    
+    try:
+        deadline = parse_deadline(data['deadline'])
+        task = Todo(
+            title=data['title'],
+            deadline=deadline,
+            completed=data.get('completed', False)
+        )
+        db.session.add(task)
+        db.session.commit()
+        return jsonify(task.to_dict()), 201
+    except ValueError:
+        return jsonify({'error': 'Invalid date format'}), 400
+
+@bp.route('/api/tasks/<int:task_id>', methods=['PUT'])
+def update_task(task_id):
+    task = Todo.query.get_or_404(task_id)
+    data = request.get_json()
+    
+    if 'title' in data:
+        task.title = data['title']
+    if 'deadline' in data:
+        try:
+            task.deadline = parse_deadline(data['deadline'])
+        except ValueError:
+            return jsonify({'error': 'Invalid date format'}), 400
+    if 'completed' in data:
+        task.completed = data['completed']
+    
+    db.session.commit()
+    return jsonify(task.to_dict())
+
+@bp.route('/api/tasks/<int:task_id>', methods=['DELETE'])
+def delete_task(task_id):
+    task = Todo.query.get_or_404(task_id)
+    db.session.delete(task)
+    db.session.commit()
+    return '', 204
+
+# SQLite 旧版本单条语句最多 999 个绑定参数
+BATCH_CHUNK_SIZE = 500
+
+def chunked(items, size):
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+# 批量操作：一个请求、一个事务内完成混合的增删改，全部使用 Core 批量 SQL
+@bp.route('/api/tasks/batch', methods=['POST'])
+def batch_tasks():
+    data = request.get_json()
+    operations = data.get('operations') if isinstance(data, dict) else None
+    if not isinstance(operations, list) or not operations:
+        return jsonify({'error': 'Missing operations'}), 400
+    if len(operations) > current_app.config['TASKS_BATCH_MAX_SIZE']:
+        return jsonify({'error': 'Too many operations'}), 400
+
+    connection = db.session.connection()
+    results, plan = plan_batch(connection, operations)
+    if plan is None:
+        db.session.rollback()
+        return jsonify({'error': 'Batch rejected', 'results': results}), 400
+
+    rows = apply_batch(connection, plan)
+    mark_tasks_changed(db.session, *plan['completed_values'])
+    db.session.commit()
+
+    for result in results:
+        row = rows.get(result['id'])
+        if row is not None and result['status'] != 204:
+            result['task'] = task_to_dict(row)
+    return jsonify({'results': results})
+
+def plan_batch(connection, operations):
+    """校验批量操作并合并为执行计划。
+
+    任何一项不合法时整批拒绝：返回 (results, None)，未出错的项标记为 424。
+    """
+    parsed = []
+    errors = {}
+    for index, item in enumerate(operations):
+        try:
+            parsed.append(parse_operation(item))
+        except ValueError as error:
+            parsed.append(None)
+            errors[index] = (400, str(error))
+
+    todo = Todo.__table__
+    target_ids = {op['id'] for op in parsed if op and op['op'] != 'create'}
+    # 已存在的任务 id -> 当前完成状态
+    existing = {}
+    for chunk in chunked(sorted(target_ids), BATCH_CHUNK_SIZE):
+        existing.update(connection.execute(
+            select(todo.c.id, todo.c.completed).where(todo.c.id.in_(chunk))).all())
+
+    # 按顺序模拟执行：同一任务的多次更新合并，删除之后的操作视为不存在
+    creates, updates, deletes = [], {}, {}
+    for index, op in enumerate(parsed):
+        if op is None:
+            continue
+        if op['op'] == 'create':
+            creates.append((index, op['values']))
+        elif op['id'] not in existing or op['id'] in deletes:
+            errors[index] = (404, 'Task not found')
+        elif op['op'] == 'update':
+            updates.setdefault(op['id'], {}).update(op['values'])
+        else:
+            deletes[op['id']] = index
+
+    results = []
+    for index, op in enumerate(parsed):
+        if index in errors:
+            status, message = errors[index]
+            results.append({'id': op['id'] if op else None, 'status': status, 'error': message})
+        elif errors:
+            results.append({'id': op.get('id'), 'status': 424, 'error': 'Not applied'})
+        else:
+            status = {'create': 201, 'update': 200, 'delete': 204}[op['op']]
+            results.append({'id': op.get('id'), 'status': status})
+    if errors:
+        return results, None
+
+    # 修改前后的完成状态，用于让对应的列表缓存失效
+    completed_values = [values['completed'] for _, values in creates]
+    for task_id, values in updates.items():
+        completed_values.append(existing[task_id])
+        if 'completed' in values:
+            completed_values.append(values['completed'])
+    completed_values.extend(existing[task_id] for task_id in deletes)
+
+    for task_id in deletes:
+        updates.pop(task_id, None)
+
+    # 任务总数和已完成数的变化，见 TaskStats
+    completed_delta = sum(bool(values['completed']) for _, values in creates)
+    completed_delta += sum(bool(values['completed']) - bool(existing[task_id])
+                           for task_id, values in updates.items() if 'completed' in values)
+    completed_delta -= sum(bool(existing[task_id]) for task_id in deletes)
+    plan = {
+        'creates': creates,
+        'updates': updates,
+        'deletes': list(deletes),
+        'results': results,
+        'completed_values': completed_values,
+        'stats_delta': (len(creates) - len(deletes), completed_delta)
+    }
+    return results, plan
+
+def parse_operation(item):
+    if not isinstance(item, dict) or item.get('op') not in ('create', 'update', 'delete'):
+        raise ValueError('Invalid operation')
+
+    if item['op'] == 'create':
+        if 'title' not in item or 'deadline' not in item:
+            raise ValueError('Missing required fields')
+        values = {
+            'title': parse_task_title(item['title']),
+            'deadline': parse_task_deadline(item['deadline']),
+            'completed': parse_task_completed(item.get('completed', False))
+        }
+        return {'op': 'create', 'values': values}
+
+    task_id = item.get('id')
+    if not isinstance(task_id, int) or isinstance(task_id, bool):
+        raise ValueError('Invalid task id')
+    values = {}
+    if item['op'] == 'update':
+        if 'title' in item:
+            values['title'] = parse_task_title(item['title'])
+        if 'deadline' in item:
+            values['deadline'] = parse_task_deadline(item['deadline'])
+        if 'completed' in item:
+            values['completed'] = parse_task_completed(item['completed'])
+    return {'op': item['op'], 'id': task_id, 'values': values}
+
+# 批量写入不经过 ORM，类型不对的值会让整批在数据库层失败，因此逐项校验
+def parse_task_title(value):
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError('Invalid title')
+    return value
+
+def parse_task_completed(value):
+    if not isinstance(value, bool):
+        raise ValueError('Invalid completed value')
+    return value
+
+def parse_task_deadline(value):
+    try:
+        return parse_deadline(value)
+    except ValueError:
+        raise ValueError('Invalid date format')
+
+def apply_batch(connection, plan):
+    """执行计划，返回批次涉及且仍存在的任务行（id -> row）。"""
+    todo = Todo.__table__
+    tombstone = TaskTombstone.__table__
+    now = datetime.utcnow()
+    # 整批共用一个同步版本号；该 UPDATE 同时拿到写锁，之后的自增 id 不会被其他写入者占用
+    version = next_sync_version(connection)
+    update_task_stats(connection, *plan['stats_delta'])
+
+    if plan['creates']:
+        max_id = connection.execute(select(func.max(todo.c.id))).scalar() or 0
+        connection.execute(todo.insert(), [
+            dict(values, created_at=now, updated_at=now, version=version)
+            for _, values in plan['creates']
+        ])
+        new_ids = connection.execute(
+            select(todo.c.id).where(todo.c.id > max_id).order_by(todo.c.id)).scalars().all()
+        for (index, _), task_id in zip(plan['creates'], new_ids):
+            plan['results'][index]['id'] = task_id
+
+    # 按更新的列分组，每组一次 executemany
+    groups = {}
+    for task_id, values in plan['updates'].items():
+        groups.setdefault(tuple(sorted(values)), []).append(
+            dict(values, _id=task_id, updated_at=now, version=version))
+    for params in groups.values():
+        connection.execute(todo.update().where(todo.c.id == bindparam('_id')), params)
+
+    for chunk in chunked(plan['deletes'], BATCH_CHUNK_SIZE):
+        connection.execute(todo.delete().where(todo.c.id.in_(chunk)))
+    if plan['deletes']:
+        connection.execute(tombstone.insert(), [
+            {'task_id': task_id, 'version': version, 'deleted_at': now}
+            for task_id in plan['deletes']
+        ])
+
+    rows = {}
+    changed_ids = [result['id'] for result in plan['results'] if result['status'] != 204]
+    for chunk in chunked(changed_ids, BATCH_CHUNK_SIZE):
+        for row in connection.execute(select(todo).where(todo.c.id.in_(chunk))):
+            rows[row.id] = row
+    return rows
+
+# 导入导出：NDJSON（每行一个 JSON 对象）或 CSV（第一行为表头）
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', iter_ndjson),
+    'csv': ('text/csv', iter_csv)
+}
+IMPORT_MIMETYPES = {
+    'application/x-ndjson': 'ndjson',
+    'application/jsonl': 'ndjson',
+    'text/csv': 'csv'
+}
+# 导入时每个事务写入的行数
+IMPORT_BATCH_SIZE = 1000
+# 响应中最多列出的错误行数，其余只计数
+IMPORT_MAX_ERRORS = 100
+
+@bp.route('/api/tasks/export', methods=['GET'])
+def export_tasks():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Invalid format'}), 400
+    try:
+        query = filter_status(select_task_columns(), request.args.get('status', 'all'))
+    except ValueError as error:
+        return jsonify({'error': str(error)}), 400
+
+    mimetype, encode = EXPORT_FORMATS[export_format]
+    # 逐批读取并编码，内存占用与任务总数无关
+    rows = db.session.execute(query.order_by(Todo.id))
+    response = Response(stream_with_context(encode(rows.partitions(CHUNK_SIZE))), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=tasks.{export_format}'
+    return response
+
+@bp.route('/api/tasks/import', methods=['POST'])
+def import_tasks():
+    import_format = request.args.get('format') or IMPORT_MIMETYPES.get(request.mimetype)
+    if import_format not in EXPORT_FORMATS:
+        return jsonify({'error': 'Unsupported format'}), 415
+
+    # 边读取请求体边解析，每凑满一批就在单独的事务中写入；出错的行跳过并记录
+    lines = LineCounter(codecs.iterdecode(request.stream, 'utf-8-sig'))
+    rows = iter_ndjson_rows(lines) if import_format == 'ndjson' else iter_csv_rows(lines)
+    imported = failed = 0
+    errors = []
+    batch = []
+    try:
+        for line, item in rows:
+            try:
+                batch.append(parse_import_row(item))
+            except ValueError as error:
+                failed += 1
+                if len(errors) < IMPORT_MAX_ERRORS:
+                    errors.append({'line': line, 'error': str(error)})
+                continue
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                imported += insert_tasks(batch)
+                batch = []
+    except UnicodeDecodeError:
+        # 出错的是尚未读完的下一行
+        errors.append({'line': lines.count + 1, 'error': 'Invalid encoding'})
+    except csv.Error as error:
+        errors.append({'line': lines.count, 'error': f'Invalid CSV: {error}'})
+    # 出错之前已通过校验的行照常写入
+    if batch:
+        imported += insert_tasks(batch)
+    return jsonify({'imported': imported, 'failed': failed, 'errors': errors})
+
+class LineCounter:
+    """逐行迭代并记录已读取的行数，用于在解码或 CSV 错误中报告行号。"""
+
+    def __init__(self, lines):
+        self.lines = lines
+        self.count = 0
+
+    def __iter__(self):
+        for line in self.lines:
+            self.count += 1
+            yield line
+
+def iter_ndjson_rows(lines):
+    for number, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            yield number, json.loads(line)
+        except ValueError:
+            yield number, None
+
+def iter_csv_rows(lines):
+    reader = csv.DictReader(lines)
+    for row in reader:
+        yield reader.line_num, row
+
+def parse_import_row(item):
+    # 与 create_task 相同的校验；导入的任务总是新建，忽略其中的 id 等字段
+    if not isinstance(item, dict):
+        raise ValueError('Invalid row')
+    # csv.DictReader 把多出的列放在键 None 下
+    if None in item:
+        raise ValueError('Too many columns')
+    values = dict(item)
+    if 'completed' in values:
+        values['completed'] = parse_import_bool(values['completed'])
+    return parse_operation(dict(values, op='create'))['values']
+
+def parse_import_bool(value):
+    # CSV 中的值都是字符串
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ('true', '1', 'yes'):
+        return True
+    if isinstance(value, str) and value.strip().lower() in ('false', '0', 'no', ''):
+        return False
+    raise ValueError('Invalid completed value')
+
+def insert_tasks(batch):
+    connection = db.session.connection()
+    now = datetime.utcnow()
+    version = next_sync_version(connection)
+    connection.execute(Todo.__table__.insert(), [
+        dict(values, created_at=now, updated_at=now, version=version) for values in batch
+    ])
+    update_task_stats(connection, len(batch), sum(bool(values['completed']) for values in batch))
+    mark_tasks_changed(db.session, *[values['completed'] for values in batch])
+    db.session.commit()
+    return len(batch)
@@ -0,0 +1,225 @@
+import heapq
+import logging
+import threading
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import false, select
+from sqlalchemy.exc import IntegrityError
+from .models import (DeadlineEvent, Todo, current_sync_version, db, next_sync_version,
+                     prune_sync_history, query_task_changes)
+
+logger = logging.getLogger(__name__)
+
+# 截止提醒的两种事件：即将到期、已逾期
+DUE = 'due'
+OVERDUE = 'overdue'
+
+# 后台线程清理过期同步记录（墓碑和提醒）的间隔
+PRUNE_INTERVAL = timedelta(hours=1)
+
+class DeadlineHeap:
+    """未完成任务截止时间的最小堆。
+
+    每个任务在堆中有两个触发点：截止前 due_window 的"即将到期"和截止时的"已逾期"。
+    任务修改或删除时不在堆中查找旧元素，而是弹出时与 _deadlines 对比，过时的直接丢弃。
+    """
+
+    def __init__(self, due_window):
+        self.due_window = due_window
+        self._heap = []
+        self._deadlines = {}
+
+    def __len__(self):
+        return len(self._deadlines)
+
+    def upsert(self, task_id, deadline, completed):
+        if completed:
+            self.remove(task_id)
+            return
+        if self._deadlines.get(task_id) == deadline:
+            return
+        self._deadlines[task_id] = deadline
+        heapq.heappush(self._heap, (deadline - self.due_window, task_id, DUE, deadline))
+        heapq.heappush(self._heap, (deadline, task_id, OVERDUE, deadline))
+        self._maybe_compact()
+
+    def remove(self, task_id):
+        self._deadlines.pop(task_id, None)
+
+    def pop_fired(self, now):
+        # 弹出所有触发时间不晚于 now 的事件，返回 [(task_id, kind, deadline), ...]
+        fired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, task_id, kind, deadline = heapq.heappop(self._heap)
+            if self._deadlines.get(task_id) != deadline:
+                continue
+            fired.append((task_id, kind, deadline))
+            if kind == OVERDUE:
+                del self._deadlines[task_id]
+        return fired
+
+    def next_fire_time(self):
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+        return self._heap[0][0] if self._heap else None
+
+    def _is_current(self, item):
+        return self._deadlines.get(item[1]) == item[3]
+
+    def _maybe_compact(self):
+        # 过时元素太多时重建堆，避免频繁修改截止时间导致堆无限增长
+        if len(self._heap) > 4 * len(self._deadlines) + 1024:
+            self._heap = [item for item in self._heap if self._is_current(item)]
+            heapq.heapify(self._heap)
+
+class DeadlineWorker(threading.Thread):
+    """后台线程：维护截止时间堆，并在到期/逾期时各发出一次事件。
+
+    source 提供数据库访问：
+      sync_version()                  当前同步版本号
+      load_range(start, end)          截止时间在 (start, end] 内的未完成任务 (id, deadline, completed)
+      load_changes(since)             since 之后变更的任务行和删除的任务 id
+      claim(task_id, kind, deadline)  记录事件，已被其他进程记录过时返回 False
+      cleanup()                       释放本轮使用的数据库连接
+
+    堆中只保存截止时间在 horizon 之内的任务，之后随时间推移按范围增量加载。
+    """
+
+    def __init__(self, app, source, broker, due_window, poll_interval, horizon, catchup, retention):
+        super().__init__(name='deadline-worker', daemon=True)
+        self.app = app
+        self.source = source
+        self.broker = broker
+        self.heap = DeadlineHeap(due_window)
+        self.poll_interval = poll_interval
+        self.horizon = horizon
+        self.catchup = catchup
+        self.retention = retention
+        self._stopped = threading.Event()
+
+    def stop(self):
+        self._stopped.set()
+        self.broker.notify()
+
+    def run(self):
+        with self.app.app_context():
+            self._run()
+
+    def _run(self):
+        since = loaded_until = next_prune = None
+        while not self._stopped.is_set():
+            seen = self.broker.version
+            try:
+                now = datetime.utcnow()
+                if loaded_until is None:
+                    # 首次加载时补上最近 catchup 时间内错过的事件（例如重启期间）
+                    since = self.source.sync_version()
+                    self._load(now - self.catchup, now + self.horizon)
+                    loaded_until = now + self.horizon
+                else:
+                    since = self._apply_changes(since, loaded_until)
+                if now + self.horizon - loaded_until > self.horizon / 2:
+                    self._load(loaded_until, now + self.horizon)
+                    loaded_until = now + self.horizon
+                for task_id, kind, deadline in self.heap.pop_fired(now):
+                    self.source.claim(task_id, kind, deadline)
+                if next_prune is None or now >= next_prune:
+                    self.source.prune(now - self.retention)
+                    next_prune = now + PRUNE_INTERVAL
+            except Exception:
+                logger.exception('Deadline worker iteration failed')
+            finally:
+                self.source.cleanup()
+
+            self.broker.wait(seen, self._sleep_seconds())
+
+    def _load(self, start, end):
+        for task_id, deadline, completed in self.source.load_range(start, end):
+            self.heap.upsert(task_id, deadline, completed)
+
+    def _apply_changes(self, since, loaded_until):
+        version = self.source.sync_version()
+        if version <= since:
+            return since
+        rows, deleted = self.source.load_changes(since)
+        for row in rows:
+            # 超出已加载范围的任务留给之后的范围加载
+            if row.deadline <= loaded_until:
+                self.heap.upsert(row.id, row.deadline, row.completed)
+            else:
+                self.heap.remove(row.id)
+        for task_id in deleted:
+            self.heap.remove(task_id)
+        return version
+
+    def _sleep_seconds(self):
+        # 睡到下一个触发点，但不超过轮询间隔，以便发现其他进程的写入
+        next_fire = self.heap.next_fire_time()
+        if next_fire is None:
+            return self.poll_interval
+        remaining = (next_fire - datetime.utcnow()).total_seconds()
+        return max(0.0, min(self.poll_interval, remaining))
+
+class TaskDeadlineSource:
+    # DeadlineWorker 的数据库访问，在后台线程的应用上下文中调用
+
+    def sync_version(self):
+        return current_sync_version()
+
+    def load_range(self, start, end):
+        return db.session.execute(
+            select(Todo.id, Todo.deadline, Todo.completed).where(
+                Todo.completed == false(),
+                Todo.deadline > start,
+                Todo.deadline <= end
+            )).all()
+
+    def load_changes(self, since):
+        tasks, deleted = query_task_changes(since)
+        return tasks.all(), deleted
+
+    def claim(self, task_id, kind, deadline):
+        # 与版本号递增放在同一事务中：提醒会像任务变更一样通过推送流发出
+        try:
+            with db.engine.begin() as connection:
+                version = next_sync_version(connection)
+                connection.execute(DeadlineEvent.__table__.insert().values(
+                    task_id=task_id, kind=kind, deadline=deadline,
+                    version=version, created_at=datetime.utcnow()))
+        except IntegrityError:
+            return False
+        current_app.extensions['task_events'].notify()
+        return True
+
+    def prune(self, before):
+        with db.engine.begin() as connection:
+            prune_sync_history(connection, before)
+
+    def cleanup(self):
+        db.session.remove()
+
+def sync_retention(config):
+    """同步记录的保留时间。
+
+    已清理的提醒不能落在启动补发的范围内，否则重启后会再次发出，
+    因此至少保留 TASKS_SCHEDULER_CATCHUP 加上 TASKS_DUE_SOON_WINDOW。
+    """
+    return timedelta(seconds=max(
+        config['TASKS_SYNC_RETENTION'],
+        config['TASKS_SCHEDULER_CATCHUP'] + config['TASKS_DUE_SOON_WINDOW']))
+
+def start_deadline_worker(app):
+    # 每个应用只启动一个后台线程
+    if 'deadline_worker' in app.extensions:
+        return
+
+    deadline_worker = DeadlineWorker(
+        app, TaskDeadlineSource(), app.extensions['task_events'],
+        due_window=timedelta(seconds=app.config['TASKS_DUE_SOON_WINDOW']),
+        poll_interval=app.config['TASKS_SCHEDULER_POLL_INTERVAL'],
+        horizon=timedelta(seconds=app.config['TASKS_SCHEDULER_HORIZON']),
+        catchup=timedelta(seconds=app.config['TASKS_SCHEDULER_CATCHUP']),
+        retention=sync_retention(app.config)
+    )
+    app.extensions['deadline_worker'] = deadline_worker
+    deadline_worker.start()
@@ -0,0 +1,64 @@
+"""任务列表的快速序列化。
+
+直接处理按列查询得到的元组行，不创建 ORM 对象；安装了 orjson 时用它编码。
+"""
+import csv
+import io
+import json
+from datetime import datetime
+
+try:
+    import orjson
+except ImportError:  # orjson 是可选依赖
+    orjson = None
+
+# 列表接口返回的字段，查询时按这个顺序选取列
+TASK_FIELDS = ('id', 'title', 'deadline', 'completed', 'created_at', 'updated_at')
+
+# 流式响应每次从数据库取出并编码的行数
+CHUNK_SIZE = 1000
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+def dumps(value):
+    if orjson is not None:
+        return orjson.dumps(value).decode()
+    return json.dumps(value, default=_default, ensure_ascii=False, separators=(',', ':'))
+
+def iter_json_array(row_batches):
+    # 逐批编码，每批产出一段 JSON 文本，内存占用只与批大小有关
+    yield '['
+    separator = ''
+    for rows in row_batches:
+        if not rows:
+            continue
+        yield separator + dumps([dict(zip(TASK_FIELDS, row)) for row in rows])[1:-1]
+        separator = ','
+    yield ']'
+
+def iter_ndjson(row_batches):
+    # 每行一个任务对象（换行分隔的 JSON）
+    for rows in row_batches:
+        if rows:
+            yield ''.join(dumps(dict(zip(TASK_FIELDS, row))) + '\n' for row in rows)
+
+def iter_csv(row_batches):
+    # 第一行是表头；时间为 ISO 8601 格式，完成状态为 true/false
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    writer.writerow(TASK_FIELDS)
+    for rows in row_batches:
+        for row in rows:
+            writer.writerow([
+                value.isoformat() if isinstance(value, datetime) else
+                str(value).lower() if isinstance(value, bool) else value
+                for value in row
+            ])
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
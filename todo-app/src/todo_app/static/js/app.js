@@ -4,14 +4,41 @@ const taskInput = document.getElementById('task-input');
 const deadlineInput = document.getElementById('deadline-input');
 const taskList = document.getElementById('task-list');
 const filterButtons = document.querySelectorAll('.filter-btn');
+const loadMoreButton = document.getElementById('load-more-btn');
+
+// 每页加载的任务数
+const PAGE_SIZE = 50;
+
+// 推送连接被服务端拒绝后，等待多久重新加载并订阅（毫秒）
+const RESYNC_DELAY_MS = 3000;
 
 // 当前筛选器
 let currentFilter = 'all';
 
+// 下一页游标（由服务端通过 X-Next-Cursor 响应头返回）
+let nextCursor = null;
+
+// 本地任务状态：已加载的任务（id -> task）
+let tasksById = new Map();
+
+// 本地状态对应的同步版本号（由服务端通过 X-Sync-Token 响应头返回）
+let syncToken = null;
+
+// 已加载范围内的最后一个任务；还有下一页时，排在它之后的任务留给"加载更多"
+let lastLoadedTask = null;
+
+// 任务变更推送连接
+let taskStream = null;
+
+// 是否已安排重新渲染
+let renderScheduled = false;
+
 // 初始化应用
-document.addEventListener('DOMContentLoaded', () => {
-    loadTasks();
+document.addEventListener('DOMContentLoaded', async () => {
     setupEventListeners();
+    await loadTasks();
+    connectTaskStream();
+    startCountdownTimer();
 });
 
 // 设置事件监听器
@@ -28,27 +55,130 @@ function setupEventListeners() {
             loadTasks();
         });
     });
+    
+    // 加载更多
+    loadMoreButton.addEventListener('click', loadMoreTasks);
+}
+
+// 请求一页任务（筛选和分页都在服务端完成）
+async function fetchTaskPage(cursor) {
+    const params = new URLSearchParams({ status: currentFilter, limit: PAGE_SIZE });
+    if (cursor) params.set('cursor', cursor);
+    
+    const response = await fetch(`/api/tasks?${params}`);
+    // 错误响应（例如游标无效时的 400）不更新游标和版本号，交给调用方的 catch 处理
+    if (!response.ok) throw new Error(`HTTP ${response.status}`);
+    const tasks = await response.json();
+    
+    // 只记录第一页的版本号：翻页期间发生的变更会在下次同步时补上
+    if (!cursor) syncToken = response.headers.get('X-Sync-Token');
+    nextCursor = response.headers.get('X-Next-Cursor');
+    loadMoreButton.hidden = !nextCursor;
+    
+    tasks.forEach(task => tasksById.set(task.id, task));
+    if (tasks.length > 0) lastLoadedTask = tasks[tasks.length - 1];
 }
 
-// 加载任务
+// 加载任务（从第一页开始）
 async function loadTasks() {
+    tasksById = new Map();
+    lastLoadedTask = null;
+    
     try {
-        const response = await fetch('/api/tasks');
-        let tasks = await response.json();
-        
-        // 应用筛选
-        tasks = tasks.filter(task => {
-            if (currentFilter === 'active') return !task.completed;
-            if (currentFilter === 'completed') return task.completed;
-            return true; // all
-        });
-        
-        renderTasks(tasks);
+        await fetchTaskPage(null);
+        renderTasks(sortedTasks());
+    } catch (error) {
+        console.error('加载任务失败:', error);
+    }
+}
+
+// 加载下一页任务
+async function loadMoreTasks() {
+    if (!nextCursor) return;
+    
+    try {
+        await fetchTaskPage(nextCursor);
+        renderTasks(sortedTasks());
     } catch (error) {
         console.error('加载任务失败:', error);
     }
 }
 
+// 订阅服务端推送的任务变更（包括其他客户端的修改）
+function connectTaskStream() {
+    // 断线后浏览器会自动重连，并通过 Last-Event-ID 从上次的版本继续
+    taskStream = new EventSource(`/api/tasks/stream?since=${encodeURIComponent(syncToken || '')}`);
+    
+    ['created', 'updated'].forEach(type => {
+        taskStream.addEventListener(type, event => applyTask(JSON.parse(event.data)));
+    });
+    taskStream.addEventListener('deleted', event => removeTask(JSON.parse(event.data).id));
+    // 截止提醒：任务即将到期或已逾期时立即刷新倒计时，不必等到下一分钟
+    ['due', 'overdue'].forEach(type => {
+        taskStream.addEventListener(type, scheduleRender);
+    });
+    taskStream.addEventListener('sync', event => {
+        syncToken = JSON.parse(event.data).token;
+    });
+    // 服务端拒绝连接时（例如 410：since 之后的同步记录已被清理）浏览器不会重连，
+    // 稍后重新加载完整列表并以新的版本号订阅
+    taskStream.addEventListener('error', () => {
+        if (taskStream.readyState !== EventSource.CLOSED) return;
+        setTimeout(async () => {
+            await loadTasks();
+            connectTaskStream();
+        }, RESYNC_DELAY_MS);
+    });
+}
+
+// 把一个任务的最新状态合并到本地状态
+function applyTask(task) {
+    if (matchesFilter(task) && isWithinLoadedRange(task)) {
+        tasksById.set(task.id, task);
+    } else {
+        tasksById.delete(task.id);
+    }
+    scheduleRender();
+}
+
+// 从本地状态移除任务
+function removeTask(taskId) {
+    if (tasksById.delete(taskId)) {
+        scheduleRender();
+    }
+}
+
+// 同一批事件合并为一次渲染
+function scheduleRender() {
+    if (renderScheduled) return;
+    renderScheduled = true;
+    requestAnimationFrame(() => {
+        renderScheduled = false;
+        renderTasks(sortedTasks());
+    });
+}
+
+// 任务是否属于当前筛选器
+function matchesFilter(task) {
+    if (currentFilter === 'active') return !task.completed;
+    if (currentFilter === 'completed') return task.completed;
+    return true; // all
+}
+
+// 任务是否落在已加载的范围内
+function isWithinLoadedRange(task) {
+    return !nextCursor || !lastLoadedTask || compareTasks(task, lastLoadedTask) <= 0;
+}
+
+// 与服务端一致的排序：先按截止时间，再按 id
+function compareTasks(a, b) {
+    return (new Date(a.deadline) - new Date(b.deadline)) || (a.id - b.id);
+}
+
+function sortedTasks() {
+    return Array.from(tasksById.values()).sort(compareTasks);
+}
+
 // 渲染任务列表
 function renderTasks(tasks) {
     taskList.innerHTML = '';
@@ -89,9 +219,6 @@ function renderTasks(tasks) {
         
         taskList.appendChild(taskElement);
     });
-    
-    // 更新倒计时
-    startCountdownTimer();
 }
 
 // 添加新任务
@@ -118,7 +245,7 @@ async function handleAddTask(e) {
         if (response.ok) {
             taskInput.value = '';
             deadlineInput.value = '';
-            loadTasks();
+            applyTask(await response.json());
         }
     } catch (error) {
         console.error('添加任务失败:', error);
@@ -128,7 +255,7 @@ async function handleAddTask(e) {
 // 切换任务完成状态
 async function toggleTaskCompletion(taskId, completed) {
     try {
-        await fetch(`/api/tasks/${taskId}`, {
+        const response = await fetch(`/api/tasks/${taskId}`, {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
@@ -136,7 +263,7 @@ async function toggleTaskCompletion(taskId, completed) {
             body: JSON.stringify({ completed })
         });
         
-        loadTasks();
+        if (response.ok) applyTask(await response.json());
     } catch (error) {
         console.error('更新任务状态失败:', error);
     }
@@ -161,7 +288,7 @@ function editTask(task) {
 // 更新任务
 async function updateTask(taskId, updates) {
     try {
-        await fetch(`/api/tasks/${taskId}`, {
+        const response = await fetch(`/api/tasks/${taskId}`, {
             method: 'PUT',
             headers: {
                 'Content-Type': 'application/json',
@@ -169,7 +296,7 @@ async function updateTask(taskId, updates) {
             body: JSON.stringify(updates)
         });
         
-        loadTasks();
+        if (response.ok) applyTask(await response.json());
     } catch (error) {
         console.error('更新任务失败:', error);
     }
@@ -180,11 +307,11 @@ async function deleteTask(taskId) {
     if (!confirm('确定要删除这个任务吗？')) return;
     
     try {
-        await fetch(`/api/tasks/${taskId}`, {
+        const response = await fetch(`/api/tasks/${taskId}`, {
             method: 'DELETE'
         });
         
-        loadTasks();
+        if (response.ok) removeTask(taskId);
     } catch (error) {
         console.error('删除任务失败:', error);
     }
@@ -223,26 +350,17 @@ function getCountdownClass(task) {
     return '';
 }
 
-// 启动倒计时定时器
+// 启动倒计时定时器（只在初始化时启动一次）
 function startCountdownTimer() {
-    // 每分钟更新一次倒计时
+    // 每分钟根据本地状态刷新倒计时，不需要请求服务端
     setInterval(() => {
-        const countdowns = document.querySelectorAll('.countdown');
-        countdowns.forEach(countdown => {
-            const taskItem = countdown.closest('.task-item');
-            const taskId = taskItem.querySelector('.task-checkbox').dataset.id;
-            const isCompleted = taskItem.querySelector('.task-checkbox').checked;
-            const deadline = new Date(taskItem.querySelector('.task-deadline').textContent.replace('截止时间: ', ''));
-            
-            const task = {
-                id: taskId,
-                completed: isCompleted,
-                deadline: deadline.toISOString()
-            };
+        document.querySelectorAll('.task-item').forEach(taskItem => {
+            const taskId = Number(taskItem.querySelector('.task-checkbox').dataset.id);
+            const task = tasksById.get(taskId);
+            if (!task) return;
             
+            const countdown = taskItem.querySelector('.countdown');
             countdown.textContent = getCountdownText(task);
-            
-            // 更新样式类
             countdown.className = 'countdown ' + getCountdownClass(task);
         });
     }, 60000);
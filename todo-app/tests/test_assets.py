@@ -0,0 +1,42 @@
+import os
+import shutil
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.assets import build_assets, init_assets
+
+
+@pytest.fixture
+def app(tmp_path):
+    app = create_app('development')
+    app.config['TESTING'] = True
+    # 在临时目录中构建，不改动仓库里的 static 目录
+    static_dir = tmp_path / 'static'
+    shutil.copytree(app.static_folder, static_dir)
+    app.static_folder = str(static_dir)
+    app.manifest = build_assets(app.static_folder)
+    init_assets(app)
+    return app
+
+
+def test_hashed_asset_is_immutable(app):
+    """带哈希的文件按 immutable 发送，并选择预压缩版本"""
+    hashed = app.manifest['css/style.css']
+    response = app.test_client().get(f'/static/{hashed}', headers={'Accept-Encoding': 'gzip'})
+    assert response.status_code == 200
+    assert response.headers['Content-Encoding'] == 'gzip'
+    assert response.cache_control.immutable
+    assert response.cache_control.max_age == 365 * 24 * 3600
+
+
+def test_manifest_is_not_cached(app):
+    """不带哈希的 manifest.json 每次都要重新验证"""
+    response = app.test_client().get('/static/dist/manifest.json')
+    assert response.status_code == 200
+    assert response.get_json() == app.manifest
+    assert response.cache_control.no_cache
+    assert not response.cache_control.immutable
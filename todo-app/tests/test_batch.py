@@ -0,0 +1,61 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+
+DEADLINE = '2030-01-01T12:00:00'
+
+
+@pytest.fixture
+def client():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title='Existing'):
+    response = client.post('/api/tasks', json={'title': title, 'deadline': DEADLINE})
+    return response.get_json()['id']
+
+
+def test_batch_applies_valid_operations(client):
+    """合法的批量操作全部执行"""
+    task_id = create_task(client)
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'title': 'New', 'deadline': DEADLINE},
+        {'op': 'update', 'id': task_id, 'completed': True}
+    ]})
+    assert response.status_code == 200
+    assert [result['status'] for result in response.get_json()['results']] == [201, 200]
+
+
+@pytest.mark.parametrize('item', [
+    {'op': 'create', 'title': None, 'deadline': DEADLINE},
+    {'op': 'create', 'title': '  ', 'deadline': DEADLINE},
+    {'op': 'create', 'title': 'New', 'deadline': DEADLINE, 'completed': 'yes'},
+    {'op': 'update', 'id': None, 'title': 7},
+    {'op': 'update', 'id': None, 'completed': 'yes'},
+    {'op': 'update', 'id': None, 'completed': 2},
+])
+def test_batch_rejects_malformed_item(client, item):
+    """标题或完成状态不合法的项返回 400，其余项不执行"""
+    task_id = create_task(client)
+    if 'id' in item:
+        item = dict(item, id=task_id)
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'title': 'New', 'deadline': DEADLINE},
+        item
+    ]})
+    assert response.status_code == 400
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == [424, 400]
+    assert results[1]['error'] in ('Invalid title', 'Invalid completed value')
+
+    tasks = client.get('/api/tasks').get_json()
+    assert [task['title'] for task in tasks] == ['Existing']
+    assert not tasks[0]['completed']
@@ -0,0 +1,116 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.cache import FileBackend, LRUBackend, TaskListCache, affected_statuses
+
+DEADLINE = '2030-01-01T12:00:00'
+STATUSES = ('all', 'active', 'completed')
+
+
+@pytest.fixture(params=['lru', 'file'])
+def client(request, tmp_path):
+    app = create_app('development')
+    app.config['TESTING'] = True
+    # create_app 时已按配置创建缓存，这里直接替换为要测试的后端
+    if request.param == 'file':
+        app.extensions['task_cache'] = TaskListCache(FileBackend(str(tmp_path)))
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title='任务'):
+    return client.post('/api/tasks', json={'title': title, 'deadline': DEADLINE}).get_json()['id']
+
+
+def warm(client):
+    # 三个状态的列表都读一遍，之后再读应命中缓存
+    for status in STATUSES:
+        client.get(f'/api/tasks?status={status}')
+    assert cached_statuses(client) == set(STATUSES)
+
+
+def cached_statuses(client):
+    return {status for status in STATUSES
+            if client.get(f'/api/tasks?status={status}').headers['X-Cache'] == 'HIT'}
+
+
+def test_repeated_list_is_cached(client):
+    """相同的列表请求第二次命中缓存，内容不变。"""
+    create_task(client)
+    first = client.get('/api/tasks?limit=10')
+    second = client.get('/api/tasks?limit=10')
+    assert (first.headers['X-Cache'], second.headers['X-Cache']) == ('MISS', 'HIT')
+    assert first.data == second.data
+    assert second.headers['X-Sync-Token'] == first.headers['X-Sync-Token']
+
+
+def test_create_invalidates_all_and_active(client):
+    """新建未完成任务只让 all 和 active 失效。"""
+    warm(client)
+    create_task(client)
+    assert cached_statuses(client) == {'completed'}
+
+
+def test_complete_invalidates_every_status(client):
+    """切换完成状态同时影响修改前后的两个状态。"""
+    task_id = create_task(client)
+    warm(client)
+    client.put(f'/api/tasks/{task_id}', json={'completed': True})
+    assert cached_statuses(client) == set()
+    assert [task['id'] for task in client.get('/api/tasks?status=completed').get_json()] == [task_id]
+
+
+def test_delete_completed_keeps_active(client):
+    """删除已完成任务不影响 active 列表的缓存。"""
+    task_id = create_task(client)
+    client.put(f'/api/tasks/{task_id}', json={'completed': True})
+    warm(client)
+    client.delete(f'/api/tasks/{task_id}')
+    assert cached_statuses(client) == {'active'}
+
+
+def test_batch_invalidates_once_after_commit(client):
+    """批量操作提交后失效受影响的状态；被拒绝的批量操作不失效任何缓存。"""
+    task_id = create_task(client)
+    warm(client)
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'title': '新任务', 'deadline': DEADLINE},
+        {'op': 'delete', 'id': task_id + 100}
+    ]})
+    assert response.status_code == 400
+    assert cached_statuses(client) == set(STATUSES)
+
+    client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'title': '新任务', 'deadline': DEADLINE}]})
+    assert cached_statuses(client) == {'completed'}
+
+
+def test_affected_statuses():
+    """写入影响 all 以及修改前后所属的状态。"""
+    assert affected_statuses() == {'all'}
+    assert affected_statuses(False) == {'all', 'active'}
+    assert affected_statuses(False, True) == set(STATUSES)
+
+
+def test_lru_backend_evicts_least_recently_used():
+    """超过条目上限时淘汰最久未使用的条目，标签不参与淘汰。"""
+    backend = LRUBackend(max_entries=2)
+    backend.bump_tag('all')
+    backend.set('a', 1)
+    backend.set('b', 2)
+    assert backend.get('a') == 1
+    backend.set('c', 3)
+    assert (backend.get('a'), backend.get('b'), backend.get('c')) == (1, None, 3)
+    assert backend.get_tag('all') == '1'
+
+
+def test_expired_entries_are_ignored(tmp_path):
+    """过期条目视为不存在。"""
+    for backend in (LRUBackend(ttl=-1), FileBackend(str(tmp_path), ttl=-1)):
+        backend.set('a', 1)
+        assert backend.get('a') is None
@@ -0,0 +1,99 @@
+import os
+import sqlite3
+import sys
+
+import pytest
+from sqlalchemy import inspect, text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.config import DevelopmentConfig
+from todo_app.models import db, init_db
+
+# 最初版本的 todo 表：没有 updated_at、version，主键也没有 AUTOINCREMENT
+BASELINE_SCHEMA = '''
+CREATE TABLE todo (
+    id INTEGER NOT NULL,
+    title VARCHAR(100) NOT NULL,
+    deadline DATETIME NOT NULL,
+    completed BOOLEAN,
+    created_at DATETIME,
+    PRIMARY KEY (id)
+)
+'''
+BASELINE_ROWS = [
+    (1, '写周报', '2030-01-01 12:00:00.000000', 0, '2024-01-01 08:00:00.000000'),
+    (2, '买牛奶', '2030-01-02 12:00:00.000000', 1, '2024-01-02 08:00:00.000000'),
+    (3, '整理书架', '2030-01-03 12:00:00.000000', 0, '2024-01-03 08:00:00.000000'),
+]
+
+
+@pytest.fixture
+def app(tmp_path):
+    path = tmp_path / 'todo.db'
+    connection = sqlite3.connect(path)
+    connection.execute(BASELINE_SCHEMA)
+    connection.executemany('INSERT INTO todo VALUES (?, ?, ?, ?, ?)', BASELINE_ROWS)
+    connection.commit()
+    connection.close()
+
+    class Config(DevelopmentConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+        AUTO_CREATE_SCHEMA = False
+
+    app = create_app(Config)
+    app.config['TESTING'] = True
+    with app.app_context():
+        init_db()
+    return app
+
+
+def test_upgrade_keeps_baseline_rows(app):
+    """升级后保留原有任务，updated_at 取 created_at，版本号为 0。"""
+    tasks = app.test_client().get('/api/tasks').get_json()
+    assert [(task['id'], task['title'], task['completed']) for task in tasks] == [
+        (1, '写周报', False), (2, '买牛奶', True), (3, '整理书架', False)]
+    assert all(task['updated_at'] == task['created_at'] for task in tasks)
+    with app.app_context():
+        assert db.session.execute(text('SELECT DISTINCT version FROM todo')).scalars().all() == [0]
+
+
+def test_upgrade_creates_current_schema(app):
+    """升级后主键带 AUTOINCREMENT，新增的表和索引都已创建。"""
+    with app.app_context():
+        inspector = inspect(db.engine)
+        assert {'task_tombstone', 'sync_state', 'task_stats', 'deadline_event'} <= set(inspector.get_table_names())
+        indexes = {index['name'] for index in inspector.get_indexes('todo')}
+        assert {'ix_todo_completed_deadline', 'ix_todo_deadline', 'ix_todo_version'} <= indexes
+        table_sql = db.session.execute(text(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'todo'")).scalar()
+        assert 'AUTOINCREMENT' in table_sql.upper()
+        assert db.session.execute(text('SELECT version, pruned_version FROM sync_state')).one() == (0, 0)
+
+
+def test_upgrade_initializes_stats_and_search(app):
+    """升级后统计计数和全文索引都包含原有任务。"""
+    client = app.test_client()
+    stats = client.get('/api/tasks/stats').get_json()
+    assert (stats['total'], stats['completed'], stats['active']) == (3, 1, 2)
+    assert [task['id'] for task in client.get('/api/tasks/search?q=牛奶').get_json()] == [2]
+
+
+def test_upgraded_ids_are_not_reused(app):
+    """升级后删除最大 id 的任务，新任务不会复用该 id。"""
+    client = app.test_client()
+    client.delete('/api/tasks/3')
+    task = client.post('/api/tasks', json={'title': '新任务', 'deadline': '2030-01-04T12:00:00'}).get_json()
+    assert task['id'] == 4
+    assert client.get('/api/tasks?since=0').get_json()['deleted'] == [3]
+
+
+def test_upgrade_is_idempotent(app):
+    """重复执行 init_db 不改变数据。"""
+    client = app.test_client()
+    before = client.get('/api/tasks').get_json()
+    with app.app_context():
+        init_db()
+    assert client.get('/api/tasks').get_json() == before
+    assert client.get('/api/tasks/stats').get_json()['total'] == 3
@@ -0,0 +1,106 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.events import format_sse
+
+DEADLINE = '2030-01-01T12:00:00'
+
+
+@pytest.fixture
+def client():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    # 连接很快到期，读取响应时不会一直阻塞
+    app.config['TASKS_STREAM_MAX_AGE'] = 0.2
+    app.config['TASKS_STREAM_POLL_INTERVAL'] = 0.05
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title):
+    return client.post('/api/tasks', json={'title': title, 'deadline': DEADLINE}).get_json()['id']
+
+
+def read_events(response):
+    # 按空行切分事件，每个事件解析为 {字段: 值}；注释行（keepalive）的字段名为空
+    events = []
+    for block in response.get_data(as_text=True).split('\n\n'):
+        if not block:
+            continue
+        event = {}
+        for line in block.split('\n'):
+            field, _, value = line.partition(': ')
+            event[field] = value
+        events.append(event)
+    return events
+
+
+def test_format_sse():
+    """事件名、id 和 JSON 数据各占一行，以空行结束。"""
+    assert format_sse({'id': 1}, event='deleted', event_id=7) == 'event: deleted\nid: 7\ndata: {"id": 1}\n\n'
+    assert format_sse({'token': '0'}) == 'data: {"token": "0"}\n\n'
+
+
+def test_stream_sends_changes_since_token(client):
+    """推送 since 之后的变更，最后的 sync 事件带有版本号 id。"""
+    token = client.get('/api/tasks').headers['X-Sync-Token']
+    created = create_task(client, '新建')
+    updated = create_task(client, '修改')
+    client.put(f'/api/tasks/{updated}', json={'completed': True})
+    deleted = create_task(client, '删除')
+    client.delete(f'/api/tasks/{deleted}')
+    version = client.get('/api/tasks').headers['X-Sync-Token']
+
+    response = client.get(f'/api/tasks/stream?since={token}')
+    assert response.mimetype == 'text/event-stream'
+    assert response.headers['Cache-Control'] == 'no-cache'
+    events = read_events(response)
+    assert events[0] == {'retry': '3000'}
+    changes = [event for event in events if 'event' in event]
+    assert [(event['event'], json.loads(event['data'])['id']) for event in changes[:3]] == [
+        ('created', created), ('updated', updated), ('deleted', deleted)]
+    assert json.loads(changes[1]['data'])['completed'] is True
+    assert changes[3] == {'event': 'sync', 'id': version, 'data': json.dumps({'token': version})}
+    # 只有 sync 事件带 id，重连时不会跳过同一批中剩余的事件
+    assert [event for event in events if 'id' in event] == [changes[3]]
+    assert len(changes) == 4
+
+
+def test_last_event_id_resumes_after_sync(client):
+    """Last-Event-ID 优先于 since 参数，只推送该版本之后的变更。"""
+    create_task(client, '旧任务')
+    sync_event = [event for event in read_events(client.get('/api/tasks/stream?since=0'))
+                  if event.get('event') == 'sync'][0]
+    task_id = create_task(client, '新任务')
+
+    response = client.get('/api/tasks/stream?since=0', headers={'Last-Event-ID': sync_event['id']})
+    changes = [event for event in read_events(response) if 'event' in event]
+    assert [(event['event'], json.loads(event['data'])['id']) for event in changes[:-1]] == [
+        ('created', task_id)]
+    assert changes[-1]['event'] == 'sync'
+    assert int(changes[-1]['id']) > int(sync_event['id'])
+
+
+def test_stream_without_since_skips_history(client):
+    """不带 since 时只推送连接之后的变更，空闲时发送 keepalive 注释。"""
+    create_task(client, '旧任务')
+    events = read_events(client.get('/api/tasks/stream'))
+    assert not [event for event in events if 'event' in event]
+    assert {'': 'keepalive'} in events
+
+
+@pytest.mark.parametrize('headers, query', [
+    ({'Last-Event-ID': 'abc'}, ''),
+    ({}, '?since=abc'),
+])
+def test_invalid_stream_token(client, headers, query):
+    """无法解析的 Last-Event-ID 或 since 返回 400。"""
+    response = client.get(f'/api/tasks/stream{query}', headers=headers)
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid since token'}
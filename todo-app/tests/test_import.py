@@ -0,0 +1,96 @@
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+
+DEADLINE = '2030-01-01T12:00:00'
+
+
+@pytest.fixture
+def client():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def ndjson_rows(count):
+    return ''.join(f'{{"title": "Task {i}", "deadline": "{DEADLINE}"}}\n'
+                   for i in range(count)).encode()
+
+
+def test_invalid_encoding_keeps_valid_rows(client):
+    """编码错误之前已通过校验的行照常导入，错误带有行号"""
+    body = ndjson_rows(5) + b'{"title": "\xff", "deadline": "2030-01-01"}\n'
+    response = client.post('/api/tasks/import?format=ndjson', data=body)
+    assert response.get_json() == {
+        'imported': 5, 'failed': 0, 'errors': [{'line': 6, 'error': 'Invalid encoding'}]
+    }
+    assert len(client.get('/api/tasks').get_json()) == 5
+
+
+def test_csv_error_keeps_valid_rows(client):
+    """CSV 格式错误之前的行照常导入"""
+    # 超过 csv.field_size_limit() 的字段会引发 csv.Error
+    body = f'title,deadline\nFirst,{DEADLINE}\nSecond,{DEADLINE}\n{"x" * 200000},{DEADLINE}\n'
+    response = client.post('/api/tasks/import?format=csv', data=body.encode())
+    data = response.get_json()
+    assert data['imported'] == 2
+    assert data['errors'][0]['line'] == 4
+    assert data['errors'][0]['error'].startswith('Invalid CSV')
+
+
+def test_csv_extra_columns_rejected(client):
+    """多出列的 CSV 行计为失败"""
+    body = f'title,deadline\nFirst,{DEADLINE}\nSecond,{DEADLINE},extra\n'
+    response = client.post('/api/tasks/import?format=csv', data=body.encode())
+    assert response.get_json() == {
+        'imported': 1, 'failed': 1, 'errors': [{'line': 3, 'error': 'Too many columns'}]
+    }
+
+
+def make_client():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app.test_client()
+
+
+def exported_tasks(client):
+    # 只比较导入时保留的字段，id 和时间戳由目标库重新生成
+    return [(task['title'], task['deadline'], task['completed'])
+            for task in client.get('/api/tasks').get_json()]
+
+
+@pytest.mark.parametrize('export_format', ['ndjson', 'csv'])
+def test_export_import_round_trip(client, export_format):
+    """导出的文件可以原样导入另一个库，任务内容不变"""
+    titles = ['普通任务', 'Comma, separated', 'Say "hi"', 'Tab\tinside', '多行\n标题']
+    for i, title in enumerate(titles):
+        task = client.post('/api/tasks', json={
+            'title': title, 'deadline': f'2030-01-0{i + 1}T12:30:00'}).get_json()
+        if i % 2:
+            client.put(f'/api/tasks/{task["id"]}', json={'completed': True})
+
+    exported = client.get(f'/api/tasks/export?format={export_format}')
+    assert exported.status_code == 200
+    assert exported.headers['Content-Disposition'] == f'attachment; filename=tasks.{export_format}'
+
+    target = make_client()
+    response = target.post(f'/api/tasks/import?format={export_format}', data=exported.data)
+    assert response.get_json() == {'imported': len(titles), 'failed': 0, 'errors': []}
+    assert exported_tasks(target) == exported_tasks(client)
+    assert target.get('/api/tasks/stats').get_json()['completed'] == 2
+
+
+def test_export_status_filter(client):
+    """导出可以按状态筛选"""
+    active = client.post('/api/tasks', json={'title': 'Active', 'deadline': DEADLINE}).get_json()['id']
+    done = client.post('/api/tasks', json={'title': 'Done', 'deadline': DEADLINE}).get_json()['id']
+    client.put(f'/api/tasks/{done}', json={'completed': True})
+    body = client.get('/api/tasks/export?format=ndjson&status=active').get_data(as_text=True)
+    assert [json.loads(line)['id'] for line in body.splitlines()] == [active]
@@ -0,0 +1,106 @@
+import base64
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+
+
+@pytest.fixture
+def client():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title, deadline, completed=False):
+    task = client.post('/api/tasks', json={'title': title, 'deadline': deadline}).get_json()
+    if completed:
+        client.put(f'/api/tasks/{task["id"]}', json={'completed': True})
+    return task['id']
+
+
+def fetch_all(client, **params):
+    # 跟随 X-Next-Cursor 翻完所有页，返回每页的任务 id
+    pages = []
+    cursor = None
+    while True:
+        query = dict(params, **({'cursor': cursor} if cursor else {}))
+        response = client.get('/api/tasks', query_string=query)
+        assert response.status_code == 200
+        pages.append([task['id'] for task in response.get_json()])
+        cursor = response.headers.get('X-Next-Cursor')
+        if not cursor:
+            return pages
+
+
+def test_keyset_pages_follow_deadline_and_id(client):
+    """按 (deadline, id) 排序翻页，截止时间相同的任务也不会重复或遗漏。"""
+    ids = [create_task(client, f'任务 {i}', f'2030-01-0{i % 3 + 1}T12:00:00') for i in range(7)]
+    expected = sorted(ids, key=lambda task_id: (ids.index(task_id) % 3, task_id))
+
+    pages = fetch_all(client, limit=3)
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert sum(pages, []) == expected
+
+
+def test_last_full_page_has_no_cursor(client):
+    """任务数恰好是 limit 的整数倍时，最后一页不返回游标。"""
+    for i in range(4):
+        create_task(client, f'任务 {i}', '2030-01-01T12:00:00')
+    assert [len(page) for page in fetch_all(client, limit=2)] == [2, 2]
+
+
+def test_status_filter_with_paging(client):
+    """状态筛选与分页组合使用。"""
+    done = [create_task(client, f'完成 {i}', '2030-01-01T12:00:00', completed=True) for i in range(3)]
+    active = [create_task(client, f'未完成 {i}', '2030-01-02T12:00:00') for i in range(2)]
+    assert sum(fetch_all(client, status='completed', limit=2), []) == done
+    assert sum(fetch_all(client, status='active', limit=2), []) == active
+    assert sum(fetch_all(client, status='all', limit=2), []) == done + active
+
+
+def test_page_stays_stable_after_insert(client):
+    """翻页期间插入排在前面的任务，后续页不受影响。"""
+    ids = [create_task(client, f'任务 {i}', f'2030-01-0{i + 2}T12:00:00') for i in range(4)]
+    response = client.get('/api/tasks?limit=2')
+    cursor = response.headers['X-Next-Cursor']
+    create_task(client, '更早的任务', '2030-01-01T12:00:00')
+    response = client.get('/api/tasks', query_string={'limit': 2, 'cursor': cursor})
+    assert [task['id'] for task in response.get_json()] == ids[2:]
+
+
+@pytest.mark.parametrize('cursor', [
+    'not-a-cursor',
+    base64.urlsafe_b64encode(b'[1, 2, 3]').decode(),
+    base64.urlsafe_b64encode(b'["not a date", 1]').decode(),
+    base64.urlsafe_b64encode(b'["2030-01-01T12:00:00", "x"]').decode(),
+    base64.urlsafe_b64encode(b'{"deadline": 1}').decode(),
+])
+def test_malformed_cursor(client, cursor):
+    """无法解析的游标返回 400。"""
+    response = client.get('/api/tasks', query_string={'cursor': cursor})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid cursor'}
+
+
+@pytest.mark.parametrize('limit', ['0', '-1', 'abc'])
+def test_invalid_limit(client, limit):
+    """limit 必须是正整数。"""
+    response = client.get('/api/tasks', query_string={'limit': limit})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid limit'}
+
+
+def test_limit_capped_at_max_page_size(client):
+    """limit 超过 TASKS_MAX_PAGE_SIZE 时按上限返回。"""
+    client.application.config['TASKS_MAX_PAGE_SIZE'] = 2
+    for i in range(3):
+        create_task(client, f'任务 {i}', '2030-01-01T12:00:00')
+    response = client.get('/api/tasks?limit=100')
+    assert len(response.get_json()) == 2
+    assert 'X-Next-Cursor' in response.headers
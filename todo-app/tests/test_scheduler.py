@@ -0,0 +1,85 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.scheduler import DUE, OVERDUE, DeadlineHeap, TaskDeadlineSource
+
+WINDOW = timedelta(hours=1)
+NOON = datetime(2030, 1, 1, 12)
+
+
+def test_pop_fired_in_time_order():
+    """先按触发时间弹出即将到期，截止时再弹出已逾期，之后任务离开堆。"""
+    heap = DeadlineHeap(WINDOW)
+    heap.upsert(1, NOON, False)
+    heap.upsert(2, NOON - timedelta(minutes=30), False)
+    assert heap.next_fire_time() == NOON - timedelta(minutes=90)
+
+    assert heap.pop_fired(NOON - timedelta(hours=2)) == []
+    assert heap.pop_fired(NOON - timedelta(minutes=30)) == [
+        (2, DUE, NOON - timedelta(minutes=30)),
+        (1, DUE, NOON),
+        (2, OVERDUE, NOON - timedelta(minutes=30))]
+    assert len(heap) == 1
+    assert heap.pop_fired(NOON) == [(1, OVERDUE, NOON)]
+    assert len(heap) == 0 and heap.next_fire_time() is None
+
+
+def test_changed_and_removed_tasks_are_skipped():
+    """修改截止时间后旧的触发点作废，删除或完成的任务不再触发。"""
+    heap = DeadlineHeap(WINDOW)
+    heap.upsert(1, NOON, False)
+    heap.upsert(1, NOON + timedelta(days=1), False)
+    heap.upsert(2, NOON, False)
+    heap.remove(2)
+    heap.upsert(3, NOON, False)
+    heap.upsert(3, NOON, True)
+
+    assert heap.next_fire_time() == NOON + timedelta(days=1) - WINDOW
+    assert heap.pop_fired(NOON) == []
+    assert heap.pop_fired(NOON + timedelta(days=1)) == [
+        (1, DUE, NOON + timedelta(days=1)), (1, OVERDUE, NOON + timedelta(days=1))]
+
+
+def test_upsert_same_deadline_is_noop():
+    """截止时间不变的重复 upsert 不会产生重复事件。"""
+    heap = DeadlineHeap(WINDOW)
+    for _ in range(3):
+        heap.upsert(1, NOON, False)
+    assert heap.pop_fired(NOON) == [(1, DUE, NOON), (1, OVERDUE, NOON)]
+
+
+def test_compaction_bounds_stale_entries():
+    """反复修改截止时间时，堆中过时元素的数量有上限。"""
+    heap = DeadlineHeap(WINDOW)
+    for minutes in range(5000):
+        heap.upsert(1, NOON + timedelta(minutes=minutes), False)
+    assert len(heap._heap) <= 4 * len(heap) + 1024 + 2
+    last = NOON + timedelta(minutes=4999)
+    assert heap.pop_fired(last) == [(1, DUE, last), (1, OVERDUE, last)]
+
+
+@pytest.fixture
+def app():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app
+
+
+def test_claim_each_reminder_once(app):
+    """同一任务同一截止时间的提醒只能认领一次。"""
+    client = app.test_client()
+    task_id = client.post('/api/tasks', json={'title': '任务', 'deadline': '2030-01-01T12:00:00'}).get_json()['id']
+    source = TaskDeadlineSource()
+    with app.app_context():
+        assert source.claim(task_id, DUE, NOON)
+        assert not source.claim(task_id, DUE, NOON)
+        assert source.claim(task_id, OVERDUE, NOON)
+        tasks, deleted = source.load_changes(0)
+        assert [task.id for task in tasks] == [task_id] and deleted == []
+        assert [row.id for row in source.load_range(NOON - WINDOW, NOON)] == [task_id]
@@ -0,0 +1,106 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import text
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.models import db
+
+DEADLINE = '2030-01-01T12:00:00'
+
+
+@pytest.fixture
+def app():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title):
+    return client.post('/api/tasks', json={'title': title, 'deadline': DEADLINE}).get_json()['id']
+
+
+def search(client, q):
+    response = client.get('/api/tasks/search', query_string={'q': q})
+    return response.status_code, response.get_json()
+
+
+@pytest.mark.parametrize('q', ['\x00\x00\x00', 'week\x01ly', 'report\x7f'])
+def test_control_characters_rejected(client, q):
+    """包含控制字符的查询返回 400，而不是 503"""
+    create_task(client, 'Weekly report')
+    assert search(client, q) == (400, {'error': 'Invalid query'})
+
+
+def test_missing_index_is_unavailable(app, client):
+    """全文索引不存在时返回 503"""
+    create_task(client, 'Weekly report')
+    with app.app_context():
+        db.session.execute(text('DROP TABLE todo_fts'))
+        db.session.commit()
+    assert search(client, 'weekly') == (503, {'error': 'Search is not available'})
+
+
+def search_ids(client, q, **params):
+    response = client.get('/api/tasks/search', query_string=dict(params, q=q))
+    assert response.status_code == 200
+    return [task['id'] for task in response.get_json()]
+
+
+def check_index(app):
+    # rank 为 1 时 integrity-check 还会核对索引与 todo 表的内容是否一致
+    with app.app_context():
+        db.session.execute(text("INSERT INTO todo_fts (todo_fts, rank) VALUES ('integrity-check', 1)"))
+
+
+def test_index_follows_title_update(app, client):
+    """修改标题后旧标题搜不到，新标题可以搜到"""
+    task_id = create_task(client, 'Weekly report')
+    client.put(f'/api/tasks/{task_id}', json={'title': '季度总结'})
+    assert search_ids(client, 'weekly') == []
+    assert search_ids(client, '季度总结') == [task_id]
+    check_index(app)
+
+
+def test_index_follows_completion_toggle(app, client):
+    """切换完成状态不影响索引，状态筛选仍然有效"""
+    task_id = create_task(client, 'Weekly report')
+    client.put(f'/api/tasks/{task_id}', json={'completed': True})
+    assert search_ids(client, 'report') == [task_id]
+    assert search_ids(client, 'report', status='active') == []
+    assert search_ids(client, 'report', status='completed') == [task_id]
+    check_index(app)
+
+
+def test_index_follows_delete(app, client):
+    """删除的任务不再出现在搜索结果中"""
+    deleted = create_task(client, 'Weekly report')
+    kept = create_task(client, 'Monthly report')
+    client.delete(f'/api/tasks/{deleted}')
+    assert search_ids(client, 'report') == [kept]
+    check_index(app)
+
+
+def test_index_follows_batch_operations(app, client):
+    """批量接口的修改和删除同样同步到索引"""
+    renamed = create_task(client, 'Weekly report')
+    deleted = create_task(client, 'Monthly report')
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'update', 'id': renamed, 'title': 'Yearly review'},
+        {'op': 'delete', 'id': deleted},
+        {'op': 'create', 'title': 'Daily report', 'deadline': DEADLINE}
+    ]})
+    assert response.status_code == 200
+    created = response.get_json()['results'][2]['task']['id']
+    assert search_ids(client, 'report') == [created]
+    assert search_ids(client, 'review') == [renamed]
+    check_index(app)
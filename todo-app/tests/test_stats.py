@@ -0,0 +1,118 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.models import Todo, db
+
+DEADLINE = '2030-01-01T12:00:00'
+
+
+@pytest.fixture
+def app():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title='任务', deadline=DEADLINE):
+    return client.post('/api/tasks', json={'title': title, 'deadline': deadline}).get_json()['id']
+
+
+def stats(client):
+    response = client.get('/api/tasks/stats')
+    assert response.status_code == 200
+    return response.get_json()
+
+
+def assert_consistent(app, client, total, completed):
+    # 维护的计数与列表查询的结果、以及直接统计 todo 表的结果一致
+    data = stats(client)
+    assert (data['total'], data['completed'], data['active']) == (total, completed, total - completed)
+    assert len(client.get('/api/tasks?status=completed&limit=500').get_json()) == completed
+    assert len(client.get('/api/tasks?status=active&limit=500').get_json()) == total - completed
+    with app.app_context():
+        counted = db.session.query(func.count(Todo.id), func.count(Todo.id).filter(Todo.completed)).one()
+        assert tuple(counted) == (total, completed)
+
+
+def test_counts_follow_single_writes(app, client):
+    """新建、切换完成状态、修改标题和删除后计数都正确"""
+    assert_consistent(app, client, 0, 0)
+    first, second, third = (create_task(client, f'任务 {i}') for i in range(3))
+    assert_consistent(app, client, 3, 0)
+
+    client.put(f'/api/tasks/{first}', json={'completed': True})
+    client.put(f'/api/tasks/{second}', json={'completed': True})
+    client.put(f'/api/tasks/{second}', json={'completed': True})
+    assert_consistent(app, client, 3, 2)
+
+    client.put(f'/api/tasks/{first}', json={'title': '改名'})
+    client.put(f'/api/tasks/{second}', json={'completed': False})
+    assert_consistent(app, client, 3, 1)
+
+    client.delete(f'/api/tasks/{first}')
+    client.delete(f'/api/tasks/{third}')
+    assert_consistent(app, client, 1, 0)
+
+
+def test_counts_follow_batch(app, client):
+    """批量操作在同一事务中更新计数；被拒绝的批量操作不改变计数"""
+    task_id = create_task(client)
+    done = create_task(client)
+    client.put(f'/api/tasks/{done}', json={'completed': True})
+
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'title': '新任务', 'deadline': DEADLINE, 'completed': True},
+        {'op': 'delete', 'id': done + 100}
+    ]})
+    assert response.status_code == 400
+    assert_consistent(app, client, 2, 1)
+
+    response = client.post('/api/tasks/batch', json={'operations': [
+        {'op': 'create', 'title': '新任务', 'deadline': DEADLINE, 'completed': True},
+        {'op': 'create', 'title': '另一个', 'deadline': DEADLINE},
+        {'op': 'update', 'id': task_id, 'completed': True},
+        {'op': 'delete', 'id': done}
+    ]})
+    assert response.status_code == 200
+    assert_consistent(app, client, 3, 2)
+
+
+def test_counts_follow_import(app, client):
+    """导入的任务计入总数和已完成数，失败的行不计入"""
+    create_task(client)
+    body = (f'title,deadline,completed\n'
+            f'A,{DEADLINE},true\nB,{DEADLINE},false\nC,not a date,false\nD,{DEADLINE},1\n')
+    response = client.post('/api/tasks/import?format=csv', data=body.encode())
+    assert response.get_json()['imported'] == 3
+    assert_consistent(app, client, 4, 2)
+
+
+def test_overdue_and_due_today(client):
+    """逾期和今天到期只统计未完成的任务"""
+    now = datetime.utcnow()
+    overdue = create_task(client, '逾期', (now - timedelta(days=1)).isoformat())
+    create_task(client, '逾期', (now - timedelta(days=1)).isoformat())
+    client.put(f'/api/tasks/{overdue}', json={'completed': True})
+    create_task(client, '明年', (now + timedelta(days=365)).isoformat())
+    data = stats(client)
+    assert (data['overdue'], data['due_today']) == (1, 0)
+
+
+@pytest.mark.parametrize('tz_offset', ['abc', '2000', '-1441'])
+def test_invalid_tz_offset(client, tz_offset):
+    """tz_offset 必须是不超过一天的分钟数"""
+    response = client.get('/api/tasks/stats', query_string={'tz_offset': tz_offset})
+    assert response.status_code == 400
@@ -0,0 +1,165 @@
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
+
+from todo_app import create_app
+from todo_app.models import DeadlineEvent, TaskTombstone, db, prune_sync_history
+from todo_app.scheduler import DUE, TaskDeadlineSource, sync_retention
+
+DEADLINE = '2030-01-01T12:00:00'
+
+
+@pytest.fixture
+def app():
+    app = create_app('development')
+    app.config['TESTING'] = True
+    return app
+
+
+@pytest.fixture
+def client(app):
+    with app.test_client() as client:
+        yield client
+
+
+def create_task(client, title):
+    return client.post('/api/tasks', json={'title': title, 'deadline': DEADLINE}).get_json()['id']
+
+
+def sync_token(client):
+    return int(client.get('/api/tasks').headers['X-Sync-Token'])
+
+
+def prune(app, before):
+    with app.app_context(), db.engine.begin() as connection:
+        return prune_sync_history(connection, before)
+
+
+def test_since_returns_changes_and_tombstones(client):
+    """since 之后新建、修改和删除的任务都出现在增量中，之前的不会。"""
+    unchanged = create_task(client, '不变')
+    token = sync_token(client)
+    updated = create_task(client, '修改')
+    deleted = create_task(client, '删除')
+    client.put(f'/api/tasks/{updated}', json={'completed': True})
+    client.delete(f'/api/tasks/{deleted}')
+
+    response = client.get(f'/api/tasks?since={token}')
+    assert response.status_code == 200
+    body = response.get_json()
+    assert body['token'] == response.headers['X-Sync-Token'] == str(sync_token(client))
+    assert [(task['id'], task['completed']) for task in body['tasks']] == [(updated, True)]
+    assert body['deleted'] == [deleted]
+    assert unchanged not in [task['id'] for task in body['tasks']]
+
+    body = client.get(f"/api/tasks?since={body['token']}").get_json()
+    assert body['tasks'] == [] and body['deleted'] == []
+
+
+@pytest.mark.parametrize('since', ['abc', '-1', '1.5'])
+def test_invalid_since_token(client, since):
+    """无法解析或为负数的 since 返回 400。"""
+    response = client.get('/api/tasks', query_string={'since': since})
+    assert response.status_code == 400
+    assert response.get_json() == {'error': 'Invalid since token'}
+
+
+@pytest.mark.parametrize('url', ['/api/tasks', '/api/tasks?status=active&limit=5', '/api/tasks?since=0'])
+def test_etag_revalidation(client, url):
+    """数据未变化时带 If-None-Match 返回 304，写入后 ETag 改变。"""
+    create_task(client, '任务')
+    response = client.get(url)
+    etag = response.headers['ETag']
+    assert response.headers['X-Sync-Token']
+
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    assert response.headers['ETag'] == etag
+
+    create_task(client, '另一个任务')
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_etag_depends_on_query(client):
+    """不同查询参数的列表 ETag 不同，不会互相命中 304。"""
+    create_task(client, '任务')
+    etag = client.get('/api/tasks?status=active').headers['ETag']
+    response = client.get('/api/tasks?status=completed', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+
+
+def test_prune_keeps_recent_tombstones(app, client):
+    """只清理 before 之前的墓碑，清理后 pruned_version 不变的令牌仍可增量同步。"""
+    task_id = create_task(client, '旧任务')
+    client.delete(f'/api/tasks/{task_id}')
+    pruned = prune(app, datetime.utcnow() - timedelta(days=1))
+    assert pruned == 0
+
+    response = client.get('/api/tasks?since=0')
+    assert response.status_code == 200
+    assert response.get_json()['deleted'] == [task_id]
+
+
+def test_stale_since_token_requires_resync(app, client):
+    """since 早于已清理的墓碑时返回 410，之后的令牌不受影响。"""
+    old_token = sync_token(client)
+    first = create_task(client, '第一个')
+    client.delete(f'/api/tasks/{first}')
+    pruned = prune(app, datetime.utcnow() + timedelta(seconds=1))
+    assert pruned == sync_token(client)
+    with app.app_context():
+        assert db.session.query(TaskTombstone).count() == 0
+
+    second = create_task(client, '第二个')
+    client.delete(f'/api/tasks/{second}')
+
+    response = client.get(f'/api/tasks?since={old_token}')
+    assert response.status_code == 410
+    assert response.get_json() == {'error': 'Resync required'}
+    assert client.get(f'/api/tasks/stream?since={old_token}').status_code == 410
+    assert client.get('/api/tasks/stream', headers={'Last-Event-ID': str(old_token)}).status_code == 410
+
+    response = client.get(f'/api/tasks?since={pruned}')
+    assert response.status_code == 200
+    assert response.get_json()['deleted'] == [second]
+
+
+def test_prune_command(app):
+    """flask prune-sync-history 按 TASKS_SYNC_RETENTION 清理墓碑。"""
+    client = app.test_client()
+    task_id = create_task(client, '任务')
+    client.delete(f'/api/tasks/{task_id}')
+
+    app.config['TASKS_SYNC_RETENTION'] = 3600
+    runner = app.test_cli_runner()
+    assert 'up to version 0' in runner.invoke(args=['prune-sync-history']).output
+    app.config.update(TASKS_SYNC_RETENTION=-1, TASKS_SCHEDULER_CATCHUP=0, TASKS_DUE_SOON_WINDOW=0)
+    runner.invoke(args=['prune-sync-history'])
+    assert client.get('/api/tasks?since=0').status_code == 410
+
+
+def test_prune_deadline_events(app, client):
+    """截止提醒与墓碑一起按时间清理。"""
+    task_id = create_task(client, '提醒')
+    with app.test_request_context():
+        assert TaskDeadlineSource().claim(task_id, DUE, datetime(2030, 1, 1, 12))
+    assert prune(app, datetime.utcnow() - timedelta(days=1)) == 0
+    pruned = prune(app, datetime.utcnow() + timedelta(seconds=1))
+    assert pruned == sync_token(client)
+    with app.app_context():
+        assert db.session.query(DeadlineEvent).count() == 0
+
+
+def test_retention_covers_scheduler_catchup(app):
+    """保留时间不短于启动补发的范围，已清理的提醒不会在重启后再次发出。"""
+    app.config.update(TASKS_SYNC_RETENTION=60, TASKS_SCHEDULER_CATCHUP=3600, TASKS_DUE_SOON_WINDOW=600)
+    assert sync_retention(app.config) == timedelta(seconds=4200)
+    app.config['TASKS_SYNC_RETENTION'] = 86400
+    assert sync_retention(app.config) == timedelta(days=1)
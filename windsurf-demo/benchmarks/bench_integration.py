@@ -0,0 +1,230 @@
+"""
+Benchmark and accuracy-scaling suite for the numerical integration module.
+
+Runs every method available through integrate() on a smooth, an oscillatory
+and a singular integrand, each as a scalar-only and as an array-capable
+callable, over a sweep of n (or of the order or tolerance for methods
+without n). Records wall time, evaluations per second and the error against
+the exact value, and can save the results as JSON, draw a convergence plot
+(error versus evaluations, needs matplotlib) and compare against a saved
+baseline.
+
+    python benchmarks/bench_integration.py --output results.json --plot convergence.png
+    python benchmarks/bench_integration.py --baseline results.json
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, BASE_DIR)
+
+from numerical_integration import integrate  # noqa: E402
+
+# Errors below this are treated as equal when comparing with a baseline
+ERROR_FLOOR = 1e-13
+# Timings below this are too noisy to compare
+TIME_FLOOR = 1e-3
+
+
+def inv_sqrt(x):
+    return 1 / math.sqrt(x) if x > 0 else 0.0
+
+
+def inv_sqrt_array(x):
+    return np.divide(1, np.sqrt(np.abs(x)), out=np.zeros_like(x), where=x > 0)
+
+
+# name: (scalar callable, array callable, a, b, exact value)
+INTEGRANDS = {
+    'smooth': (math.exp, np.exp, 0.0, 1.0, math.e - 1),
+    'oscillatory': (lambda x: math.cos(50 * x), lambda x: np.cos(50 * x),
+                    0.0, 1.0, math.sin(50) / 50),
+    # 1/sqrt(x) has an integrable singularity at 0, where f is taken as 0
+    'singular': (inv_sqrt, inv_sqrt_array, 0.0, 1.0, 2.0),
+}
+
+# method: (swept parameter, values, quick values)
+SWEEPS = {
+    'trapezoidal': ('n', [16, 64, 256, 1024, 4096, 16384], [16, 256, 4096]),
+    'simpsons': ('n', [16, 64, 256, 1024, 4096, 16384], [16, 256, 4096]),
+    'midpoint': ('n', [16, 64, 256, 1024, 4096, 16384], [16, 256, 4096]),
+    'composite_gauss': ('n', [2, 8, 32, 128, 512, 2048], [2, 32, 512]),
+    'gauss_legendre': ('order', [4, 8, 16, 32, 64, 128], [4, 16, 64]),
+    'romberg': ('tol', [1e-4, 1e-6, 1e-8, 1e-10, 1e-12], [1e-4, 1e-8, 1e-12]),
+    'adaptive_simpson': ('tol', [1e-4, 1e-6, 1e-8, 1e-10, 1e-12], [1e-4, 1e-8, 1e-12]),
+    'gauss_kronrod': ('tol', [1e-4, 1e-6, 1e-8, 1e-10, 1e-12], [1e-4, 1e-8, 1e-12]),
+}
+
+
+def run_case(f, a, b, method, parameter, value, vectorize):
+    """Integrate once and return the IntegrationResult."""
+    options = {'method': method, 'vectorize': vectorize, 'full_output': True}
+    if parameter == 'n':
+        options['n'] = value
+    elif parameter == 'order':
+        options['order'] = value
+    else:
+        options['atol'] = options['rtol'] = value
+    with warnings.catch_warnings():
+        # Strict tolerances on the singular integrand exhaust the budgets
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return integrate(f, a, b, **options)
+
+
+def bench_case(f, a, b, exact, method, parameter, value, vectorize, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = run_case(f, a, b, method, parameter, value, vectorize)
+        timings.append(time.perf_counter() - started)
+    seconds = min(timings)
+    return {
+        'param': value,
+        'evaluations': result.evaluations,
+        'error': abs(result.value - exact),
+        'seconds': seconds,
+        'evals_per_second': result.evaluations / seconds if seconds > 0 else None,
+    }
+
+
+def run_benchmarks(args):
+    """Return {integrand: {mode: {method: [case, ...]}}}."""
+    results = {}
+    for name in args.integrands:
+        scalar_f, array_f, a, b, exact = INTEGRANDS[name]
+        modes = {'scalar': (scalar_f, False), 'array': (array_f, True)}
+        results[name] = {}
+        for mode in args.modes:
+            f, vectorize = modes[mode]
+            results[name][mode] = {}
+            for method in args.methods:
+                parameter, values, quick_values = SWEEPS[method]
+                cases = [bench_case(f, a, b, exact, method, parameter, value, vectorize, args.repeat)
+                         for value in (quick_values if args.quick else values)]
+                results[name][mode][method] = cases
+                print_cases(name, mode, method, parameter, cases)
+    return results
+
+
+def print_cases(name, mode, method, parameter, cases):
+    for case in cases:
+        rate = case['evals_per_second']
+        print(f"{name:<12}{mode:<8}{method:<18}{parameter}={case['param']:<8g}"
+              f"{case['evaluations']:>10}{case['error']:>12.2e}"
+              f"{case['seconds'] * 1000:>11.3f} ms{(rate or 0):>14,.0f} evals/s")
+
+
+def compare(results, baseline, threshold):
+    """Compare with a baseline; return (integrand, mode, method, param, metric) regressions."""
+    regressions = []
+    for name, modes in results.items():
+        for mode, methods in modes.items():
+            for method, cases in methods.items():
+                previous_cases = baseline.get('results', {}).get(name, {}).get(mode, {}).get(method, [])
+                previous_by_param = {case['param']: case for case in previous_cases}
+                for case in cases:
+                    previous = previous_by_param.get(case['param'])
+                    if previous is None:
+                        continue
+                    key = (name, mode, method, case['param'])
+                    if max(case['seconds'], TIME_FLOOR) > max(previous['seconds'], TIME_FLOOR) * (1 + threshold):
+                        regressions.append(key + ('seconds',))
+                    if max(case['error'], ERROR_FLOOR) > max(previous['error'], ERROR_FLOOR) * (1 + threshold):
+                        regressions.append(key + ('error',))
+                    if case['evaluations'] > previous['evaluations'] * (1 + threshold):
+                        regressions.append(key + ('evaluations',))
+    return regressions
+
+
+def plot_convergence(results, path):
+    """Plot error versus evaluations, one panel per integrand; needs matplotlib."""
+    try:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+    except ImportError:
+        print('matplotlib is not installed, skipping the convergence plot')
+        return False
+
+    fig, axes = plt.subplots(1, len(results), figsize=(5 * len(results), 4), squeeze=False)
+    for ax, (name, modes) in zip(axes[0], results.items()):
+        # Errors do not depend on the mode; prefer the array results if present
+        methods = modes.get('array') or next(iter(modes.values()))
+        for method, cases in methods.items():
+            evaluations = [case['evaluations'] for case in cases]
+            errors = [max(case['error'], 1e-17) for case in cases]
+            ax.loglog(evaluations, errors, marker='o', label=method)
+        ax.set_title(name)
+        ax.set_xlabel('evaluations of f')
+        ax.set_ylabel('absolute error')
+        ax.grid(True, which='both', alpha=0.3)
+    axes[0][0].legend(fontsize='small')
+    fig.tight_layout()
+    fig.savefig(path, dpi=120)
+    plt.close(fig)
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the numerical integration methods.')
+    parser.add_argument('--methods', nargs='+', choices=list(SWEEPS), default=list(SWEEPS),
+                        help='methods to run (default: all)')
+    parser.add_argument('--integrands', nargs='+', choices=list(INTEGRANDS), default=list(INTEGRANDS),
+                        help='integrands to run (default: all)')
+    parser.add_argument('--modes', nargs='+', choices=('scalar', 'array'), default=['scalar', 'array'],
+                        help='scalar-only and/or array-capable callables (default: both)')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='runs per case; the fastest is reported (default: 3)')
+    parser.add_argument('--quick', action='store_true', help='run a shorter sweep')
+    parser.add_argument('--output', help='write results as JSON to this file')
+    parser.add_argument('--plot', help='write the convergence plot to this image file')
+    parser.add_argument('--baseline', help='compare against a previous JSON result')
+    parser.add_argument('--threshold', type=float, default=0.1,
+                        help='allowed regression against the baseline (default: 0.1 = 10%%)')
+    args = parser.parse_args(argv)
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    results = run_benchmarks(args)
+    report = {
+        'meta': {
+            'timestamp': datetime.utcnow().isoformat(),
+            'repeat': args.repeat,
+            'quick': args.quick,
+            'python': platform.python_version(),
+            'numpy': np.__version__,
+            'platform': platform.platform(),
+        },
+        'sweeps': {method: SWEEPS[method][0] for method in args.methods},
+        'results': results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    if args.plot:
+        plot_convergence(results, args.plot)
+
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            for name, mode, method, param, metric in regressions:
+                print(f'Regression: {name} {mode} {method} {param} {metric}')
+            return 1
+        print('No regressions against the baseline')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,7 +3,10 @@ Numerical Integration Module
 
 This module provides various numerical methods for approximating definite integrals.
 It includes implementations of common numerical integration techniques such as
-the Trapezoidal rule, Simpson's rule, and Midpoint rule.
+the Trapezoidal rule, Simpson's rule, Midpoint rule and Gauss–Legendre rules,
+as well as adaptive methods that refine the integration interval until an
+error tolerance is met, cubature and (quasi-)Monte Carlo methods for
+integrals over boxes, and rules for integrating sampled data.
 """
 
 from .integrators import (
@@ -12,5 +15,54 @@ from .integrators import (
     midpoint,
     integrate  # General purpose integration function
 )
+from .gauss import (
+    gauss_legendre,
+    composite_gauss,
+    gauss_legendre_nodes
+)
+from .romberg import (
+    RombergResult,
+    romberg
+)
+from .batch import (
+    integrate_batch,
+    unit_rule
+)
+from .cache import (
+    CacheInfo,
+    CachedIntegrand
+)
+from .cubature import (
+    gauss_cubature,
+    monte_carlo,
+    quasi_monte_carlo
+)
+from .qmc import (
+    HaltonSequence,
+    SobolSequence
+)
+from .sampled import (
+    SimpsonAccumulator,
+    TrapezoidAccumulator,
+    cumulative_stream,
+    cumulative_trapezoid,
+    integrate_stream,
+    simpson_data,
+    trapezoid_data
+)
+from .adaptive import (
+    IntegrationResult,
+    adaptive_simpson,
+    gauss_kronrod
+)
 
-__all__ = ['trapezoidal', 'simpsons', 'midpoint', 'integrate']
+__all__ = ['trapezoidal', 'simpsons', 'midpoint', 'integrate',
+           'gauss_legendre', 'composite_gauss', 'gauss_legendre_nodes',
+           'romberg', 'RombergResult',
+           'adaptive_simpson', 'gauss_kronrod', 'IntegrationResult',
+           'integrate_batch', 'unit_rule', 'CachedIntegrand', 'CacheInfo',
+           'gauss_cubature', 'monte_carlo', 'quasi_monte_carlo',
+           'SobolSequence', 'HaltonSequence',
+           'trapezoid_data', 'simpson_data', 'cumulative_trapezoid',
+           'integrate_stream', 'cumulative_stream',
+           'TrapezoidAccumulator', 'SimpsonAccumulator']
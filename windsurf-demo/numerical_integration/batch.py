@@ -0,0 +1,166 @@
+"""
+Batch integration of many integrals with the same rule.
+
+integrate_batch computes integrals of f(x, *args) over [a, b] for arrays of
+bounds and parameters. All integrals share one quadrature rule, so the
+sample points of a whole batch form a single broadcasted grid: f is called
+once per chunk of the batch instead of once per integral. Large batches can
+also be split across a pool of worker processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .gauss import DEFAULT_COMPOSITE_ORDER, DEFAULT_ORDER, gauss_legendre_nodes
+
+# Default limit on the number of sample points evaluated by one call of f
+CHUNK_POINTS = 1_000_000
+
+
+def unit_rule(method: str, n: int = 1000,
+              order: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Nodes and weights of a fixed rule on [0, 1].
+
+    The integral over [a, b] is then (b - a) * sum(weights * f(a + (b - a) * nodes)).
+
+    Args:
+        method: 'trapezoidal', 'simpsons', 'midpoint', 'gauss_legendre' or
+            'composite_gauss'
+        n: Number of subintervals (ignored by 'gauss_legendre')
+        order: Number of Gauss nodes for the Gauss rules (per subinterval for
+            'composite_gauss')
+
+    Returns:
+        Tuple (nodes, weights)
+
+    Raises:
+        ValueError: If an invalid method or n is specified
+    """
+    if method == 'gauss_legendre':
+        nodes, weights = gauss_legendre_nodes(order or DEFAULT_ORDER)
+        return (nodes + 1) / 2, weights / 2
+
+    if n <= 0:
+        raise ValueError("Number of subintervals (n) must be positive")
+
+    if method == 'trapezoidal':
+        weights = np.full(n + 1, 1.0 / n)
+        weights[0] = weights[-1] = 0.5 / n
+        return np.linspace(0.0, 1.0, n + 1), weights
+    if method == 'simpsons':
+        if n % 2 != 0:
+            raise ValueError("Number of subintervals (n) must be even for Simpson's rule")
+        weights = np.ones(n + 1)
+        weights[1:-1:2] = 4
+        weights[2:-1:2] = 2
+        return np.linspace(0.0, 1.0, n + 1), weights / (3 * n)
+    if method == 'midpoint':
+        return (np.arange(n) + 0.5) / n, np.full(n, 1.0 / n)
+    if method == 'composite_gauss':
+        nodes, weights = gauss_legendre_nodes(order or DEFAULT_COMPOSITE_ORDER)
+        starts = np.arange(n) / n
+        unit_nodes = (starts[:, np.newaxis] + (nodes + 1) / (2 * n)).ravel()
+        return unit_nodes, np.tile(weights / (2 * n), n)
+
+    methods = ['trapezoidal', 'simpsons', 'midpoint', 'gauss_legendre', 'composite_gauss']
+    raise ValueError(f"Unknown method: {method}. Available methods: {methods}")
+
+
+def _integrate_chunk(f: Callable, a: np.ndarray, b: np.ndarray, args: Sequence[np.ndarray],
+                     nodes: np.ndarray, weights: np.ndarray,
+                     vectorize: Optional[bool]) -> np.ndarray:
+    """Integrate one chunk of a flattened batch on a (len(a), len(nodes)) grid."""
+    width = (b - a)[:, np.newaxis]
+    x = a[:, np.newaxis] + width * nodes
+    columns = [arg[:, np.newaxis] for arg in args]
+
+    y = None
+    if vectorize is not False:
+        try:
+            y = np.asarray(f(x, *columns))
+        except Exception:
+            if vectorize:
+                raise
+        if y is not None and y.shape != x.shape:
+            if vectorize:
+                raise ValueError(
+                    f"f returned shape {y.shape} for input of shape {x.shape}; "
+                    "it must broadcast its arguments elementwise"
+                )
+            y = None
+    if y is None:
+        # Without otypes np.vectorize would take the dtype of the first value
+        # and truncate every other one to int if f returns e.g. 0 there
+        y = np.array(np.vectorize(f, otypes=[object])(x, *columns).tolist())
+
+    # Row-wise sums do not depend on how many rows the chunk has, so the
+    # result is the same for any chunk_size or number of workers
+    return (b - a) * np.sum(y * weights, axis=1)
+
+
+def integrate_batch(f: Callable, a, b, args: Sequence = (), method: str = 'trapezoidal',
+                    n: int = 1000, order: Optional[int] = None,
+                    vectorize: Optional[bool] = None, chunk_size: Optional[int] = None,
+                    workers: Optional[int] = None) -> np.ndarray:
+    """
+    Integrate f(x, *args) from a to b for whole arrays of bounds and parameters.
+
+    a, b and every entry of args are broadcast against each other; the result
+    has their common shape. For example, a parameter sweep over p for
+    f(x, p) = exp(-p * x) on [0, 1] is
+    ``integrate_batch(f, 0, 1, args=(p,))``.
+
+    Args:
+        f: Function to integrate, called as f(x, *args). With array evaluation
+            x has shape (batch, points) and each arg shape (batch, 1)
+        a: Lower bounds of integration (scalar or array)
+        b: Upper bounds of integration (scalar or array)
+        args: Extra parameters of f (scalars or arrays)
+        method: 'trapezoidal', 'simpsons', 'midpoint', 'gauss_legendre' or
+            'composite_gauss' (default: 'trapezoidal')
+        n: Number of subintervals (ignored by 'gauss_legendre')
+        order: Number of Gauss nodes for the Gauss rules
+        vectorize: Evaluate f on a whole chunk in one call. None (default)
+            tries it and falls back to one call per point
+        chunk_size: Number of integrals per chunk (default: as many as fit
+            in about a million sample points)
+        workers: Number of worker processes; None or 1 integrates in this
+            process. f must be picklable (e.g. defined at module level)
+
+    Returns:
+        Array of integrals with the broadcast shape of a, b and args, in the
+        same order as the inputs
+    """
+    nodes, weights = unit_rule(method, n, order)
+    arrays = np.broadcast_arrays(np.asarray(a, dtype=float), np.asarray(b, dtype=float),
+                                 *[np.asarray(arg) for arg in args])
+    shape = arrays[0].shape
+    flat = [array.ravel() for array in arrays]
+    total = flat[0].size
+    if total == 0:
+        return np.zeros(shape)
+
+    if chunk_size is None:
+        chunk_size = max(1, CHUNK_POINTS // len(nodes))
+    if chunk_size <= 0:
+        raise ValueError("Chunk size (chunk_size) must be positive")
+    if workers is not None and workers <= 0:
+        raise ValueError("Number of worker processes (workers) must be positive")
+
+    chunks = [
+        (f, flat[0][start:start + chunk_size], flat[1][start:start + chunk_size],
+         [arg[start:start + chunk_size] for arg in flat[2:]], nodes, weights, vectorize)
+        for start in range(0, total, chunk_size)
+    ]
+
+    if workers is None or workers == 1 or len(chunks) == 1:
+        results = [_integrate_chunk(*chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            # map returns the results in the order of the chunks
+            results = list(executor.map(_integrate_chunk, *zip(*chunks)))
+
+    return np.concatenate(results).reshape(shape)
@@ -0,0 +1,136 @@
+"""
+Memoizing wrapper for expensive integrands.
+
+Different rules, intervals and values of n often sample f at the same
+points: the trapezoidal grid with n subintervals is part of the grid with
+2n, Simpson's and the trapezoidal rule share all their points, and so on.
+Wrapping f in a CachedIntegrand and passing the wrapper to the integrators
+evaluates f only once per distinct abscissa.
+"""
+
+from collections import OrderedDict
+from typing import Callable, Dict, NamedTuple, Optional
+
+import numpy as np
+
+from .evaluation import PROBE_POINTS, evaluate_on_grid
+
+
+def _key(x: float) -> int:
+    """Bit pattern of x as a float, which tells 0.0 and -0.0 apart."""
+    return np.float64(x).view(np.int64).item()
+
+
+class CacheInfo(NamedTuple):
+    """Statistics of a CachedIntegrand, in the style of functools.lru_cache."""
+    hits: int
+    misses: int
+    evictions: int
+    maxsize: Optional[int]
+    currsize: int
+
+
+class CachedIntegrand:
+    """
+    Callable wrapper around f that remembers f(x) for each float x.
+
+    Entries are keyed on the bit pattern of the abscissa as a float, so 0.0
+    and -0.0 are cached separately, and evicted least recently used first
+    once there are more than maxsize of them. The wrapper accepts
+    arrays exactly when f does, so an integrator takes the same scalar or
+    vectorized path, and gives the same result, as with f itself. Whether f
+    accepts arrays is found out on the first array call with uncached
+    points; an array call whose points are all cached never calls f.
+
+    Caching pays off for integrands that are expensive compared with a
+    dictionary lookup per point. With worker processes (workers=...) each
+    process has its own copy of the cache.
+
+    Args:
+        f: Function to cache
+        maxsize: Maximum number of cached values, or None for no limit
+            (default: 100000)
+        vectorize: Whether f accepts arrays; None (default) finds out on the
+            first array call
+    """
+
+    def __init__(self, f: Callable[[float], float], maxsize: Optional[int] = 100000,
+                 vectorize: Optional[bool] = None):
+        if maxsize is not None and maxsize <= 0:
+            raise ValueError("Cache size (maxsize) must be positive or None")
+        self.f = f
+        self.maxsize = maxsize
+        self.vectorize = vectorize
+        self._values: "OrderedDict[int, float]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __call__(self, x):
+        if isinstance(x, np.ndarray) and x.ndim > 0:
+            return self._call_array(x)
+
+        x = float(np.asarray(x))
+        key = _key(x)
+        try:
+            value = self._values[key]
+        except KeyError:
+            self.misses += 1
+            value = self.f(x)
+            self._store(key, value)
+        else:
+            self.hits += 1
+            self._values.move_to_end(key)
+        return value
+
+    def _call_array(self, x: np.ndarray) -> np.ndarray:
+        if self.vectorize is False:
+            raise TypeError("the cached function does not accept arrays")
+
+        points = x.ravel()
+        keys = points.astype(float).view(np.int64).tolist()
+        found: Dict[int, float] = {}
+        missing = []
+        for i, key in enumerate(keys):
+            if key in found:
+                self.hits += 1
+            elif key in self._values:
+                self.hits += 1
+                found[key] = self._values[key]
+                self._values.move_to_end(key)
+            else:
+                self.misses += 1
+                found[key] = None
+                missing.append(i)
+
+        # Evaluate all new points with one call of f; the first such call
+        # also tells whether f accepts arrays at all
+        if missing:
+            y = evaluate_on_grid(self.f, points[missing], self.vectorize)
+            if y is None:
+                # The caller falls back to scalar calls, which count again;
+                # only the points f was tried on count as evaluated
+                self.vectorize = False
+                self.misses -= len(missing) - min(len(missing), PROBE_POINTS)
+                self.hits -= len(keys) - len(missing)
+                raise TypeError("the cached function does not accept arrays")
+            self.vectorize = True
+            for i, value in zip(missing, y):
+                found[keys[i]] = value
+                self._store(keys[i], value)
+        return np.array([found[key] for key in keys]).reshape(x.shape)
+
+    def _store(self, key: int, value) -> None:
+        self._values[key] = value
+        if self.maxsize is not None and len(self._values) > self.maxsize:
+            self._values.popitem(last=False)
+            self.evictions += 1
+
+    def cache_info(self) -> CacheInfo:
+        """Return hit, miss and eviction counts and the current size."""
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._values))
+
+    def cache_clear(self) -> None:
+        """Drop all cached values and reset the statistics."""
+        self._values.clear()
+        self.hits = self.misses = self.evictions = 0
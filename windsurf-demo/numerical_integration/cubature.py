@@ -0,0 +1,243 @@
+"""
+Multidimensional integration over boxes.
+
+The integrand is called as f(x1, ..., xd): with scalars for one point, or
+with d arrays of the same shape when it accepts arrays (e.g.
+``lambda x, y: np.exp(-x * y)``). Bounds are given as one (a, b) pair per
+dimension.
+
+gauss_cubature uses the tensor product of 1-D Gauss–Legendre rules, which is
+very accurate for smooth integrands in a few dimensions but needs order**d
+points. monte_carlo and quasi_monte_carlo sample the box in fixed-size
+chunks, so their memory use does not grow with the number of samples; they
+stop as soon as their running error estimate meets the tolerance.
+"""
+
+import warnings
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .adaptive import IntegrationResult, _check_tolerances
+from .gauss import gauss_legendre_nodes
+from .qmc import make_sequence
+
+# Default number of points per chunk (per replicate for quasi-Monte Carlo)
+CHUNK_SIZE = 2 ** 14
+
+
+def _check_bounds(bounds: Sequence[Tuple[float, float]]) -> Tuple[np.ndarray, np.ndarray]:
+    bounds = np.asarray(bounds, dtype=float)
+    if bounds.ndim != 2 or bounds.shape[1] != 2 or len(bounds) == 0:
+        raise ValueError("bounds must be a sequence of (a, b) pairs, one per dimension")
+    return bounds[:, 0], bounds[:, 1]
+
+
+def _check_chunk_size(chunk_size: int) -> None:
+    if chunk_size < 1:
+        raise ValueError("Chunk size (chunk_size) must be positive")
+
+
+def make_point_evaluator(f: Callable, vectorize: Optional[bool] = None) -> Callable:
+    """
+    Wrap f(x1, ..., xd) to evaluate it on an (m, d) array of points.
+
+    The first call decides whether f accepts arrays, as make_evaluator does
+    for 1-D integrands.
+
+    Args:
+        f: Function of d coordinates
+        vectorize: True, False or None, as for evaluate_on_grid
+
+    Returns:
+        Function mapping an (m, d) array of points to the m values of f
+    """
+    vectorized = vectorize
+
+    def evaluate(points: np.ndarray) -> np.ndarray:
+        nonlocal vectorized
+        if vectorized is not False:
+            try:
+                y = np.asarray(f(*points.T))
+            except Exception:
+                if vectorized:
+                    raise
+                y = None
+            if y is not None and y.shape == (len(points),):
+                vectorized = True
+                return y
+            if vectorized:
+                raise ValueError(
+                    f"f returned shape {None if y is None else y.shape} for "
+                    f"{len(points)} points; it must be evaluated elementwise"
+                )
+            vectorized = False
+        return np.array([f(*point) for point in points.tolist()])
+
+    return evaluate
+
+
+def gauss_cubature(f: Callable, bounds: Sequence[Tuple[float, float]], order: int = 10,
+                   vectorize: Optional[bool] = None, chunk_size: int = CHUNK_SIZE) -> float:
+    """
+    Integrate f over a box with a tensor-product Gauss–Legendre rule.
+
+    Uses order**d points, generated chunk_size at a time. Best for smooth
+    integrands in up to about 4 dimensions.
+
+    Args:
+        f: Function to integrate, called as f(x1, ..., xd)
+        bounds: Sequence of (a, b) pairs, one per dimension
+        order: Number of Gauss nodes per dimension (default: 10)
+        vectorize: Evaluate f on a whole chunk in one call (see trapezoidal)
+        chunk_size: Number of points per chunk (default: 16384)
+
+    Returns:
+        Approximate value of the integral
+    """
+    a, b = _check_bounds(bounds)
+    _check_chunk_size(chunk_size)
+    nodes, weights = gauss_legendre_nodes(order)
+    half = (b - a) / 2
+    center = (a + b) / 2
+    shape = (order,) * len(a)
+    total = order ** len(a)
+    evaluate = make_point_evaluator(f, vectorize)
+
+    result = 0.0
+    for start in range(0, total, chunk_size):
+        index = np.unravel_index(np.arange(start, min(start + chunk_size, total)), shape)
+        points = np.column_stack([center[k] + half[k] * nodes[i] for k, i in enumerate(index)])
+        w = np.prod([weights[i] for i in index], axis=0)
+        result += np.dot(w, evaluate(points)).item()
+    return result * np.prod(half).item()
+
+
+def _report(value: float, error: float, evaluations: int, atol: float, rtol: float,
+            method: str) -> IntegrationResult:
+    if not error <= max(atol, rtol * abs(value)):
+        warnings.warn(
+            f"{method} did not reach the requested tolerance after "
+            f"{evaluations} evaluations (estimated error {error:.3g})",
+            RuntimeWarning,
+            stacklevel=3,
+        )
+    return IntegrationResult(value, error, evaluations)
+
+
+def monte_carlo(f: Callable, bounds: Sequence[Tuple[float, float]],
+                atol: float = 1e-6, rtol: float = 1e-3, max_evals: int = 10 ** 7,
+                chunk_size: int = CHUNK_SIZE, seed=None,
+                vectorize: Optional[bool] = None) -> IntegrationResult:
+    """
+    Integrate f over a box by plain Monte Carlo sampling.
+
+    Uniform samples are drawn chunk_size at a time. The mean and variance
+    are updated after every chunk, and sampling stops once the standard
+    error is below max(atol, rtol * abs(value)) or max_evals is reached.
+
+    Args:
+        f: Function to integrate, called as f(x1, ..., xd)
+        bounds: Sequence of (a, b) pairs, one per dimension
+        atol: Absolute error tolerance (default: 1e-6)
+        rtol: Relative error tolerance (default: 1e-3)
+        max_evals: Maximum number of evaluations of f (default: 10**7)
+        chunk_size: Number of samples per chunk (default: 16384)
+        seed: Seed or numpy Generator for the samples
+        vectorize: Evaluate f on a whole chunk in one call (see trapezoidal)
+
+    Returns:
+        IntegrationResult(value, error, evaluations), where error is the
+        standard error of the estimate. If the tolerance is not reached
+        within max_evals, a RuntimeWarning is issued.
+    """
+    _check_tolerances(atol, rtol, max_evals)
+    _check_chunk_size(chunk_size)
+    a, b = _check_bounds(bounds)
+    volume = np.prod(b - a).item()
+    rng = np.random.default_rng(seed)
+    evaluate = make_point_evaluator(f, vectorize)
+
+    count, mean, m2 = 0, 0.0, 0.0
+    value, error = 0.0, float('inf')
+    while count < max_evals:
+        size = min(chunk_size, max_evals - count)
+        y = evaluate(a + (b - a) * rng.random((size, len(a))))
+        # Merge the chunk's mean and sum of squared deviations (Chan et al.)
+        chunk_mean = np.mean(y).item()
+        chunk_m2 = np.sum(np.abs(y - chunk_mean) ** 2).item()
+        delta = chunk_mean - mean
+        total = count + size
+        mean += delta * size / total
+        m2 += chunk_m2 + abs(delta) ** 2 * count * size / total
+        count = total
+
+        value = volume * mean
+        if count > 1:
+            error = abs(volume) * (m2 / (count - 1) / count) ** 0.5
+            if error <= max(atol, rtol * abs(value)):
+                break
+    return _report(value, error, count, atol, rtol, "monte_carlo")
+
+
+def quasi_monte_carlo(f: Callable, bounds: Sequence[Tuple[float, float]],
+                      sequence: str = 'sobol', replicates: int = 8,
+                      atol: float = 1e-6, rtol: float = 1e-3, max_evals: int = 10 ** 7,
+                      chunk_size: int = CHUNK_SIZE, seed=None,
+                      vectorize: Optional[bool] = None) -> IntegrationResult:
+    """
+    Integrate f over a box with randomized quasi-Monte Carlo sampling.
+
+    The box is sampled with `replicates` independently scrambled Sobol or
+    Halton sequences, chunk_size points of each at a time. The spread of
+    the replicate means gives the error estimate, and sampling stops once
+    it is below max(atol, rtol * abs(value)) or max_evals is reached. For
+    smooth integrands the error falls almost like 1/N instead of the
+    1/sqrt(N) of plain Monte Carlo.
+
+    Args:
+        f: Function to integrate, called as f(x1, ..., xd)
+        bounds: Sequence of (a, b) pairs, one per dimension
+        sequence: 'sobol' (up to 10 dimensions) or 'halton' (up to 20)
+        replicates: Number of independent scramblings (default: 8)
+        atol: Absolute error tolerance (default: 1e-6)
+        rtol: Relative error tolerance (default: 1e-3)
+        max_evals: Maximum number of evaluations of f over all replicates
+            (default: 10**7)
+        chunk_size: Number of points per replicate and chunk; a power of 2
+            suits Sobol sequences best (default: 16384)
+        seed: Seed or numpy Generator for the scrambling
+        vectorize: Evaluate f on a whole chunk in one call (see trapezoidal)
+
+    Returns:
+        IntegrationResult(value, error, evaluations), where error is the
+        standard error of the mean over the replicates. If the tolerance is
+        not reached within max_evals, a RuntimeWarning is issued.
+    """
+    _check_tolerances(atol, rtol, max_evals)
+    _check_chunk_size(chunk_size)
+    if replicates < 2:
+        raise ValueError("At least two replicates are needed to estimate the error")
+    a, b = _check_bounds(bounds)
+    volume = np.prod(b - a).item()
+    rng = np.random.default_rng(seed)
+    sequences = [make_sequence(sequence, len(a), seed=rng) for _ in range(replicates)]
+    evaluate = make_point_evaluator(f, vectorize)
+
+    count = 0
+    sums = 0.0
+    value, error = 0.0, float('inf')
+    while count + replicates <= max_evals:
+        size = min(chunk_size, (max_evals - count) // replicates)
+        start = count // replicates
+        unit = np.concatenate([s.points(start, size) for s in sequences])
+        y = evaluate(a + (b - a) * unit).reshape(replicates, size)
+        sums += y.sum(axis=1)
+        count += replicates * size
+
+        means = volume * sums / (count // replicates)
+        value = np.mean(means).item()
+        error = (np.std(means, ddof=1) / replicates ** 0.5).item()
+        if error <= max(atol, rtol * abs(value)):
+            break
+    return _report(value, error, count, atol, rtol, "quasi_monte_carlo")
@@ -5,10 +5,16 @@ This module contains various numerical methods for approximating definite integr
 """
 
 import numpy as np
-from typing import Callable, Tuple, Optional
+from typing import Callable, Tuple, Optional, Union
 
+from .adaptive import IntegrationResult, adaptive_simpson, gauss_kronrod
+from .evaluation import Grid, evaluate_points
+from .romberg import romberg
+from .gauss import DEFAULT_COMPOSITE_ORDER, DEFAULT_ORDER, composite_gauss, gauss_legendre
 
-def trapezoidal(f: Callable[[float], float], a: float, b: float, n: int = 1000) -> float:
+
+def trapezoidal(f: Callable[[float], float], a: float, b: float, n: int = 1000,
+                vectorize: Optional[bool] = None, workers: Optional[int] = None) -> float:
     """
     Approximate the definite integral of f from a to b using the Trapezoidal rule.
     
@@ -17,6 +23,11 @@ def trapezoidal(f: Callable[[float], float], a: float, b: float, n: int = 1000)
         a: Lower bound of integration
         b: Upper bound of integration
         n: Number of subintervals (default: 1000)
+        vectorize: Evaluate f on the whole grid in one call. None (default)
+            tries it and falls back to one call per point when f does not
+            accept arrays; True requires it; False always uses the scalar path
+        workers: Number of worker processes evaluating f (default: this
+            process only). The result is identical to the serial one
         
     Returns:
         Approximate value of the integral
@@ -25,15 +36,22 @@ def trapezoidal(f: Callable[[float], float], a: float, b: float, n: int = 1000)
         raise ValueError("Number of subintervals (n) must be positive")
         
     h = (b - a) / n
-    result = 0.5 * (f(a) + f(b))
+    y = evaluate_points(f, Grid(a, h, n + 1, end=b), vectorize, workers)
+    if isinstance(y, np.ndarray):
+        weights = np.ones(n + 1)
+        weights[0] = weights[-1] = 0.5
+        return (np.dot(weights, y) * h).item()
+
+    result = 0.5 * (y[0] + y[n])
     
-    for i in range(1, n):
-        result += f(a + i * h)
+    for value in y[1:n]:
+        result += value
         
     return result * h
 
 
-def simpsons(f: Callable[[float], float], a: float, b: float, n: int = 1000) -> float:
+def simpsons(f: Callable[[float], float], a: float, b: float, n: int = 1000,
+             vectorize: Optional[bool] = None, workers: Optional[int] = None) -> float:
     """
     Approximate the definite integral of f from a to b using Simpson's rule.
     
@@ -42,6 +60,8 @@ def simpsons(f: Callable[[float], float], a: float, b: float, n: int = 1000) ->
         a: Lower bound of integration
         b: Upper bound of integration
         n: Number of subintervals (must be even, default: 1000)
+        vectorize: Evaluate f on the whole grid in one call (see trapezoidal)
+        workers: Number of worker processes evaluating f (see trapezoidal)
         
     Returns:
         Approximate value of the integral
@@ -50,19 +70,26 @@ def simpsons(f: Callable[[float], float], a: float, b: float, n: int = 1000) ->
         raise ValueError("Number of subintervals (n) must be even for Simpson's rule")
         
     h = (b - a) / n
-    result = f(a) + f(b)
+    y = evaluate_points(f, Grid(a, h, n + 1, end=b), vectorize, workers)
+    if isinstance(y, np.ndarray):
+        weights = np.ones(n + 1)
+        weights[1:-1:2] = 4
+        weights[2:-1:2] = 2
+        return (np.dot(weights, y) * h / 3).item()
+
+    result = y[0] + y[n]
     
-    for i in range(1, n):
-        x = a + i * h
+    for i, value in enumerate(y[1:n], 1):
         if i % 2 == 0:
-            result += 2 * f(x)
+            result += 2 * value
         else:
-            result += 4 * f(x)
+            result += 4 * value
             
     return result * h / 3
 
 
-def midpoint(f: Callable[[float], float], a: float, b: float, n: int = 1000) -> float:
+def midpoint(f: Callable[[float], float], a: float, b: float, n: int = 1000,
+             vectorize: Optional[bool] = None, workers: Optional[int] = None) -> float:
     """
     Approximate the definite integral of f from a to b using the Midpoint rule.
     
@@ -71,6 +98,8 @@ def midpoint(f: Callable[[float], float], a: float, b: float, n: int = 1000) ->
         a: Lower bound of integration
         b: Upper bound of integration
         n: Number of subintervals (default: 1000)
+        vectorize: Evaluate f on the whole grid in one call (see trapezoidal)
+        workers: Number of worker processes evaluating f (see trapezoidal)
         
     Returns:
         Approximate value of the integral
@@ -79,17 +108,22 @@ def midpoint(f: Callable[[float], float], a: float, b: float, n: int = 1000) ->
         raise ValueError("Number of subintervals (n) must be positive")
         
     h = (b - a) / n
+    y = evaluate_points(f, Grid(a, h, n, offset=0.5), vectorize, workers)
+    if isinstance(y, np.ndarray):
+        return (np.sum(y) * h).item()
+
     result = 0.0
     
-    for i in range(n):
-        x_mid = a + (i + 0.5) * h
-        result += f(x_mid)
+    for value in y:
+        result += value
         
     return result * h
 
 
 def integrate(f: Callable[[float], float], a: float, b: float, 
-              method: str = 'trapezoidal', n: int = 1000) -> float:
+              method: str = 'trapezoidal', n: int = 1000,
+              vectorize: Optional[bool] = None, workers: Optional[int] = None,
+              full_output: bool = False, **options) -> Union[float, IntegrationResult]:
     """
     General purpose numerical integration function.
     
@@ -97,22 +131,62 @@ def integrate(f: Callable[[float], float], a: float, b: float,
         f: Function to integrate
         a: Lower bound of integration
         b: Upper bound of integration
-        method: Integration method ('trapezoidal', 'simpsons', or 'midpoint')
-        n: Number of subintervals
+        method: Integration method ('trapezoidal', 'simpsons', 'midpoint',
+            'gauss_legendre', 'composite_gauss', 'romberg', 'adaptive_simpson'
+            or 'gauss_kronrod')
+        n: Number of subintervals (ignored by 'gauss_legendre', 'romberg'
+            and the adaptive methods)
+        vectorize: Evaluate f on the whole grid in one call (see trapezoidal)
+        workers: Number of worker processes evaluating f, for expensive
+            integrands. Only the fixed rules support it; their result is
+            identical to the serial one. f must be picklable (e.g. defined
+            at module level)
+        full_output: Return an IntegrationResult instead of just the value
+        **options: Extra arguments for the method, e.g. order for the Gauss
+            rules, atol, rtol and max_levels for 'romberg' or atol, rtol and
+            max_evals for the adaptive methods
         
     Returns:
-        Approximate value of the integral
+        Approximate value of the integral, or IntegrationResult(value, error,
+        evaluations) if full_output is True ('romberg' returns its
+        RombergResult, which also has the table). The fixed-step methods do
+        not estimate their error, so error is nan for them.
         
     Raises:
-        ValueError: If an invalid method is specified
+        ValueError: If an invalid method is specified, or workers with a
+            method that does not support it
     """
     methods = {
         'trapezoidal': trapezoidal,
         'simpsons': simpsons,
         'midpoint': midpoint,
+        'composite_gauss': composite_gauss,
+    }
+    adaptive_methods = {
+        'romberg': romberg,
+        'adaptive_simpson': adaptive_simpson,
+        'gauss_kronrod': gauss_kronrod,
     }
     
-    if method not in methods:
-        raise ValueError(f"Unknown method: {method}. Available methods: {list(methods.keys())}")
-    
-    return methods[method](f, a, b, n)
+    if method in adaptive_methods:
+        if workers is not None:
+            raise ValueError(f"Method {method} does not support workers")
+        result = adaptive_methods[method](f, a, b, vectorize=vectorize, **options)
+        return result if full_output else result.value
+
+    if method == 'gauss_legendre':
+        value = gauss_legendre(f, a, b, vectorize=vectorize, workers=workers, **options)
+        evaluations = options.get('order', DEFAULT_ORDER)
+    elif method in methods:
+        value = methods[method](f, a, b, n, vectorize=vectorize, workers=workers, **options)
+        evaluations = {
+            'midpoint': n,
+            'composite_gauss': n * options.get('order', DEFAULT_COMPOSITE_ORDER),
+        }.get(method, n + 1)
+    else:
+        available = list(methods) + ['gauss_legendre'] + list(adaptive_methods)
+        raise ValueError(f"Unknown method: {method}. Available methods: {available}")
+
+    if full_output:
+        return IntegrationResult(value, float('nan'), evaluations)
+    return value
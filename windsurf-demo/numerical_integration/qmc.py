@@ -0,0 +1,184 @@
+"""
+Scrambled low-discrepancy sequences for quasi-Monte Carlo integration.
+
+Both generators produce points of the unit cube [0, 1)^d by index, so a
+sequence can be consumed in chunks of any size without keeping earlier
+points in memory. Scrambling randomizes the points while keeping their
+uniformity; independent scramblings give independent estimates, which is
+how the quasi-Monte Carlo integrator estimates its error.
+"""
+
+from typing import Optional
+
+import numpy as np
+
+# Joe–Kuo direction numbers (new-joe-kuo-6.21201) for dimensions 2..10:
+# (degree s, coefficients a, initial values m_1..m_s). Dimension 1 is the
+# van der Corput sequence in base 2.
+SOBOL_DIRECTIONS = [
+    (1, 0, (1,)),
+    (2, 1, (1, 3)),
+    (3, 1, (1, 3, 1)),
+    (3, 2, (1, 1, 1)),
+    (4, 1, (1, 1, 3, 3)),
+    (4, 4, (1, 3, 5, 13)),
+    (5, 2, (1, 1, 5, 5, 17)),
+    (5, 4, (1, 1, 5, 5, 5)),
+    (5, 7, (1, 1, 7, 11, 19)),
+]
+SOBOL_MAX_DIM = len(SOBOL_DIRECTIONS) + 1
+# Bits per coordinate; the sequence has 2**SOBOL_BITS points
+SOBOL_BITS = 32
+
+PRIMES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71)
+HALTON_MAX_DIM = len(PRIMES)
+
+
+def _sobol_direction_numbers(dim: int) -> np.ndarray:
+    """Direction numbers V[k, j] of the first dim Sobol coordinates, as integers."""
+    directions = np.zeros((dim, SOBOL_BITS), dtype=np.uint64)
+    directions[0] = [1 << (SOBOL_BITS - 1 - j) for j in range(SOBOL_BITS)]
+    for k in range(1, dim):
+        s, a, m = SOBOL_DIRECTIONS[k - 1]
+        v = [m[j] << (SOBOL_BITS - 1 - j) for j in range(s)]
+        for j in range(s, SOBOL_BITS):
+            value = v[j - s] ^ (v[j - s] >> s)
+            for i in range(1, s):
+                if (a >> (s - 1 - i)) & 1:
+                    value ^= v[j - i]
+            v.append(value)
+        directions[k] = v
+    return directions
+
+
+class SobolSequence:
+    """
+    Sobol sequence in up to SOBOL_MAX_DIM dimensions.
+
+    With scramble=True, each coordinate gets a random linear matrix scramble
+    and a random digital shift (as in Owen's and Matoušek's constructions),
+    which keeps the net structure of the points.
+
+    Args:
+        dim: Number of dimensions
+        scramble: Randomize the sequence (default: True)
+        seed: Seed or numpy Generator for the scrambling
+    """
+
+    def __init__(self, dim: int, scramble: bool = True, seed=None):
+        if not 1 <= dim <= SOBOL_MAX_DIM:
+            raise ValueError(f"Sobol sequences support 1 to {SOBOL_MAX_DIM} dimensions")
+        self.dim = dim
+        directions = _sobol_direction_numbers(dim)
+        self.shift = np.zeros(dim, dtype=np.uint64)
+
+        if scramble:
+            rng = np.random.default_rng(seed)
+            top = SOBOL_BITS - 1
+            for k in range(dim):
+                # Lower-triangular binary matrix with unit diagonal: column c
+                # keeps bit c and gets random bits below it
+                columns = [(1 << (top - c)) | int(rng.integers(0, 1 << (top - c)))
+                           for c in range(SOBOL_BITS)]
+                scrambled = np.zeros(SOBOL_BITS, dtype=np.uint64)
+                for c, column in enumerate(columns):
+                    has_bit = (directions[k] >> np.uint64(top - c)) & np.uint64(1)
+                    scrambled ^= has_bit * np.uint64(column)
+                directions[k] = scrambled
+            self.shift = rng.integers(0, 1 << SOBOL_BITS, size=dim, dtype=np.uint64)
+        self.directions = directions
+
+    def points(self, start: int, count: int) -> np.ndarray:
+        """
+        Points start, ..., start + count - 1 of the sequence.
+
+        Args:
+            start: Index of the first point
+            count: Number of points
+
+        Returns:
+            Array of shape (count, dim) with coordinates in [0, 1)
+        """
+        if start < 0 or start + count > 1 << SOBOL_BITS:
+            raise ValueError(f"Sobol sequences have at most 2**{SOBOL_BITS} points")
+        index = np.arange(start, start + count, dtype=np.uint64)
+        values = np.broadcast_to(self.shift, (count, self.dim)).copy()
+        for j in range(SOBOL_BITS):
+            bit = (index >> np.uint64(j)) & np.uint64(1)
+            values ^= bit[:, np.newaxis] * self.directions[:, j]
+        return values * 2.0 ** -SOBOL_BITS
+
+
+class HaltonSequence:
+    """
+    Halton sequence in up to HALTON_MAX_DIM dimensions.
+
+    Coordinate k is the radical inverse of the point index in the k-th prime
+    base. With scramble=True, every digit position of every coordinate gets
+    its own random permutation of the digits, which removes the correlation
+    between coordinates with large bases.
+
+    Args:
+        dim: Number of dimensions
+        scramble: Randomize the sequence (default: True)
+        seed: Seed or numpy Generator for the scrambling
+    """
+
+    def __init__(self, dim: int, scramble: bool = True, seed=None):
+        if not 1 <= dim <= HALTON_MAX_DIM:
+            raise ValueError(f"Halton sequences support 1 to {HALTON_MAX_DIM} dimensions")
+        self.dim = dim
+        self.bases = PRIMES[:dim]
+        rng = np.random.default_rng(seed) if scramble else None
+        self.permutations = []
+        for base in self.bases:
+            # Enough digits to resolve double precision
+            digits = int(np.ceil(53 / np.log2(base)))
+            if rng is None:
+                self.permutations.append(np.tile(np.arange(base), (digits, 1)))
+            else:
+                self.permutations.append(np.array([rng.permutation(base) for _ in range(digits)]))
+
+    def points(self, start: int, count: int) -> np.ndarray:
+        """
+        Points start, ..., start + count - 1 of the sequence.
+
+        Args:
+            start: Index of the first point
+            count: Number of points
+
+        Returns:
+            Array of shape (count, dim) with coordinates in [0, 1)
+        """
+        if start < 0:
+            raise ValueError("Index of the first point (start) must be non-negative")
+        values = np.zeros((count, self.dim))
+        for k, (base, permutation) in enumerate(zip(self.bases, self.permutations)):
+            index = np.arange(start, start + count, dtype=np.int64)
+            scale = 1.0
+            for digit_permutation in permutation:
+                scale /= base
+                values[:, k] += digit_permutation[index % base] * scale
+                index //= base
+        # Rounding of the digit sum can reach 1.0 for the largest digits
+        return np.minimum(values, np.nextafter(1.0, 0.0))
+
+
+def make_sequence(name: str, dim: int, scramble: bool = True,
+                  seed: Optional[int] = None):
+    """
+    Create a low-discrepancy sequence by name.
+
+    Args:
+        name: 'sobol' or 'halton'
+        dim: Number of dimensions
+        scramble: Randomize the sequence (default: True)
+        seed: Seed or numpy Generator for the scrambling
+
+    Returns:
+        SobolSequence or HaltonSequence
+    """
+    sequences = {'sobol': SobolSequence, 'halton': HaltonSequence}
+    if name not in sequences:
+        raise ValueError(f"Unknown sequence: {name}. Available sequences: {list(sequences)}")
+    return sequences[name](dim, scramble=scramble, seed=seed)
@@ -0,0 +1,90 @@
+"""
+Romberg integration.
+
+The trapezoidal rule is refined by halving the step size. Each refinement
+reuses every value computed so far and evaluates f only at the new
+midpoints. Richardson extrapolation of the successive trapezoidal sums then
+cancels the leading error terms.
+"""
+
+import warnings
+from typing import Callable, List, NamedTuple, Optional
+
+import numpy as np
+
+from .adaptive import _check_tolerances
+from .evaluation import make_evaluator
+
+
+class RombergResult(NamedTuple):
+    """Romberg estimate together with its extrapolation table."""
+    value: float
+    error: float
+    evaluations: int
+    # table[k][j]: trapezoidal sum with 2**k subintervals (j = 0)
+    # after j Richardson extrapolation steps
+    table: List[List[float]]
+
+
+def romberg(f: Callable[[float], float], a: float, b: float,
+            atol: float = 1e-10, rtol: float = 1e-10, max_levels: int = 20,
+            vectorize: Optional[bool] = None) -> RombergResult:
+    """
+    Approximate the definite integral of f from a to b with Romberg's method.
+
+    Level k of the table uses 2**k subintervals, i.e. 2**k + 1 evaluations of
+    f in total, of which only the 2**(k - 1) new midpoints are computed at
+    that level. Refinement stops once two successive diagonal entries agree
+    within the tolerance (checked from level 2 on).
+
+    Args:
+        f: Function to integrate
+        a: Lower bound of integration
+        b: Upper bound of integration
+        atol: Absolute error tolerance (default: 1e-10)
+        rtol: Relative error tolerance (default: 1e-10)
+        max_levels: Maximum number of halvings of the step size (default: 20)
+        vectorize: Evaluate the new points of each level in one call
+            (see trapezoidal)
+
+    Returns:
+        RombergResult(value, error, evaluations, table). If the tolerance is
+        not reached after max_levels halvings, a RuntimeWarning is issued and
+        the last diagonal entry is returned.
+    """
+    _check_tolerances(atol, rtol)
+    if max_levels < 1:
+        raise ValueError("Number of levels (max_levels) must be positive")
+
+    evaluate = make_evaluator(f, vectorize)
+    h = b - a
+    fa, fb = evaluate(np.array([a, b]))
+    table = [[(h / 2 * (fa + fb)).item()]]
+    evaluations = 2
+    error = float('inf')
+
+    for k in range(1, max_levels + 1):
+        # Midpoints of the 2**(k - 1) subintervals of the previous level
+        count = 2 ** (k - 1)
+        midpoints = evaluate(a + (np.arange(count) + 0.5) * h)
+        evaluations += count
+        h /= 2
+
+        row = [table[-1][0] / 2 + (h * np.sum(midpoints)).item()]
+        for j in range(1, k + 1):
+            factor = 4 ** j
+            row.append(row[j - 1] + (row[j - 1] - table[-1][j - 1]) / (factor - 1))
+        table.append(row)
+
+        error = abs(row[-1] - table[-2][-1])
+        if k >= 2 and error <= max(atol, rtol * abs(row[-1])):
+            break
+    else:
+        warnings.warn(
+            f"romberg did not reach the requested tolerance after {max_levels} "
+            f"levels ({evaluations} evaluations, estimated error {error:.3g})",
+            RuntimeWarning,
+            stacklevel=2,
+        )
+
+    return RombergResult(table[-1][-1], error, evaluations, table)
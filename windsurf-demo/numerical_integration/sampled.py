@@ -0,0 +1,310 @@
+"""
+Integration of sampled data.
+
+These functions integrate measured samples y(x) instead of a callable. The
+samples are consumed in chunks, and the accumulators carry the last samples
+of each chunk over to the next one. The same code therefore handles
+in-memory arrays, np.memmap arrays of any size and iterators of chunks
+read from a file or a socket, and memory use is bounded by the chunk size.
+
+Samples may be equally spaced (dx) or given with their abscissae x, which
+must be increasing or decreasing but need not be evenly spaced.
+"""
+
+from typing import Iterable, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+# Default number of samples read from an array at a time
+CHUNK_SIZE = 1 << 20
+
+Chunk = Union[np.ndarray, Tuple[np.ndarray, np.ndarray]]
+
+
+class _Accumulator:
+    """Common handling of spacings and carried samples for the accumulators."""
+
+    def __init__(self, dx: float = 1.0):
+        self.dx = dx
+        self.count = 0
+        self._last_x: Optional[float] = None
+        self._uses_x: Optional[bool] = None
+
+    def _spacings(self, y, x) -> Tuple[np.ndarray, np.ndarray]:
+        """Return y and the spacings h[i] from sample i - 1 (or the last carried one) to i."""
+        y = np.asarray(y)
+        if y.ndim != 1:
+            raise ValueError("Samples (y) must be one-dimensional")
+        uses_x = x is not None
+        if self._uses_x is None:
+            self._uses_x = uses_x
+        elif self._uses_x != uses_x:
+            raise ValueError("Either every chunk or no chunk must have abscissae (x)")
+
+        if uses_x:
+            x = np.asarray(x, dtype=float)
+            if x.shape != y.shape:
+                raise ValueError("Abscissae (x) and samples (y) must have the same length")
+            if len(x) == 0:
+                return y, x
+            previous = x[0] if self._last_x is None else self._last_x
+            h = np.diff(x, prepend=previous)
+            self._last_x = x[-1]
+        else:
+            h = np.full(len(y), float(self.dx))
+        self.count += len(y)
+        return y, h
+
+
+class TrapezoidAccumulator(_Accumulator):
+    """
+    Trapezoidal rule over samples that arrive in chunks.
+
+    Args:
+        dx: Spacing of the samples when no abscissae are given (default: 1.0)
+    """
+
+    def __init__(self, dx: float = 1.0):
+        super().__init__(dx)
+        self.total = 0.0
+        self._last_y = None
+
+    def _areas(self, y, x) -> np.ndarray:
+        y, h = self._spacings(y, x)
+        if len(y) == 0:
+            return np.zeros(0)
+        if self._last_y is None:
+            areas = np.concatenate([[0.0], h[1:] * (y[1:] + y[:-1]) / 2])
+        else:
+            areas = h * (y + np.concatenate([[self._last_y], y[:-1]])) / 2
+        self._last_y = y[-1]
+        return areas
+
+    def update(self, y, x=None) -> None:
+        """
+        Add a chunk of samples.
+
+        Args:
+            y: Sample values
+            x: Abscissae of the samples, if they are not equally spaced
+        """
+        self.total += np.sum(self._areas(y, x)).item()
+
+    def cumulative(self, y, x=None) -> np.ndarray:
+        """
+        Add a chunk of samples and return the running integral at each of them.
+
+        The running integral is measured from the first sample ever added.
+
+        Args:
+            y: Sample values
+            x: Abscissae of the samples, if they are not equally spaced
+
+        Returns:
+            Array with one value per sample of the chunk
+        """
+        running = self.total + np.cumsum(self._areas(y, x))
+        if len(running):
+            self.total = running[-1].item()
+        return running
+
+    def result(self) -> float:
+        """Integral over all samples added so far."""
+        return self.total
+
+
+class SimpsonAccumulator(_Accumulator):
+    """
+    Simpson's rule over samples that arrive in chunks.
+
+    Pairs of intervals are integrated with Simpson's rule for uneven
+    spacing, which is exact for quadratics. If the total number of intervals
+    is odd, the last interval is integrated with the quadratic through the
+    last three samples (Cartwright's correction). The result does not
+    depend, up to rounding, on how the samples are split into chunks.
+
+    Args:
+        dx: Spacing of the samples when no abscissae are given (default: 1.0)
+    """
+
+    def __init__(self, dx: float = 1.0):
+        super().__init__(dx)
+        self.total = 0.0
+        # Samples not yet covered by a pair of intervals (the first one is the
+        # end of the last pair), the spacings between them, and the sample
+        # before them with its spacing, for the odd-interval correction
+        self._carry_y = np.zeros(0)
+        self._carry_h = np.zeros(0)
+        self._previous: Optional[Tuple[float, float]] = None
+
+    def update(self, y, x=None) -> None:
+        """
+        Add a chunk of samples.
+
+        Args:
+            y: Sample values
+            x: Abscissae of the samples, if they are not equally spaced
+        """
+        first = self.count == 0
+        y, h = self._spacings(y, x)
+        if len(y) == 0:
+            return
+        y = np.concatenate([self._carry_y, y])
+        h = np.concatenate([self._carry_h, h[1:] if first else h])
+
+        pairs = len(h) // 2
+        if pairs:
+            h0, h1 = h[0:2 * pairs:2], h[1:2 * pairs:2]
+            y0, y1, y2 = y[0:2 * pairs:2], y[1:2 * pairs:2], y[2:2 * pairs + 1:2]
+            hsum = h0 + h1
+            self.total += np.sum(hsum / 6 * ((2 - h1 / h0) * y0
+                                             + hsum ** 2 / (h0 * h1) * y1
+                                             + (2 - h0 / h1) * y2)).item()
+            self._previous = (y[2 * pairs - 1], h[2 * pairs - 1])
+        self._carry_y = y[2 * pairs:]
+        self._carry_h = h[2 * pairs:]
+
+    def result(self) -> float:
+        """Integral over all samples added so far."""
+        if len(self._carry_h) == 0:
+            return self.total
+        y1, y2 = self._carry_y
+        h1 = self._carry_h[0]
+        if self._previous is None:
+            # Only two samples: nothing better than a trapezoid
+            return (h1 * (y1 + y2) / 2).item()
+        y0, h0 = self._previous
+        alpha = (2 * h1 ** 2 + 3 * h0 * h1) / (6 * (h0 + h1))
+        beta = (h1 ** 2 + 3 * h0 * h1) / (6 * h0)
+        eta = h1 ** 3 / (6 * h0 * (h0 + h1))
+        return self.total + (alpha * y2 + beta * y1 - eta * y0).item()
+
+
+def _chunks(y, x, chunk_size: int) -> Iterator[Tuple[np.ndarray, Optional[np.ndarray]]]:
+    if chunk_size <= 0:
+        raise ValueError("Chunk size (chunk_size) must be positive")
+    if x is not None and len(x) != len(y):
+        raise ValueError("Abscissae (x) and samples (y) must have the same length")
+    for start in range(0, len(y), chunk_size):
+        # Slicing a memmap only reads this part of the file
+        yield y[start:start + chunk_size], None if x is None else x[start:start + chunk_size]
+
+
+def _split(chunk: Chunk) -> Tuple[np.ndarray, Optional[np.ndarray]]:
+    if isinstance(chunk, tuple):
+        x, y = chunk
+        return y, x
+    return chunk, None
+
+
+def trapezoid_data(y, x=None, dx: float = 1.0, chunk_size: int = CHUNK_SIZE) -> float:
+    """
+    Integrate samples with the trapezoidal rule.
+
+    Args:
+        y: Sample values (array or np.memmap)
+        x: Abscissae of the samples, if they are not equally spaced
+        dx: Spacing of the samples when x is not given (default: 1.0)
+        chunk_size: Number of samples read at a time (default: 2**20)
+
+    Returns:
+        Approximate value of the integral
+    """
+    accumulator = TrapezoidAccumulator(dx)
+    for y_chunk, x_chunk in _chunks(y, x, chunk_size):
+        accumulator.update(y_chunk, x_chunk)
+    return accumulator.result()
+
+
+def simpson_data(y, x=None, dx: float = 1.0, chunk_size: int = CHUNK_SIZE) -> float:
+    """
+    Integrate samples with Simpson's rule (see SimpsonAccumulator).
+
+    Args:
+        y: Sample values (array or np.memmap)
+        x: Abscissae of the samples, if they are not equally spaced
+        dx: Spacing of the samples when x is not given (default: 1.0)
+        chunk_size: Number of samples read at a time (default: 2**20)
+
+    Returns:
+        Approximate value of the integral
+    """
+    accumulator = SimpsonAccumulator(dx)
+    for y_chunk, x_chunk in _chunks(y, x, chunk_size):
+        accumulator.update(y_chunk, x_chunk)
+    return accumulator.result()
+
+
+def cumulative_trapezoid(y, x=None, dx: float = 1.0, initial: float = 0.0,
+                         out: Optional[np.ndarray] = None,
+                         chunk_size: int = CHUNK_SIZE) -> np.ndarray:
+    """
+    Running integral of samples with the trapezoidal rule.
+
+    Args:
+        y: Sample values (array or np.memmap)
+        x: Abscissae of the samples, if they are not equally spaced
+        dx: Spacing of the samples when x is not given (default: 1.0)
+        initial: Value of the running integral at the first sample (default: 0.0)
+        out: Array to write the result to, e.g. an np.memmap for inputs that
+            do not fit in memory (default: a new array)
+        chunk_size: Number of samples read at a time (default: 2**20)
+
+    Returns:
+        Array of the same length as y; element i is initial plus the integral
+        from the first sample to sample i
+    """
+    if out is None:
+        out = np.empty(len(y), dtype=np.result_type(np.asarray(y[:1]).dtype, float))
+    elif len(out) != len(y):
+        raise ValueError("Output array (out) must have the same length as y")
+
+    accumulator = TrapezoidAccumulator(dx)
+    accumulator.total = initial
+    start = 0
+    for y_chunk, x_chunk in _chunks(y, x, chunk_size):
+        out[start:start + len(y_chunk)] = accumulator.cumulative(y_chunk, x_chunk)
+        start += len(y_chunk)
+    return out
+
+
+def integrate_stream(chunks: Iterable[Chunk], method: str = 'trapezoid',
+                     dx: float = 1.0) -> float:
+    """
+    Integrate samples that arrive as an iterable of chunks.
+
+    Args:
+        chunks: Iterable of sample arrays y, or of (x, y) pairs for samples
+            that are not equally spaced
+        method: 'trapezoid' or 'simpson'
+        dx: Spacing of the samples when no abscissae are given (default: 1.0)
+
+    Returns:
+        Approximate value of the integral over all chunks
+    """
+    accumulators = {'trapezoid': TrapezoidAccumulator, 'simpson': SimpsonAccumulator}
+    if method not in accumulators:
+        raise ValueError(f"Unknown method: {method}. Available methods: {list(accumulators)}")
+    accumulator = accumulators[method](dx)
+    for chunk in chunks:
+        accumulator.update(*_split(chunk))
+    return accumulator.result()
+
+
+def cumulative_stream(chunks: Iterable[Chunk], dx: float = 1.0,
+                      initial: float = 0.0) -> Iterator[np.ndarray]:
+    """
+    Running trapezoidal integral of samples that arrive as an iterable of chunks.
+
+    Args:
+        chunks: Iterable of sample arrays y, or of (x, y) pairs
+        dx: Spacing of the samples when no abscissae are given (default: 1.0)
+        initial: Value of the running integral at the first sample (default: 0.0)
+
+    Yields:
+        For each chunk, the running integral at each of its samples
+    """
+    accumulator = TrapezoidAccumulator(dx)
+    accumulator.total = initial
+    for chunk in chunks:
+        yield accumulator.cumulative(*_split(chunk))
@@ -0,0 +1,84 @@
+"""
+Tests for the adaptive integration methods.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import adaptive_simpson, gauss_kronrod, integrate
+
+
+def peak(x):
+    return 1 / (1e-4 + (x - 0.3) ** 2)  # Lorentzian peak of height 10^4 at 0.3
+
+
+PEAK_INTEGRAL = (math.atan(0.7 / 1e-2) + math.atan(0.3 / 1e-2)) / 1e-2
+
+
+@pytest.mark.parametrize("method", [adaptive_simpson, gauss_kronrod])
+def test_meets_tolerance(method):
+    """Test that the result is within the requested tolerance."""
+    result = method(peak, 0, 1, atol=1e-8, rtol=1e-10)
+    assert abs(result.value - PEAK_INTEGRAL) <= max(1e-8, 1e-10 * PEAK_INTEGRAL)
+    assert result.error <= max(1e-8, 1e-10 * abs(result.value))
+    assert result.evaluations <= 10000
+
+@pytest.mark.parametrize("method", [adaptive_simpson, gauss_kronrod])
+def test_scalar_and_vectorized_agree(method):
+    """Test that scalar-only integrands give the same result."""
+    vector = method(np.sin, 0, math.pi)
+    scalar = method(math.sin, 0, math.pi)
+    assert vector == scalar
+    assert math.isclose(vector.value, 2.0, rel_tol=1e-10)
+
+def test_gauss_kronrod_smooth_function():
+    """Test that a smooth integrand needs a single 15-point rule."""
+    result = gauss_kronrod(np.exp, 0, 1)
+    assert result.evaluations == 15
+    assert math.isclose(result.value, math.e - 1, rel_tol=1e-14)
+
+def test_adaptive_simpson_reuses_values():
+    """Test that every split costs four new evaluations."""
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return math.sqrt(x)
+
+    result = adaptive_simpson(f, 0, 1, atol=1e-8, rtol=1e-8, vectorize=False)
+    assert result.evaluations == len(calls) == len(set(calls))
+    assert (result.evaluations - 5) % 4 == 0
+
+@pytest.mark.parametrize("method", [adaptive_simpson, gauss_kronrod])
+def test_budget_exhausted(method):
+    """Test that running out of evaluations warns and returns an estimate."""
+    with pytest.warns(RuntimeWarning):
+        result = method(peak, 0, 1, max_evals=100)
+    assert result.evaluations <= 100
+    assert result.error > 0
+
+def test_integrate_adaptive_methods():
+    """Test that the adaptive methods can be selected through integrate."""
+    for method in ['adaptive_simpson', 'gauss_kronrod']:
+        value = integrate(peak, 0, 1, method=method, atol=1e-8)
+        assert math.isclose(value, PEAK_INTEGRAL, rel_tol=1e-9), f"Failed with method: {method}"
+
+        result = integrate(peak, 0, 1, method=method, full_output=True)
+        assert result.value == integrate(peak, 0, 1, method=method)
+
+def test_integrate_full_output_fixed_step():
+    """Test full_output for the fixed-step methods."""
+    result = integrate(lambda x: x, 0, 1, method='simpsons', n=10, full_output=True)
+    assert math.isclose(result.value, 0.5)
+    assert math.isnan(result.error)
+    assert result.evaluations == 11
+
+def test_invalid_tolerances():
+    """Test that invalid tolerances raise ValueError."""
+    with pytest.raises(ValueError):
+        gauss_kronrod(np.sin, 0, 1, atol=0, rtol=0)
+    with pytest.raises(ValueError):
+        adaptive_simpson(np.sin, 0, 1, max_evals=0)
+    with pytest.raises(TypeError):
+        integrate(np.sin, 0, 1, method='trapezoidal', atol=1e-8)
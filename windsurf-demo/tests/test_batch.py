@@ -0,0 +1,71 @@
+"""
+Tests for batch integration.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import integrate, integrate_batch
+
+
+def decay(x, p):
+    return np.exp(-p * x)  # Integral from 0 to 1 is (1 - exp(-p)) / p
+
+
+def scalar_decay(x, p):
+    return math.exp(-p * x)
+
+
+def test_parameter_sweep():
+    """Test a sweep over a parameter of the integrand."""
+    p = np.linspace(0.5, 5, 200)
+    result = integrate_batch(decay, 0, 1, args=(p,), method='gauss_legendre', order=12)
+    assert result.shape == p.shape
+    assert np.allclose(result, (1 - np.exp(-p)) / p, rtol=1e-12)
+
+def test_matches_integrate():
+    """Test that each batch entry equals the corresponding integrate call."""
+    a = np.array([0.0, 1.0, -2.0])
+    b = np.array([1.0, 3.0, 0.5])
+    for method in ['trapezoidal', 'simpsons', 'midpoint', 'composite_gauss']:
+        result = integrate_batch(np.cos, a, b, method=method, n=50)
+        expected = [integrate(np.cos, lo, hi, method=method, n=50) for lo, hi in zip(a, b)]
+        assert np.allclose(result, expected, rtol=1e-13), f"Failed with method: {method}"
+
+def test_broadcasting():
+    """Test that bounds broadcast against each other."""
+    result = integrate_batch(lambda x: x ** 2, [[0], [1]], [1, 2, 3], method='simpsons', n=10)
+    b = np.array([1, 2, 3])
+    expected = np.array([b ** 3 / 3, (b ** 3 - 1) / 3])
+    assert result.shape == (2, 3)
+    assert np.allclose(result, expected)
+
+def test_scalar_fallback_and_chunks():
+    """Test scalar-only integrands and small chunks."""
+    p = np.array([1.0, 2.0, 3.0, 4.0, 5.0])
+    expected = integrate_batch(decay, 0, 1, args=(p,), method='gauss_legendre')
+    result = integrate_batch(scalar_decay, 0, 1, args=(p,), method='gauss_legendre', chunk_size=2)
+    assert np.allclose(result, expected, rtol=1e-14)
+
+def test_scalar_fallback_with_int_values():
+    """Test that int return values do not truncate the other values."""
+    p = np.array([0.5, 0.25])
+    result = integrate_batch(lambda x, p: 0 if x < p else x, 0, 1, args=(p,), n=1000)
+    assert np.allclose(result, (1 - p ** 2) / 2, atol=1e-3)
+
+def test_process_pool_keeps_order():
+    """Test that results from worker processes keep the input order."""
+    p = np.linspace(0.1, 10, 101)
+    serial = integrate_batch(decay, 0, 1, args=(p,), n=100)
+    parallel = integrate_batch(decay, 0, 1, args=(p,), n=100, chunk_size=10, workers=2)
+    assert np.array_equal(serial, parallel)
+
+def test_invalid_arguments():
+    """Test that invalid methods and chunk sizes raise ValueError."""
+    with pytest.raises(ValueError):
+        integrate_batch(np.sin, 0, 1, method='invalid_method')
+    with pytest.raises(ValueError):
+        integrate_batch(np.sin, 0, 1, method='simpsons', n=3)
+    with pytest.raises(ValueError):
+        integrate_batch(np.sin, 0, 1, chunk_size=0)
@@ -0,0 +1,114 @@
+"""
+Tests for the evaluation cache.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import CachedIntegrand, integrate, romberg
+
+
+class Counted:
+    """Integrand that counts the points it is evaluated at."""
+
+    def __init__(self, f):
+        self.f = f
+        self.points = 0
+
+    def __call__(self, x):
+        self.points += np.size(x)
+        return self.f(x)
+
+
+def damped(x):
+    return math.exp(-x) * math.cos(3 * x)
+
+
+RUNS = [('trapezoidal', 1000), ('simpsons', 1000), ('trapezoidal', 2000), ('midpoint', 500)]
+
+
+@pytest.mark.parametrize("f", [damped, lambda x: np.exp(-x) * np.cos(3 * x)])
+def test_results_unchanged(f):
+    """Test that the cache does not change any result."""
+    cached = CachedIntegrand(f)
+    for method, n in RUNS:
+        assert integrate(cached, 0, 2, method=method, n=n) == integrate(f, 0, 2, method=method, n=n)
+    assert romberg(cached, 0, 2).value == romberg(f, 0, 2).value
+
+def test_shared_points_evaluated_once():
+    """Test that points shared between rules are evaluated once."""
+    f = Counted(lambda x: np.exp(-x) * np.cos(3 * x))
+    cached = CachedIntegrand(f)
+    integrate(cached, 0, 2, method='trapezoidal', n=1000)
+    integrate(cached, 0, 2, method='simpsons', n=1000)
+    integrate(cached, 0, 2, method='trapezoidal', n=2000)
+
+    info = cached.cache_info()
+    assert f.points == info.misses == 2001
+    assert info.hits == 2002
+    assert info.currsize == 2001
+
+def test_scalar_only_function():
+    """Test that a scalar-only function is cached point by point."""
+    f = Counted(damped)
+    cached = CachedIntegrand(f, vectorize=False)
+    with pytest.raises(TypeError):
+        cached(np.array([0.0, 1.0]))
+    integrate(cached, 0, 1, n=100)
+    integrate(cached, 0, 1, n=100)
+    assert f.points == 101
+    assert cached.cache_info().hits == 101
+
+def test_probe_counted_as_misses():
+    """Test that trying a scalar-only function on arrays counts as misses."""
+    f = Counted(damped)
+    cached = CachedIntegrand(f)
+    integrate(cached, 0, 1, n=100)
+    assert f.points == cached.cache_info().misses == 103  # 2 probe points + 101
+
+def test_cached_array_call_does_not_probe():
+    """Test that an array call with only cached points does not call f."""
+    f = Counted(lambda x: np.exp(-x))
+    cached = CachedIntegrand(f)
+    cached(0.0)
+    cached(1.0)
+    assert cached(np.array([0.0, 1.0, 0.0])).tolist() == [1.0, math.exp(-1.0), 1.0]
+    assert f.points == 2
+    assert cached.cache_info()[:2] == (3, 2)
+
+def test_lru_eviction():
+    """Test that the least recently used values are evicted first."""
+    cached = CachedIntegrand(math.sqrt, maxsize=2)
+    cached(1.0)
+    cached(4.0)
+    cached(1.0)
+    cached(9.0)  # Evicts 4.0
+    cached(1.0)
+    assert cached.cache_info() == (2, 3, 1, 2, 2)
+
+    cached.cache_clear()
+    assert cached.cache_info() == (0, 0, 0, 2, 0)
+    with pytest.raises(ValueError):
+        CachedIntegrand(math.sqrt, maxsize=0)
+
+def test_signed_zeros_cached_separately():
+    """Test that 0.0 and -0.0 are cached as different points."""
+    cached = CachedIntegrand(lambda x: 1 / x if x else math.copysign(math.inf, x))
+    assert cached(0.0) == math.inf
+    assert cached(-0.0) == -math.inf
+    assert cached.cache_info().currsize == 2
+
+    cached = CachedIntegrand(lambda x: np.copysign(1.0, x))
+    assert cached(np.array([0.0, -0.0])).tolist() == [1.0, -1.0]
+    assert cached(np.array([-0.0])).tolist() == [-1.0]
+
+def test_numpy_scalar_arguments():
+    """Test that 0-d arrays and NumPy scalars share entries with floats."""
+    f = Counted(damped)
+    cached = CachedIntegrand(f)
+    assert cached(np.array(0.5)) == damped(0.5)
+    assert cached(np.float64(0.5)) == damped(0.5)
+    assert cached(0.5) == damped(0.5)
+    assert f.points == 1
+    assert cached.cache_info().hits == 2
@@ -0,0 +1,89 @@
+"""
+Tests for multidimensional integration and quasi-Monte Carlo sequences.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import (HaltonSequence, SobolSequence, gauss_cubature,
+                                   monte_carlo, quasi_monte_carlo)
+
+
+def peak(*x):
+    return np.prod([1 / (1 + (xi - 0.5) ** 2) for xi in x], axis=0)
+
+
+def peak_integral(dim):
+    return (2 * math.atan(0.5)) ** dim
+
+
+def test_gauss_cubature():
+    """Test the tensor Gauss rule for vectorized and scalar integrands."""
+    exact = 0.7965995992970531  # Integral of exp(-x y) over the unit square
+    assert math.isclose(gauss_cubature(lambda x, y: np.exp(-x * y), [(0, 1), (0, 1)]),
+                        exact, rel_tol=1e-14)
+    scalar = gauss_cubature(lambda x, y: math.exp(-x * y), [(0, 1), (0, 1)], chunk_size=7)
+    assert math.isclose(scalar, exact, rel_tol=1e-14)
+
+def test_gauss_cubature_box():
+    """Test a polynomial over a non-unit box, which the rule integrates exactly."""
+    def f(x, y, z):
+        return x * y ** 2 * z ** 3
+
+    expected = (4 - 1) / 2 * (8 / 3) * (1 / 4)  # Over [1, 2] x [0, 2] x [0, 1]
+    assert math.isclose(gauss_cubature(f, [(1, 2), (0, 2), (0, 1)], order=3), expected)
+
+@pytest.mark.parametrize("sequence", ['sobol', 'halton'])
+def test_quasi_monte_carlo(sequence):
+    """Test that QMC reaches the tolerance and its error estimate is sound."""
+    result = quasi_monte_carlo(peak, [(0, 1)] * 6, sequence=sequence, rtol=1e-5, seed=1)
+    assert result.error <= 1e-5 * abs(result.value)
+    assert abs(result.value - peak_integral(6)) < 10 * max(result.error, 1e-9)
+
+def test_monte_carlo_stops_early():
+    """Test that Monte Carlo stops once the standard error is small enough."""
+    result = monte_carlo(peak, [(0, 1)] * 4, rtol=1e-3, chunk_size=1000, seed=0)
+    assert result.evaluations < 10 ** 6
+    assert result.error <= 1e-3 * result.value
+    assert abs(result.value - peak_integral(4)) < 5 * result.error
+
+def test_budget_exhausted():
+    """Test that running out of samples warns."""
+    with pytest.warns(RuntimeWarning):
+        result = monte_carlo(peak, [(0, 1)] * 3, rtol=1e-8, max_evals=5000, seed=0)
+    assert result.evaluations == 5000
+
+def test_sobol_sequence():
+    """Test the unscrambled Sobol points and stratification of scrambled ones."""
+    points = SobolSequence(3, scramble=False).points(0, 4)
+    assert np.array_equal(points, [[0, 0, 0], [0.5, 0.5, 0.5], [0.25, 0.75, 0.75], [0.75, 0.25, 0.25]])
+
+    points = SobolSequence(10, seed=0).points(0, 1024)
+    for k in range(10):
+        # Each of 1024 equal bins of every coordinate holds exactly one point
+        assert len(np.unique(np.floor(points[:, k] * 1024))) == 1024
+
+@pytest.mark.parametrize("sequence", [SobolSequence, HaltonSequence])
+def test_sequences_in_chunks(sequence):
+    """Test that generating points in chunks gives the same points."""
+    s = sequence(5, seed=3)
+    whole = s.points(0, 100)
+    assert np.array_equal(whole, np.vstack([s.points(0, 37), s.points(37, 63)]))
+    assert whole.min() >= 0 and whole.max() < 1
+
+def test_invalid_arguments():
+    """Test invalid bounds and dimensions."""
+    with pytest.raises(ValueError):
+        gauss_cubature(peak, [0, 1])
+    with pytest.raises(ValueError):
+        quasi_monte_carlo(peak, [(0, 1)] * 11, sequence='sobol')
+    with pytest.raises(ValueError):
+        quasi_monte_carlo(peak, [(0, 1)], sequence='invalid_sequence')
+
+@pytest.mark.parametrize("integrator", [gauss_cubature, monte_carlo, quasi_monte_carlo])
+@pytest.mark.parametrize("chunk_size", [0, -1])
+def test_invalid_chunk_size(integrator, chunk_size):
+    """Test that non-positive chunk sizes raise ValueError."""
+    with pytest.raises(ValueError, match="chunk_size"):
+        integrator(peak, [(0, 1), (0, 1)], chunk_size=chunk_size)
@@ -0,0 +1,67 @@
+"""
+Tests for the Gauss–Legendre rules.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import composite_gauss, gauss_legendre, gauss_legendre_nodes, integrate
+
+
+def damped(x):
+    return math.exp(-x) * math.cos(3 * x)
+
+
+DAMPED_INTEGRAL = (1 - math.exp(-2) * (math.cos(6) - 3 * math.sin(6))) / 10
+
+
+def test_polynomial_exactness():
+    """Test that an order-k rule is exact for polynomials of degree 2k - 1."""
+    def f(x):
+        return 8 * x ** 7 - 3 * x ** 2 + 1  # Integral from -1 to 2 is 255 - 9 + 3
+
+    assert math.isclose(gauss_legendre(f, -1, 2, order=4), 249.0, rel_tol=1e-13)
+
+def test_high_accuracy_with_few_evaluations():
+    """Test that a smooth function reaches 1e-12 with a dozen evaluations."""
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return damped(x)
+
+    result = gauss_legendre(f, 0, 2, order=12, vectorize=False)
+    assert len(calls) == 12
+    assert abs(result - DAMPED_INTEGRAL) < 1e-12
+
+def test_scalar_and_vectorized_agree():
+    """Test both evaluation modes of the composite rule."""
+    vector = composite_gauss(np.sqrt, 0, 1, n=50, order=4, vectorize=True)
+    scalar = composite_gauss(math.sqrt, 0, 1, n=50, order=4)
+    assert math.isclose(vector, scalar, rel_tol=1e-13)
+    assert math.isclose(vector, 2 / 3, rel_tol=1e-5)
+
+def test_nodes_are_cached():
+    """Test that the node table is computed once and cannot be modified."""
+    nodes, weights = gauss_legendre_nodes(7)
+    assert gauss_legendre_nodes(7)[0] is nodes
+    assert math.isclose(weights.sum(), 2.0)
+    with pytest.raises(ValueError):
+        weights[0] = 0.0
+
+def test_integrate_gauss_methods():
+    """Test that the Gauss rules can be selected through integrate."""
+    value = integrate(damped, 0, 2, method='gauss_legendre')
+    assert math.isclose(value, DAMPED_INTEGRAL, rel_tol=1e-12)
+
+    result = integrate(damped, 0, 2, method='composite_gauss', n=4, order=6, full_output=True)
+    assert math.isclose(result.value, DAMPED_INTEGRAL, rel_tol=1e-8)
+    assert result.evaluations == 24
+
+def test_invalid_order():
+    """Test that invalid orders and subinterval counts raise ValueError."""
+    with pytest.raises(ValueError):
+        gauss_legendre(np.sin, 0, 1, order=0)
+    with pytest.raises(ValueError):
+        composite_gauss(np.sin, 0, 1, n=0)
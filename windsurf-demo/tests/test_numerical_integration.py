@@ -3,6 +3,8 @@ Tests for the numerical integration module.
 """
 
 import math
+
+import numpy as np
 import pytest
 from numerical_integration import trapezoidal, simpsons, midpoint, integrate
 
@@ -53,3 +55,45 @@ def test_invalid_n():
         trapezoidal(lambda x: x, 0, 1, n=0)
     with pytest.raises(ValueError):
         simpsons(lambda x: x, 0, 1, n=1)  # n must be even for Simpson's rule
+
+def test_vectorized_matches_scalar():
+    """Test that array evaluation gives the same result as the scalar loop."""
+    def f(x):
+        return x ** 3 - 2 * x  # Works on floats and NumPy arrays
+
+    for method in ['trapezoidal', 'simpsons', 'midpoint']:
+        scalar = integrate(f, -1, 2, method=method, n=1000, vectorize=False)
+        vector = integrate(f, -1, 2, method=method, n=1000, vectorize=True)
+        assert math.isclose(scalar, vector, rel_tol=1e-12), f"Failed with method: {method}"
+
+def test_vectorize_falls_back_for_scalar_functions():
+    """Test that scalar-only integrands still work when vectorize is not set."""
+    result = simpsons(math.sin, 0, math.pi, n=1000)
+    assert math.isclose(result, 2.0, rel_tol=1e-9)
+    # Branching on x is not elementwise for arrays
+    result = trapezoidal(lambda x: x if x > 0 else 0.0, -1, 1, n=1000)
+    assert math.isclose(result, 0.5, rel_tol=1e-5)
+
+def test_vectorize_probes_few_points():
+    """Test that a scalar-only integrand is tried on only a few points as an array."""
+    array_sizes = []
+
+    def f(x):
+        if isinstance(x, np.ndarray):
+            array_sizes.append(x.size)
+        return x if x > 0 else 0.0
+
+    trapezoidal(f, -1, 1, n=1000)
+    assert array_sizes == [2]
+
+    # An array-capable integrand keeps the probe values
+    array_sizes.clear()
+    trapezoidal(lambda x: array_sizes.append(x.size) or x ** 2, -1, 1, n=1000)
+    assert array_sizes == [2, 999]
+
+def test_vectorize_required():
+    """Test that vectorize=True rejects functions that cannot take arrays."""
+    with pytest.raises(TypeError):
+        midpoint(math.sin, 0, 1, vectorize=True)
+    with pytest.raises(ValueError):
+        midpoint(lambda x: 1.0, 0, 1, vectorize=True)  # Not elementwise
@@ -0,0 +1,58 @@
+"""
+Tests for evaluating integrands in worker processes.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import integrate, simpsons
+from numerical_integration.evaluation import Grid, evaluate_points
+
+
+def damped(x):
+    return math.exp(-x) * math.cos(3 * x)
+
+
+@pytest.mark.parametrize("method", ['trapezoidal', 'simpsons', 'midpoint', 'composite_gauss'])
+def test_parallel_matches_serial(method):
+    """Test that workers give exactly the serial result."""
+    serial = integrate(damped, -1, 2, method=method, n=1000)
+    parallel = integrate(damped, -1, 2, method=method, n=1000, workers=2)
+    assert parallel == serial
+
+def test_parallel_vectorized():
+    """Test workers with an integrand that accepts arrays."""
+    serial = simpsons(np.cos, 0, 1, n=10000)
+    assert simpsons(np.cos, 0, 1, n=10000, workers=3) == serial
+
+def test_serial_scalar_values_not_stored():
+    """Test that serial scalar evaluation calls f only when a value is used."""
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return math.exp(-x)
+
+    x = np.linspace(0, 1, 1001)
+    y = evaluate_points(f, x, vectorize=False)
+    assert calls == [] and len(y) == 1001
+    assert y[1000] == math.exp(-1.0)
+    assert list(y) == [math.exp(-xi) for xi in x.tolist()]
+    assert len(calls) == 1002
+
+def test_grid_points():
+    """Test that grid points match when computed one by one or as an array."""
+    grid = Grid(-1, 0.3, 12, end=2.3)
+    assert np.asarray(grid).tolist() == [grid[i] for i in range(12)]
+    assert grid[-1] == 2.3 and grid[0] == -1
+    assert grid[3:5].tolist() == [grid[3], grid[4]]
+    midpoints = Grid(0, 0.1, 10, offset=0.5)
+    assert np.allclose(midpoints, np.linspace(0.05, 0.95, 10))
+
+def test_invalid_workers():
+    """Test unsupported and invalid worker counts."""
+    with pytest.raises(ValueError):
+        integrate(damped, 0, 1, workers=0)
+    with pytest.raises(ValueError):
+        integrate(damped, 0, 1, method='gauss_kronrod', workers=2)
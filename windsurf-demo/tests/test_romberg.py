@@ -0,0 +1,51 @@
+"""
+Tests for Romberg integration.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import integrate, romberg, trapezoidal
+
+
+def test_romberg_converges():
+    """Test that Romberg reaches the tolerance for a smooth function."""
+    result = romberg(np.exp, 0, 1, atol=1e-12, rtol=1e-12)
+    assert math.isclose(result.value, math.e - 1, rel_tol=1e-13)
+    assert result.error <= 1e-12
+    assert result.evaluations == 2 ** (len(result.table) - 1) + 1
+
+def test_each_point_evaluated_once():
+    """Test that refining reuses every previously computed value."""
+    calls = []
+
+    def f(x):
+        calls.append(x)
+        return math.exp(x)
+
+    result = romberg(f, 0, 1, vectorize=False)
+    assert len(calls) == len(set(calls)) == result.evaluations
+
+def test_table_matches_trapezoidal():
+    """Test that the first column holds the trapezoidal sums."""
+    with pytest.warns(RuntimeWarning):
+        result = romberg(np.sqrt, 0, 1, max_levels=6)
+    for k, row in enumerate(result.table):
+        assert len(row) == k + 1
+        assert math.isclose(row[0], trapezoidal(np.sqrt, 0, 1, 2 ** k), rel_tol=1e-14)
+
+def test_max_levels_warns():
+    """Test that stopping before convergence warns."""
+    with pytest.warns(RuntimeWarning):
+        result = romberg(np.sqrt, 0, 1, max_levels=3)
+    assert result.evaluations == 9
+    assert len(result.table) == 4
+
+def test_integrate_romberg():
+    """Test that Romberg can be selected through integrate."""
+    value = integrate(math.cos, 0, 1, method='romberg', atol=1e-12)
+    assert math.isclose(value, math.sin(1), rel_tol=1e-12)
+
+    result = integrate(math.cos, 0, 1, method='romberg', full_output=True)
+    assert result.table[-1][-1] == result.value
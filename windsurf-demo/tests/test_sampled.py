@@ -0,0 +1,89 @@
+"""
+Tests for integrating sampled data.
+"""
+
+import math
+
+import numpy as np
+import pytest
+from numerical_integration import (SimpsonAccumulator, cumulative_stream, cumulative_trapezoid,
+                                   integrate_stream, simpson_data, trapezoid_data)
+
+
+def irregular_grid(n, seed=0):
+    x = np.sort(np.random.default_rng(seed).uniform(0, 3, n))
+    x[0], x[-1] = 0.0, 3.0
+    return x
+
+
+def test_trapezoid_matches_numpy():
+    """Test the trapezoidal rule on irregular samples, in any chunk size."""
+    x = irregular_grid(1001)
+    y = np.sin(x)
+    expected = np.trapezoid(y, x)
+    for chunk_size in [1, 7, 1000, 5000]:
+        assert math.isclose(trapezoid_data(y, x, chunk_size=chunk_size), expected, rel_tol=1e-14)
+
+@pytest.mark.parametrize("n", [2, 3, 4, 1000, 1001])
+def test_simpson_exact_for_quadratics(n):
+    """Test that Simpson's rule integrates quadratics exactly on uneven grids."""
+    x = irregular_grid(n)
+    y = 3 * x ** 2 - 2 * x + 1
+    expected = 27 - 9 + 3 if n > 2 else None  # Integral over [0, 3]
+    for chunk_size in [1, 2, 3, 1000]:
+        result = simpson_data(y, x, chunk_size=chunk_size)
+        if expected is None:
+            assert math.isclose(result, np.trapezoid(y, x))
+        else:
+            assert math.isclose(result, expected, rel_tol=1e-13)
+
+def test_equally_spaced():
+    """Test samples given with dx."""
+    y = np.exp(np.linspace(0, 1, 1001))
+    assert math.isclose(simpson_data(y, dx=1e-3), math.e - 1, rel_tol=1e-13)
+    assert math.isclose(trapezoid_data(y, dx=1e-3), math.e - 1, rel_tol=1e-6)
+
+def test_cumulative_trapezoid():
+    """Test the running integral against a direct cumulative sum."""
+    x = irregular_grid(500)
+    y = np.cos(x)
+    expected = 1.0 + np.concatenate([[0.0], np.cumsum(np.diff(x) * (y[1:] + y[:-1]) / 2)])
+    assert np.allclose(cumulative_trapezoid(y, x, initial=1.0, chunk_size=13), expected,
+                       rtol=1e-14, atol=1e-14)
+
+def test_memmap(tmp_path):
+    """Test integrating a memory-mapped file into a memory-mapped output."""
+    n = 100001
+    signal = np.memmap(tmp_path / "signal.f64", dtype=np.float64, mode="w+", shape=(n,))
+    signal[:] = np.cos(np.linspace(0, 10, n))
+    signal.flush()
+
+    signal = np.memmap(tmp_path / "signal.f64", dtype=np.float64, mode="r")
+    dx = 10 / (n - 1)
+    assert math.isclose(simpson_data(signal, dx=dx, chunk_size=4096), math.sin(10), rel_tol=1e-12)
+
+    out = np.memmap(tmp_path / "integral.f64", dtype=np.float64, mode="w+", shape=(n,))
+    cumulative_trapezoid(signal, dx=dx, out=out, chunk_size=4096)
+    assert math.isclose(out[-1], math.sin(10), rel_tol=1e-8)
+
+def test_streams():
+    """Test iterables of chunks, with and without abscissae."""
+    x = irregular_grid(1001)
+    y = np.sin(x)
+    pairs = ((x[i:i + 10], y[i:i + 10]) for i in range(0, len(x), 10))
+    assert math.isclose(integrate_stream(pairs, method='simpson'), simpson_data(y, x), rel_tol=1e-14)
+
+    chunks = [y[:5], y[5:9], y[9:]]
+    running = np.concatenate(list(cumulative_stream(chunks, dx=0.1)))
+    assert np.allclose(running, cumulative_trapezoid(y, dx=0.1), rtol=1e-14)
+
+def test_invalid_input():
+    """Test mismatched lengths, mixed chunks and unknown methods."""
+    with pytest.raises(ValueError):
+        trapezoid_data(np.ones(3), np.ones(4))
+    accumulator = SimpsonAccumulator()
+    accumulator.update(np.ones(3), np.arange(3.0))
+    with pytest.raises(ValueError):
+        accumulator.update(np.ones(3))
+    with pytest.raises(ValueError):
+        integrate_stream([np.ones(3)], method='invalid_method')